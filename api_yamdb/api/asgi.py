@@ -0,0 +1,105 @@
+"""ASGI application of the project, Django 2.2 has no async views.
+
+GET and HEAD requests of the catalog (compositions, genres,
+categories and reviews) are run by the Django handler in a pool of
+ASGI['READ_THREADS'] threads, and the event loop of the worker keeps
+accepting requests while the reads wait on the database. A response
+is sent by the loop in one message, with no thread switch per chunk.
+Other requests, the writes among them, go to the same views through
+asgiref's WsgiToAsgi. Every thread keeps its own database connection,
+so a worker may hold READ_THREADS of them; the api.pooled_postgresql
+engine lets the threads share fewer.
+"""
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from django.conf import settings
+
+CATALOG_PATH = re.compile(
+    r'^/api/v1/(?:(?:titles|genres|categories)/(?:[^/]+/)?'
+    r'|titles/\d+/reviews/(?:\d+/)?)$'
+)
+READ_METHODS = ('GET', 'HEAD')
+
+
+def build_environ(scope):
+    """Getting the WSGI environ of a request without a body."""
+    instance = WsgiToAsgiInstance(None)
+    instance.scope = scope
+    return instance.build_environ(scope, BytesIO())
+
+
+def is_catalog_read(scope):
+    return (
+        scope['type'] == 'http'
+        and scope['method'] in READ_METHODS
+        and CATALOG_PATH.match(scope['path']) is not None
+    )
+
+
+class CatalogApplication:
+
+    def __init__(self, wsgi_application, read_threads=None):
+        self.wsgi_application = wsgi_application
+        self.fallback = WsgiToAsgi(wsgi_application)
+        self.executor = ThreadPoolExecutor(
+            max_workers=read_threads or settings.ASGI['READ_THREADS'],
+            thread_name_prefix='catalog'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif is_catalog_read(scope):
+            await self.read(scope, send)
+        else:
+            await self.fallback(scope, receive, send)
+
+    async def read(self, scope, send):
+        status, headers, body = await asyncio.get_event_loop().run_in_executor(
+            self.executor, self.run, build_environ(scope)
+        )
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': b'' if scope['method'] == 'HEAD' else body,
+        })
+
+    def run(self, environ):
+        """Getting (status, headers, body) of the WSGI application.
+        Closing the result sends request_finished, which releases
+        the database connection of the thread.
+        """
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in headers
+            ]
+
+        result = self.wsgi_application(environ, start_response)
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return started['status'], started['headers'], body
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,115 @@
+"""JWT authentication without a database lookup per request.
+
+Tokens minted by create_access_token() carry the username, role and
+flags of the user as claims, and the user is built from them.
+Verified tokens are kept in a process-local LRU, so the signature
+of a token is checked once. The 'ver' claim is compared with
+User.token_version, which changes with the role and the flags;
+the versions are cached per user for REVALIDATE_SECONDS, which
+bounds how long a stale token can be trusted by other workers.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .cache import LRUCacheBackend
+
+User = get_user_model()
+
+CLAIMS = ('username', 'role', 'is_staff', 'is_superuser')
+
+verified_tokens = LRUCacheBackend(
+    max_entries=settings.STATELESS_JWT['TOKEN_CACHE_SIZE'],
+    timeout=api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+)
+user_versions = LRUCacheBackend(
+    max_entries=settings.STATELESS_JWT['TOKEN_CACHE_SIZE'],
+    timeout=settings.STATELESS_JWT['REVALIDATE_SECONDS']
+)
+
+
+def create_access_token(user):
+    token = RefreshToken.for_user(user).access_token
+    for claim in CLAIMS:
+        token[claim] = getattr(user, claim)
+    token['ver'] = user.token_version
+    return token
+
+
+def stats():
+    return {
+        'verified_tokens': verified_tokens.stats(),
+        'user_versions': user_versions.stats(),
+    }
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_version(sender, instance, **kwargs):
+    user_versions.delete(instance.pk)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        entry = verified_tokens.get(raw_token)
+        if entry is None or entry[1]['exp'] <= time.time():
+            validated_token = self.get_validated_token(raw_token)
+            if any(claim not in validated_token for claim in CLAIMS):
+                # Tokens minted before the claims were added.
+                return self.get_user(validated_token), validated_token
+            claims = {
+                claim: validated_token[claim] for claim in CLAIMS
+            }
+            claims['id'] = validated_token[api_settings.USER_ID_CLAIM]
+            entry = (claims, validated_token)
+            verified_tokens.set(raw_token, entry)
+
+        claims, validated_token = entry
+        self.check_version(claims['id'], validated_token.get('ver', 0))
+        return self.get_claims_user(claims), validated_token
+
+    def check_version(self, user_id, token_version):
+        state = user_versions.get(user_id)
+        if state is None:
+            state = User.objects.filter(pk=user_id).values_list(
+                'token_version', 'is_active'
+            ).first()
+            if state is None:
+                raise AuthenticationFailed(
+                    'User not found', code='user_not_found'
+                )
+            user_versions.set(user_id, state)
+        version, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(
+                'User is inactive', code='user_inactive'
+            )
+        if token_version != version:
+            raise AuthenticationFailed(
+                'Token is stale, get a new one', code='token_not_valid'
+            )
+
+    @staticmethod
+    def get_claims_user(claims):
+        """Building a user from the claims without a query.
+        Only the claimed fields are filled, so the instance must not
+        be saved; views that change the user load it from the database.
+        """
+        user = User(is_active=True, **claims)
+        user._state.adding = False
+        return user
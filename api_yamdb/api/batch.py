@@ -0,0 +1,102 @@
+"""GET sub-requests run inside one request to /api/v1/batch/.
+
+Every sub-request is resolved against the urls of the api namespace
+and its view is called directly, in the same thread and with the same
+database connection. The user authenticated for the batch is passed
+to the sub-requests with _force_auth_user, which DRF reads in place of
+the authentication classes, so the token is checked once per batch;
+anonymous sub-requests are authenticated as usual and get 401.
+The middleware does not run for the sub-requests.
+No per-request state is shared between the sub-requests beyond the
+connection and the user: each one reads its own resource versions,
+and anonymous ones use the response cache of the process, with the
+same keys as the direct requests.
+"""
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.response import Response
+
+# Headers of a sub-request that may be set by the client,
+# the names are matched case-insensitively.
+SUB_REQUEST_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+# Headers of a sub-response returned to the client.
+SUB_RESPONSE_HEADERS = ('ETag', 'Last-Modified', 'X-Cache')
+
+
+def make_request(request, path, headers):
+    """Building a GET request to the path with the environ
+    of the batch request, e.g. its host and address.
+    """
+    url = urlsplit(path)
+    environ = {
+        key: value for key, value in request.META.items()
+        if not key.startswith('HTTP_IF_')
+        and key not in ('CONTENT_TYPE', 'CONTENT_LENGTH')
+    }
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'wsgi.input': BytesIO(),
+    })
+    allowed = {name.lower() for name in SUB_REQUEST_HEADERS}
+    for name, value in headers.items():
+        if name.lower() in allowed:
+            environ[f'HTTP_{name.upper().replace("-", "_")}'] = value
+    sub_request = WSGIRequest(environ)
+    if request.user.is_authenticated:
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def error(code, detail):
+    return {'status': code, 'headers': {}, 'body': {'detail': detail}}
+
+
+def run_sub_request(request, path, headers, batch_view):
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return error(status.HTTP_404_NOT_FOUND, 'Not found.')
+    if 'api' not in match.namespaces:
+        return error(status.HTTP_404_NOT_FOUND, 'Not found.')
+    if match.func is batch_view:
+        return error(
+            status.HTTP_400_BAD_REQUEST, 'Batches can not be nested.'
+        )
+    response = match.func(
+        make_request(request, path, headers), *match.args, **match.kwargs
+    )
+    if response.streaming:
+        return error(
+            status.HTTP_400_BAD_REQUEST,
+            'Streaming responses are not supported in batches.'
+        )
+    if isinstance(response, Response):
+        body = response.data
+    else:
+        body = response.content.decode()
+    return {
+        'status': response.status_code,
+        'headers': {
+            name: response[name] for name in SUB_RESPONSE_HEADERS
+            if response.has_header(name)
+        },
+        'body': body,
+    }
+
+
+def run_batch(request, sub_requests, batch_view):
+    """Getting the responses of the sub-requests in their order."""
+    return [
+        run_sub_request(
+            request, sub_request['path'], sub_request['headers'], batch_view
+        )
+        for sub_request in sub_requests
+    ]
@@ -0,0 +1,19 @@
+"""In-process benchmarks of the API.
+
+A suite is a function returning a list of runner.Case objects.
+The suites are run by the python manage.py benchmark command,
+which reports the latency percentiles, requests per second and
+SQL queries of every case and can save or compare a JSON baseline.
+"""
+from django.utils.module_loading import import_string
+
+SUITES = {
+    'endpoints': 'api.benchmarks.endpoints.get_cases',
+    'serializers': 'api.benchmarks.serializers.get_cases',
+    'renderers': 'api.benchmarks.renderers.get_cases',
+    'asgi': 'api.benchmarks.asgi.get_cases',
+}
+
+
+def get_cases(suite, **options):
+    return import_string(SUITES[suite])(**options)
@@ -0,0 +1,102 @@
+"""The 'asgi' suite: the catalog reads served by one sync WSGI worker
+against one worker of api.asgi.CatalogApplication.
+
+Every case sends --concurrency requests to a route: one after another
+for WSGI, as a sync gunicorn worker serves them, and all at once for
+ASGI. items/s is the number of requests served per second. The ASGI
+worker gains while the requests wait on the database, so the numbers
+are telling on PostgreSQL rather than on SQLite. Queries are counted
+for the WSGI cases only, the ASGI ones run in other threads.
+"""
+import asyncio
+
+from api.asgi import CatalogApplication, build_environ
+from api.authentication import create_access_token
+from django.core.wsgi import get_wsgi_application
+from reviews.models import Title
+
+from .endpoints import get_admin
+from .runner import Case
+
+
+def get_paths():
+    paths = [
+        ('titles-list', '/api/v1/titles/'),
+        ('genres-list', '/api/v1/genres/'),
+        ('categories-list', '/api/v1/categories/'),
+    ]
+    title = Title.objects.order_by('-review_count', 'id').first()
+    if title is not None:
+        paths += [
+            ('titles-detail', f'/api/v1/titles/{title.id}/'),
+            ('reviews-list', f'/api/v1/titles/{title.id}/reviews/'),
+        ]
+    return paths
+
+
+def make_scope(path, headers):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': b'',
+        'headers': headers,
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+
+def check(path, status):
+    if status != 200:
+        raise AssertionError(f'GET {path} returned {status}')
+
+
+def make_cases(application, loop, name, scope, concurrency):
+    path = scope['path']
+
+    def wsgi():
+        for _ in range(concurrency):
+            status, _, _ = application.run(build_environ(scope))
+            check(path, status)
+
+    async def request():
+        async def receive():
+            return {'type': 'http.request'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                check(path, message['status'])
+
+        await application(scope, receive, send)
+
+    async def requests():
+        await asyncio.gather(*[request() for _ in range(concurrency)])
+
+    def asgi():
+        loop.run_until_complete(requests())
+
+    return [
+        Case(f'{name} wsgi x{concurrency}', wsgi, concurrency),
+        Case(f'{name} asgi x{concurrency}', asgi, concurrency),
+    ]
+
+
+def get_cases(concurrency=16, as_admin=False, report_skipped=None,
+              **options):
+    application = CatalogApplication(
+        get_wsgi_application(), read_threads=concurrency
+    )
+    loop = asyncio.new_event_loop()
+    headers = []
+    if as_admin:
+        token = create_access_token(get_admin())
+        headers.append((b'authorization', f'Bearer {token}'.encode()))
+    cases = []
+    for name, path in get_paths():
+        cases += make_cases(
+            application, loop, name, make_scope(path, headers), concurrency
+        )
+    return cases
@@ -0,0 +1,173 @@
+"""The 'endpoints' suite: a GET request to every route of api.urls.
+
+Routes are found by walking the url patterns, their arguments are
+filled with the most reviewed composition of the database, its
+latest commented review and the latest comment. Requests go through
+the whole middleware stack with django.test.Client. A route that
+is not available anonymously is requested with the token of an admin,
+who is created for the run and removed by remove_admin().
+The response cache is cleared before every anonymous request, so the
+view, its queries and serialization are measured, unless the cases
+are made with cached=True to measure the cache hits.
+The exports are skipped, they stream whole tables.
+"""
+from api import urls
+from api.authentication import create_access_token
+from api.cache import response_cache
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import URLResolver, reverse
+from reviews.models import Comment, Review, Title
+
+from .runner import Case
+
+User = get_user_model()
+
+BENCHMARK_ADMIN = 'benchmark_admin'
+
+# Primary keys of the admins created by get_admin().
+created_admins = set()
+
+# Extra query strings of the list routes, formatted with the samples.
+QUERIES = {
+    'titles-list': (
+        'pagination=cursor',
+        'genre={genre}&category={category}',
+        'search={search}',
+    ),
+    'reviews-list': ('pagination=cursor',),
+    'comments-list': ('pagination=cursor',),
+    'users-list': ('search={search}',),
+}
+
+
+def iter_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def allows_get(pattern):
+    actions = getattr(pattern.callback, 'actions', None)
+    if actions is not None:
+        return 'get' in actions
+    return 'get' in getattr(pattern.callback.cls, 'http_method_names', ())
+
+
+def iter_get_patterns(report_skipped=None):
+    for pattern in iter_patterns(urls.urlpatterns):
+        if not allows_get(pattern):
+            continue
+        if pattern.name.startswith('export-'):
+            if report_skipped is not None:
+                report_skipped(pattern.name, 'streams a whole table')
+            continue
+        yield pattern
+
+
+def get_admin():
+    admin, created = User.objects.get_or_create(
+        username=BENCHMARK_ADMIN,
+        defaults={
+            'email': f'{BENCHMARK_ADMIN}@yamdb.fake',
+            'role': User.ADMIN,
+        }
+    )
+    if created:
+        created_admins.add(admin.pk)
+    return admin
+
+
+def remove_admin():
+    """Deleting the admin if get_admin() has created it."""
+    User.objects.filter(pk__in=created_admins).delete()
+    created_admins.clear()
+
+
+def get_samples(admin):
+    """Getting the values of the url arguments and the query strings."""
+    samples = {'username': admin.username, 'search': 'title'}
+    title = Title.objects.order_by('-review_count', 'id').first()
+    if title is None:
+        return samples
+    samples['titles'] = samples['title_id'] = title.id
+    genre = title.genre.order_by('id').first()
+    samples['genre'] = genre.slug if genre else ''
+    samples['category'] = title.category.slug if title.category else ''
+    if genre is not None:
+        samples['genre-stats'] = genre.slug
+    if title.category is not None:
+        samples['category-stats'] = title.category.slug
+    reviews = Review.objects.filter(title=title).order_by('-pub_date', '-id')
+    review = (
+        reviews.filter(comments__isnull=False).first() or reviews.first()
+    )
+    if review is None:
+        return samples
+    samples['reviews'] = samples['review_id'] = review.id
+    comment = (
+        Comment.objects.filter(review=review).order_by('-pub_date', '-id')
+        .first()
+    )
+    if comment is not None:
+        samples['comments'] = comment.id
+    return samples
+
+
+def get_kwargs(pattern, samples):
+    """Getting the url arguments of the pattern, pk and slug are
+    filled with the sample of the resource named by the url name,
+    e.g. 'reviews'.
+    """
+    kwargs = {}
+    for name in pattern.pattern.regex.groupindex:
+        key = name
+        if name in ('pk', 'slug'):
+            key = pattern.name.rsplit('-', 1)[0]
+        if key not in samples:
+            return None
+        kwargs[name] = samples[key]
+    return kwargs
+
+
+def make_case(client, name, path, headers, cached):
+    def request():
+        response = client.get(path, **headers)
+        if response.status_code not in (200, 304):
+            raise AssertionError(
+                f'GET {path} returned {response.status_code}'
+            )
+
+    setup = None if cached or headers else response_cache.clear
+    return Case(name, request, setup=setup)
+
+
+def get_cases(as_admin=False, cached=False, report_skipped=None, **options):
+    admin = get_admin()
+    admin_headers = {
+        'HTTP_AUTHORIZATION': f'Bearer {create_access_token(admin)}'
+    }
+    samples = get_samples(admin)
+    client = Client()
+    cases = []
+    for pattern in iter_get_patterns(report_skipped):
+        kwargs = get_kwargs(pattern, samples)
+        if kwargs is None:
+            if report_skipped is not None:
+                report_skipped(pattern.name, 'no data for the arguments')
+            continue
+        path = reverse(f'{urls.app_name}:{pattern.name}', kwargs=kwargs)
+        queries = QUERIES.get(pattern.name, ())
+        for query in ('',) + queries:
+            try:
+                url = f'{path}?{query.format(**samples)}' if query else path
+            except KeyError:
+                continue
+            headers = admin_headers if as_admin else {}
+            if client.get(url, **headers).status_code in (401, 403):
+                headers = admin_headers
+            name = f'{pattern.name} {query}' if query else pattern.name
+            cases.append(make_case(client, name, url, headers, cached))
+    return cases
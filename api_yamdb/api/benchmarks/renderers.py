@@ -0,0 +1,66 @@
+"""The 'renderers' suite: the JSONRenderer of DRF against
+the renderers and parsers of api.renderers and api.parsers.
+
+Every case renders, or parses back, one page of the latest
+compositions and one of the latest reviews of the database,
+built by the row serializers as the list endpoints do.
+"""
+import io
+
+from api.parsers import MessagePackParser, ORJSONParser
+from api.renderers import MessagePackRenderer, ORJSONRenderer
+from api.row_serializers import ReviewRowSerializer, TitleRowSerializer
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Review, Title
+
+from .runner import Case
+
+FORMATS = (
+    (JSONRenderer, JSONParser),
+    (ORJSONRenderer, ORJSONParser),
+    (MessagePackRenderer, MessagePackParser),
+)
+
+PAGES = (
+    ('titles', lambda: Title.objects.order_by('-id'), TitleRowSerializer),
+    (
+        'reviews',
+        lambda: Review.objects.order_by('-pub_date', '-id'),
+        ReviewRowSerializer,
+    ),
+)
+
+
+def make_cases(name, data, renderer_class, parser_class):
+    items = len(data['results'])
+    renderer = renderer_class()
+    parser = parser_class()
+    content = renderer.render(data)
+
+    def render():
+        return renderer.render(data)
+
+    def parse():
+        return parser.parse(io.BytesIO(content))
+
+    return [
+        Case(f'{name} render {renderer_class.__name__}', render, items),
+        Case(f'{name} parse {parser_class.__name__}', parse, items),
+    ]
+
+
+def get_cases(objects=1000, report_skipped=None, **options):
+    cases = []
+    for name, get_queryset, row_serializer_class in PAGES:
+        row_serializer = row_serializer_class()
+        data = {'results': row_serializer.serialize(
+            row_serializer.get_rows(get_queryset())[:objects]
+        )}
+        if not data['results']:
+            if report_skipped is not None:
+                report_skipped(name, 'no objects in the database')
+            continue
+        for renderer_class, parser_class in FORMATS:
+            cases += make_cases(name, data, renderer_class, parser_class)
+    return cases
@@ -0,0 +1,131 @@
+import json
+import math
+import time
+
+from django.db import connection
+
+
+class Case:
+    """A measured operation, e.g. a request to one endpoint.
+    items is the number of objects handled by one call,
+    setup is called untimed before every call.
+    """
+
+    def __init__(self, name, func, items=1, setup=None):
+        self.name = name
+        self.func = func
+        self.items = items
+        self.setup = setup
+
+    def __call__(self):
+        self.func()
+
+    def prepare(self):
+        if self.setup is not None:
+            self.setup()
+
+
+def percentile(samples, percent):
+    """Getting the percentile of sorted samples
+    with linear interpolation between the closest ranks.
+    """
+    if not samples:
+        return None
+    position = (len(samples) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return samples[lower] + (samples[upper] - samples[lower]) * (
+        position - lower
+    )
+
+
+class QueryCounter:
+    """Execute wrapper counting the queries. connection.queries
+    cannot be used, since it is reset when a request starts.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(case, iterations, warmup=1):
+    """Running the case and getting its statistics.
+    Queries are counted on the first call only,
+    so the wrapper does not slow the timed calls down.
+    """
+    queries = QueryCounter()
+    case.prepare()
+    with connection.execute_wrapper(queries):
+        case()
+    for _ in range(warmup - 1):
+        case.prepare()
+        case()
+    samples = []
+    for _ in range(iterations):
+        case.prepare()
+        start = time.perf_counter()
+        case()
+        samples.append(time.perf_counter() - start)
+    total = sum(samples)
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'queries': queries.count,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'rps': round(iterations / total, 1) if total else None,
+        'items_per_s': (
+            round(iterations * case.items / total, 1) if total else None
+        ),
+    }
+
+
+def run_cases(cases, iterations, warmup=1, report=None):
+    results = {}
+    for case in cases:
+        results[case.name] = measure(case, iterations, warmup)
+        if report is not None:
+            report(case.name, results[case.name])
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Getting the regressions of the results against the baseline:
+    p95 latency grown by more than threshold (a fraction)
+    or more queries per request.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']} -> {result['p95_ms']} ms"
+            )
+        if result['queries'] > previous['queries']:
+            regressions.append(
+                f"{name}: queries {previous['queries']} -> "
+                f"{result['queries']}"
+            )
+    return regressions
+
+
+def save_baseline(path, suite, results, meta):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(
+            {'suite': suite, 'meta': meta, 'results': results},
+            file,
+            indent=2,
+            sort_keys=True
+        )
+
+
+def load_baseline(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
@@ -0,0 +1,74 @@
+"""The 'serializers' suite: the model serializers of the list
+endpoints against the row serializers of api.row_serializers.
+
+Every case reads and serializes the same objects, the latest
+compositions, reviews and comments of the database, so items/s
+of the two paths can be compared.
+"""
+from api.row_serializers import (CommentRowSerializer, ReviewRowSerializer,
+                                 TitleRowSerializer)
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from reviews.models import Comment, Review, Title
+
+from .runner import Case
+
+PATHS = (
+    (
+        'titles',
+        lambda: Title.objects.select_related('category')
+        .prefetch_related('genre').order_by('-id'),
+        TitleReadSerializer,
+        TitleRowSerializer,
+    ),
+    (
+        'reviews',
+        lambda: Review.objects.select_related('author', 'title')
+        .order_by('-pub_date', '-id'),
+        ReviewSerializer,
+        ReviewRowSerializer,
+    ),
+    (
+        'comments',
+        lambda: Comment.objects.select_related('author')
+        .order_by('-pub_date', '-id'),
+        CommentSerializer,
+        CommentRowSerializer,
+    ),
+)
+
+
+def make_cases(name, get_queryset, serializer_class, row_serializer_class,
+               objects):
+    def serialize_models():
+        return serializer_class(
+            list(get_queryset()[:objects]), many=True
+        ).data
+
+    def serialize_rows():
+        row_serializer = row_serializer_class()
+        return row_serializer.serialize(
+            row_serializer.get_rows(get_queryset())[:objects]
+        )
+
+    return [
+        Case(f'{name} {serializer_class.__name__}', serialize_models,
+             objects),
+        Case(f'{name} {row_serializer_class.__name__}', serialize_rows,
+             objects),
+    ]
+
+
+def get_cases(objects=1000, report_skipped=None, **options):
+    cases = []
+    for name, get_queryset, serializer_class, row_serializer_class in PATHS:
+        count = get_queryset()[:objects].count()
+        if not count:
+            if report_skipped is not None:
+                report_skipped(name, 'no objects in the database')
+            continue
+        cases += make_cases(
+            name, get_queryset, serializer_class, row_serializer_class,
+            count
+        )
+    return cases
@@ -0,0 +1,145 @@
+"""Response cache for the read endpoints.
+
+Cache keys contain the versions of the resources a response depends on
+(see api.models.ResourceVersion), so a write never has to find and
+delete old entries: it bumps the version and the old keys stop being
+read. The storage is configured by settings.RESPONSE_CACHE.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+class LRUCacheBackend:
+    """Process-local storage with a TTL and a bounded number of entries.
+    The least recently used entry is evicted first.
+    """
+
+    def __init__(self, max_entries=1000, timeout=60):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        return {'size': len(self.entries), 'evictions': self.evictions}
+
+
+class DjangoCacheBackend:
+    """Storage in one of settings.CACHES, e.g. Redis or Memcached
+    shared by all workers. Its size is bounded by the MAX_ENTRIES
+    option of the cache itself, so max_entries is ignored here.
+    """
+
+    def __init__(self, alias='default', timeout=60, max_entries=None):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        return {}
+
+
+class ResponseCache:
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prefix, versions, url):
+        digest = hashlib.md5(
+            f'{sorted(versions.items())}{url}'.encode()
+        ).hexdigest()
+        return f'response:{prefix}:{digest}'
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def clear(self):
+        self.backend.clear()
+        with self.lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            **self.backend.stats(),
+        }
+
+
+def create_backend(config, **options):
+    """Building the storage of a {'BACKEND': ..., 'OPTIONS': {...}}
+    setting, the given options override the configured ones.
+    """
+    backend_class = import_string(config['BACKEND'])
+    options = {
+        **{
+            name.lower(): value
+            for name, value in config.get('OPTIONS', {}).items()
+        },
+        **options,
+    }
+    return backend_class(**options)
+
+
+def create_response_cache():
+    return ResponseCache(create_backend(settings.RESPONSE_CACHE))
+
+
+response_cache = create_response_cache()
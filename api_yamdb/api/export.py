@@ -0,0 +1,141 @@
+"""Streaming export of whole tables for analytics.
+
+An export reads its table in the order of ids with
+QuerySet.iterator(chunk_size), which uses a server-side cursor
+on PostgreSQL, and hands the rows to the renderer chunk by chunk,
+so the memory of a worker does not depend on the size of the table.
+The rows are plain dicts of JSON types, the same for NDJSON and CSV.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from reviews.management.bulk import iter_batches
+from reviews.models import Comment, GenreTitle, Review, Title
+
+from .row_serializers import DATETIME
+
+
+class Export:
+    """Base of the exports, fields are the names of the output
+    columns, filters map the query parameters to the lookups.
+    values map the output columns to the columns of the rows read
+    from the model in the order of ids, the datetime_fields
+    of them are formatted as dates.
+    """
+    model = None
+    fields = ()
+    values = {}
+    datetime_fields = ()
+    filters = {}
+
+    def __init__(self, params, chunk_size=None):
+        self.params = params
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        # Checked before the response starts streaming.
+        self.lookups = self.get_filters()
+
+    def get_queryset(self):
+        return self.model.objects.order_by('id').values_list(
+            *self.values.values()
+        )
+
+    def get_filters(self):
+        lookups = {}
+        for param, lookup in self.filters.items():
+            value = self.params.get(param)
+            if value is None:
+                continue
+            if not value.isdigit():
+                raise ValidationError(
+                    {param: ['A valid integer is required.']}
+                )
+            lookups[lookup] = int(value)
+        return lookups
+
+    def convert(self, rows):
+        converted = []
+        for row in rows:
+            item = dict(zip(self.values, row))
+            for name in self.datetime_fields:
+                item[name] = DATETIME.to_representation(item[name])
+            converted.append(item)
+        return converted
+
+    def iter_chunks(self):
+        """Yielding lists of at most chunk_size rows."""
+        queryset = self.get_queryset().filter(**self.lookups)
+        for rows in iter_batches(
+            queryset.iterator(chunk_size=self.chunk_size), self.chunk_size
+        ):
+            yield self.convert(rows)
+
+
+class TitleExport(Export):
+    """The genres of a chunk are loaded with one query."""
+    model = Title
+    fields = (
+        'id', 'name', 'year', 'rating', 'category', 'genre', 'description'
+    )
+    values = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'rating': 'rating',
+        'category': 'category__slug',
+        'description': 'description',
+    }
+    filters = {'category': 'category_id'}
+
+    def convert(self, rows):
+        rows = super().convert(rows)
+        genres = defaultdict(list)
+        for title_id, slug in (
+            GenreTitle.objects.filter(title_id__in=[row['id'] for row in rows])
+            .order_by('genre_id').values_list('title_id', 'genre__slug')
+        ):
+            genres[title_id].append(slug)
+        return [
+            {
+                name: genres[row['id']] if name == 'genre' else row[name]
+                for name in self.fields
+            }
+            for row in rows
+        ]
+
+
+class ReviewExport(Export):
+    model = Review
+    fields = ('id', 'title', 'author', 'score', 'text', 'pub_date')
+    values = {
+        'id': 'id',
+        'title': 'title_id',
+        'author': 'author__username',
+        'score': 'score',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }
+    datetime_fields = ('pub_date',)
+    filters = {'title': 'title_id'}
+
+
+class CommentExport(Export):
+    model = Comment
+    fields = ('id', 'title', 'review', 'author', 'text', 'pub_date')
+    values = {
+        'id': 'id',
+        'title': 'review__title_id',
+        'review': 'review_id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }
+    datetime_fields = ('pub_date',)
+    filters = {'title': 'review__title_id', 'review': 'review_id'}
+
+
+EXPORTS = {
+    'titles': TitleExport,
+    'reviews': ReviewExport,
+    'comments': CommentExport,
+}
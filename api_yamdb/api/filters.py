@@ -1,23 +1,31 @@
 import django_filters as filters
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+from reviews.search import search_titles
 
 
 class TitleFilter(filters.FilterSet):
     """Filtering the display of compositions.
+    Genre and category are matched by the exact slug,
+    so the unique slug indexes serve them. The genre is matched
+    through a subquery on the GenreTitle table, so a composition
+    is listed once. The search parameter runs an indexed
+    full-text search over the name and the description.
     """
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='contains'
-    )
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='contains'
-    )
+    genre = filters.CharFilter(method='filter_genre')
+    category = filters.CharFilter(field_name='category__slug')
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='contains'
     )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ('name', 'year', 'description', 'genre', 'category')
+
+    def filter_genre(self, queryset, name, value):
+        genre_titles = GenreTitle.objects.filter(genre__slug=value)
+        return queryset.filter(id__in=genre_titles.values('title_id'))
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
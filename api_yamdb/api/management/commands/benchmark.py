@@ -0,0 +1,173 @@
+import platform
+
+import django
+from api.benchmarks import SUITES, get_cases
+from api.benchmarks.endpoints import remove_admin
+from api.benchmarks.runner import (compare, load_baseline, run_cases,
+                                   save_baseline)
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import connection
+
+
+class Command(BaseCommand):
+    """Measuring the API in-process is performed
+    by the python manage.py benchmark command.
+    It runs against the configured database, which can be
+    filled first by generate_dataset with --titles, --reviews,
+    --comments and --seed.
+    """
+    help = 'Measure latency, throughput and SQL queries of the API'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'suite',
+            nargs='?',
+            default='endpoints',
+            choices=list(SUITES),
+            help='Benchmark suite'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Number of timed runs of every case'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=3,
+            help='Number of untimed runs of every case'
+        )
+        parser.add_argument(
+            '--only',
+            help='Run only the cases containing this substring'
+        )
+        parser.add_argument(
+            '--objects',
+            type=int,
+            default=1000,
+            help='Number of objects serialized by one call '
+                 'of the serializers suite'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=16,
+            help='Number of requests sent at once by one call '
+                 'of the asgi suite'
+        )
+        parser.add_argument(
+            '--as-admin',
+            action='store_true',
+            help='Authenticate every request'
+        )
+        parser.add_argument(
+            '--cached',
+            action='store_true',
+            help='Keep the cache of anonymous responses between '
+                 'the requests of the endpoints suite, '
+                 'which measures the cache hits'
+        )
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Users to add before the run')
+        parser.add_argument('--titles', type=int, default=0,
+                            help='Compositions to add before the run')
+        parser.add_argument('--reviews', type=int, default=0,
+                            help='Reviews to add before the run')
+        parser.add_argument('--comments', type=int, default=0,
+                            help='Comments to add before the run')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the added data')
+        parser.add_argument(
+            '--save',
+            metavar='PATH',
+            help='Write the results to a JSON baseline'
+        )
+        parser.add_argument(
+            '--compare',
+            metavar='PATH',
+            help='Compare the results with a JSON baseline'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Allowed growth of p95 against the baseline, a fraction'
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error if the baseline comparison '
+                 'finds regressions'
+        )
+
+    def handle(self, *args, **options):
+        if options['titles']:
+            call_command(
+                'generate_dataset',
+                users=options['users'],
+                titles=options['titles'],
+                reviews=options['reviews'],
+                comments=options['comments'],
+                seed=options['seed'],
+                stdout=self.stdout
+            )
+        try:
+            results = self.run(options)
+        finally:
+            remove_admin()
+        if options['save']:
+            save_baseline(
+                options['save'], options['suite'], results, self.get_meta()
+            )
+            self.stdout.write(f"The baseline is saved to {options['save']}")
+        if options['compare']:
+            baseline = load_baseline(options['compare'])
+            regressions = compare(
+                results, baseline['results'], options['threshold']
+            )
+            for regression in regressions:
+                self.stdout.write(self.style.WARNING(regression))
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS('No regressions'))
+            elif options['fail_on_regression']:
+                raise CommandError(f'{len(regressions)} regressions found')
+
+    def run(self, options):
+        cases = get_cases(
+            options['suite'],
+            as_admin=options['as_admin'],
+            cached=options['cached'],
+            objects=options['objects'],
+            concurrency=options['concurrency'],
+            report_skipped=self.report_skipped
+        )
+        if options['only']:
+            cases = [case for case in cases if options['only'] in case.name]
+        if not cases:
+            raise CommandError('There are no cases to run')
+        self.stdout.write(
+            f"{'case':<48}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'req/s':>10}{'items/s':>12}"
+        )
+        return run_cases(
+            cases, options['iterations'], options['warmup'], self.report
+        )
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<48}{result['queries']:>8}{result['p50_ms']:>10}"
+            f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['rps']:>10}"
+            f"{result['items_per_s']:>12}"
+        )
+
+    def report_skipped(self, name, reason):
+        self.stdout.write(self.style.WARNING(f'{name} is skipped: {reason}'))
+
+    @staticmethod
+    def get_meta():
+        return {
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+        }
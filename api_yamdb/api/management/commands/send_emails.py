@@ -0,0 +1,52 @@
+import logging
+import time
+
+from api.outbox import dispatch_pending
+from django.core.management import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Sending the emails of the outbox is performed
+    by the python manage.py send_emails command.
+    With --loop it works as a worker process.
+    """
+    help = 'Send pending emails of the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Number of emails sent over one connection'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between polls of an empty outbox'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = dispatch_pending(options['batch_size'])
+            except Exception:
+                if not options['loop']:
+                    raise
+                # The worker outlives outages of the database.
+                logger.exception('Outbox dispatch failed')
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(f'Sent: {sent}, failed: {failed}')
+            if not options['loop']:
+                break
+            if not sent and not failed:
+                time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('The outbox is processed'))
@@ -0,0 +1,179 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+# Run in a fresh interpreter, prints the timings in milliseconds
+# as the last line of the output.
+SCRIPT = '''
+import io, json, time
+started = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+loaded = time.perf_counter()
+warm_up = 0
+if {warm}:
+    from api.warmup import warm_up
+    warm_up = warm_up()
+ready = time.perf_counter()
+
+def request():
+    environ = {{
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': {path!r}, 'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost', 'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+    }}
+    statuses = []
+    start = time.perf_counter()
+    result = application(environ, lambda status, _: statuses.append(status))
+    b''.join(result)
+    result.close()
+    return statuses[0], (time.perf_counter() - start) * 1000
+
+status, first = request()
+_, second = request()
+print(json.dumps({{
+    'status': status,
+    'setup_ms': (setup - started) * 1000,
+    'application_ms': (loaded - setup) * 1000,
+    'warm_up_ms': warm_up * 1000,
+    'first_request_ms': first,
+    'second_request_ms': second,
+    'to_first_response_ms': (ready - started) * 1000 + first,
+}}))
+'''
+
+PHASES = (
+    ('interpreter_ms', 'interpreter and script start'),
+    ('setup_ms', 'django.setup()'),
+    ('application_ms', 'WSGI application'),
+    ('warm_up_ms', 'warm-up'),
+    ('first_request_ms', 'first request'),
+    ('second_request_ms', 'second request'),
+    ('to_first_response_ms', 'import to first response'),
+    ('wall_ms', 'process start to first response'),
+)
+
+
+def parse_import_times(output):
+    """Getting {module: (self us, cumulative us)} of the lines
+    written by python -X importtime.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+class Command(BaseCommand):
+    """Measuring the cold start of a worker is performed
+    by the python manage.py startup_report command.
+    It starts a fresh interpreter without and with api.warmup,
+    reports the time of every startup phase and of the first
+    requests to --path, and the slowest imports and packages.
+    """
+    help = 'Report import times and time to the first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/api/v1/genres/',
+            help='Path of the measured requests'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Number of the slowest modules to show'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Write the report as JSON'
+        )
+
+    def handle(self, *args, **options):
+        runs = {
+            name: self.run(options['path'], warm)
+            for name, warm in (('cold', False), ('warm', True))
+        }
+        modules = runs['cold'].pop('modules')
+        runs['warm'].pop('modules')
+        packages = Counter()
+        for name, (own, _) in modules.items():
+            packages[name.split('.')[0]] += own
+        slowest = sorted(
+            modules.items(), key=lambda item: item[1][1], reverse=True
+        )[:options['top']]
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'runs': runs,
+                'modules': {
+                    name: round(cumulative / 1000, 3)
+                    for name, (_, cumulative) in slowest
+                },
+                'packages': {
+                    name: round(own / 1000, 3)
+                    for name, own in packages.most_common(options['top'])
+                },
+            }, indent=2))
+            return
+        self.write_runs(runs)
+        self.stdout.write(f"\n{'module':<56}{'cumulative ms':>16}")
+        for name, (_, cumulative) in slowest:
+            self.stdout.write(f'{name:<56}{cumulative / 1000:>16.1f}')
+        self.stdout.write(f"\n{'package':<56}{'own ms':>16}")
+        for name, own in packages.most_common(options['top']):
+            self.stdout.write(f'{name:<56}{own / 1000:>16.1f}')
+
+    def run(self, path, warm):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [
+                sys.executable, '-X', 'importtime', '-c',
+                SCRIPT.format(path=path, warm=warm),
+            ],
+            cwd=settings.BASE_DIR,
+            env={
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': os.environ.get(
+                    'DJANGO_SETTINGS_MODULE', 'api_yamdb.settings'
+                ),
+            },
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if process.returncode:
+            raise CommandError(
+                f'The measured process failed:\n{process.stderr[-2000:]}'
+            )
+        result = json.loads(process.stdout.splitlines()[-1])
+        result['wall_ms'] = wall
+        result['interpreter_ms'] = wall - result['to_first_response_ms']
+        result['modules'] = parse_import_times(process.stderr)
+        return result
+
+    def write_runs(self, runs):
+        self.stdout.write(f"{'phase':<40}{'cold ms':>12}{'warm ms':>12}")
+        for key, title in PHASES:
+            self.stdout.write(
+                f"{title:<40}{runs['cold'][key]:>12.1f}"
+                f"{runs['warm'][key]:>12.1f}"
+            )
+        self.stdout.write(
+            f"Status of the measured requests: {runs['cold']['status']}"
+        )
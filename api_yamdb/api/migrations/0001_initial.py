@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-18 08:36
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceVersion',
+            fields=[
+                ('scope', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Resource')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Version')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date of change')),
+            ],
+            options={
+                'verbose_name': 'Resource version',
+                'verbose_name_plural': 'Resource versions',
+            },
+        ),
+    ]
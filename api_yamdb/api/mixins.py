@@ -1,4 +1,14 @@
-from rest_framework import mixins, viewsets
+import hashlib
+
+from django.utils import timezone
+from django.utils.http import (http_date, parse_etags, parse_http_date_safe,
+                               quote_etag)
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import response_cache
+from .models import ResourceVersion
 
 
 class CustomMixin(
@@ -8,3 +18,234 @@ class CustomMixin(
     viewsets.GenericViewSet
 ):
     pass
+
+
+class BulkCreateMixin:
+    """POST of a list creates all the items in one transaction
+    with the list serializer of the serializer class.
+    """
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class BulkUpdateMixin:
+    """PATCH of the list url updates the items of a list,
+    found by the lookup field of the list serializer,
+    in one transaction. Mapped by api.routers.BulkRouter.
+    """
+
+    def bulk_update(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            self.get_queryset(), data=request.data, many=True, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class SparseFieldsMixin:
+    """Output of the read requests limited by ?fields=name,year
+    and/or ?exclude=description. The fields are passed to the
+    serializer, and trim_queryset() can drop the joins, prefetches
+    and columns of the fields that are not requested.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def get_sparse_fields(self):
+        """Getting the requested fields in the order of the serializer,
+        or None if the output is not limited.
+        """
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+        self._sparse_fields = None
+        params = self.request.query_params
+        if self.request.method not in permissions.SAFE_METHODS or not (
+            params.get(self.fields_query_param)
+            or params.get(self.exclude_query_param)
+        ):
+            return None
+        available = list(self.get_serializer_class().Meta.fields)
+        requested = {}
+        for param in (self.fields_query_param, self.exclude_query_param):
+            names = [
+                name.strip()
+                for name in params.get(param, '').split(',') if name.strip()
+            ]
+            unknown = sorted(set(names) - set(available))
+            if unknown:
+                raise ValidationError(
+                    {param: [f'Unknown fields: {", ".join(unknown)}.']}
+                )
+            requested[param] = set(names)
+        fields = requested[self.fields_query_param] or set(available)
+        fields -= requested[self.exclude_query_param]
+        self._sparse_fields = [name for name in available if name in fields]
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return self.trim_queryset(queryset, fields)
+
+    def trim_queryset(self, queryset, fields):
+        return queryset
+
+
+class RowListMixin(SparseFieldsMixin):
+    """List endpoint rendering .values() rows with
+    row_serializer_class instead of the model serializer,
+    see api.row_serializers.
+    """
+    row_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.row_serializer_class(self.get_sparse_fields())
+        rows = serializer.get_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+
+class ResponseCacheMixin:
+    """Conditional GET and caching of the read endpoints.
+    The versions of the version_scopes, detail_version_scopes
+    for retrieve if set, formatted with the url kwargs,
+    which the signals in api.signals bump on every write,
+    are read with one query and give:
+    - a strong ETag and Last-Modified for every GET. A matching
+      If-None-Match gets 304 without running the handler, as the ETag
+      was given to a 200 response of the same versions; If-None-Match: *
+      and If-Modified-Since get 304 only when the handler answers 200,
+      so a missing object is still 404;
+    - the key of the cached response of an anonymous GET.
+    """
+
+    version_scopes = ()
+    detail_version_scopes = None
+
+    def get_version_scopes(self):
+        scopes = self.version_scopes
+        if self.action == 'retrieve' and self.detail_version_scopes:
+            scopes = self.detail_version_scopes
+        return [scope.format(**self.kwargs) for scope in scopes]
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        versions = ResourceVersion.objects.get_versions(
+            self.get_version_scopes()
+        )
+        key = response_cache.make_key(
+            f'{self.basename}:{self.action}',
+            {scope: version for scope, (version, _) in versions.items()},
+            request.build_absolute_uri()
+        )
+        etag = quote_etag(hashlib.md5(
+            f'{key}{request.accepted_media_type}'.encode()
+        ).hexdigest())
+        last_modified = get_last_modified(versions)
+
+        if has_etag(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = self.get_handler_response(
+                key, handler, request, *args, **kwargs
+            )
+            if (
+                response.status_code == status.HTTP_200_OK
+                and is_not_modified(request, etag, last_modified)
+            ):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_handler_response(self, key, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        data = response_cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+def get_last_modified(versions):
+    """Getting the time of the latest change of the scopes in seconds,
+    or None if one of them has never been changed.
+    """
+    dates = [
+        updated_at for scope, (_, updated_at) in versions.items()
+        if updated_at is not None or scope != ResourceVersion.GLOBAL_SCOPE
+    ]
+    if not dates or None in dates:
+        return None
+    last_modified = max(dates)
+    if timezone.is_naive(last_modified):
+        last_modified = timezone.make_aware(last_modified)
+    return int(last_modified.timestamp())
+
+
+def has_etag(request, etag):
+    """Getting True if If-None-Match lists the ETag itself."""
+    return any(
+        (candidate[2:] if candidate.startswith('W/') else candidate) == etag
+        for candidate in parse_etags(
+            request.META.get('HTTP_IF_NONE_MATCH', '')
+        )
+    )
+
+
+def is_not_modified(request, etag, last_modified):
+    """If-None-Match takes precedence over If-Modified-Since (RFC 7232)."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        return '*' in parse_etags(if_none_match) or has_etag(request, etag)
+    if_modified_since = parse_http_date_safe(
+        request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+    )
+    return (
+        if_modified_since is not None
+        and last_modified is not None
+        and last_modified <= if_modified_since
+    )
+
+
+class CachedListMixin(ResponseCacheMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(ResponseCacheMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,137 @@
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class ResourceVersionManager(models.Manager):
+
+    def bump(self, *scopes):
+        """Incrementing the versions of the given scopes.
+        Missing scopes are created first; the scopes that already
+        existed are then incremented twice, which is harmless.
+        """
+        scopes = sorted(set(scopes))
+        if not scopes:
+            return
+        now = timezone.now()
+        updated = self.filter(scope__in=scopes).update(
+            version=F('version') + 1, updated_at=now
+        )
+        if updated == len(scopes):
+            return
+        self.bulk_create(
+            [self.model(scope=scope, version=0, updated_at=now)
+             for scope in scopes],
+            ignore_conflicts=True
+        )
+        self.filter(scope__in=scopes).update(
+            version=F('version') + 1, updated_at=now
+        )
+
+    def get_versions(self, scopes):
+        """Getting {scope: (version, updated_at)} of the given scopes
+        and the global scope with one query.
+        Scopes that were never bumped have version 0.
+        """
+        versions = {scope: (0, None) for scope in scopes}
+        versions.setdefault(self.model.GLOBAL_SCOPE, (0, None))
+        for scope, version, updated_at in self.filter(
+            scope__in=list(versions)
+        ).values_list('scope', 'version', 'updated_at'):
+            versions[scope] = (version, updated_at)
+        return versions
+
+
+class ResourceVersion(models.Model):
+    """Version counter of an API resource (e.g. 'titles' or 'reviews:1').
+    It is incremented on every write that changes the resource,
+    so it can be used in cache keys. The GLOBAL_SCOPE version is
+    a part of every key and is bumped after bulk loads, which
+    do not send model signals.
+    """
+    GLOBAL_SCOPE = 'all'
+
+    scope = models.CharField(
+        max_length=100,
+        primary_key=True,
+        verbose_name='Resource'
+    )
+    version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Version'
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Date of change'
+    )
+
+    objects = ResourceVersionManager()
+
+    class Meta:
+        verbose_name = 'Resource version'
+        verbose_name_plural = 'Resource versions'
+
+    def __str__(self):
+        return f'{self.scope} v{self.version}'
+
+
+class OutboxEmail(models.Model):
+    """Email waiting to be sent by api.outbox.dispatch_pending()."""
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+    subject = models.CharField(
+        max_length=256,
+        verbose_name='Subject'
+    )
+    body = models.TextField(verbose_name='Body')
+    to_email = models.EmailField(
+        max_length=254,
+        verbose_name='Recipient'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Status'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Number of attempts'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Date of the next attempt'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Last error'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Date of creation'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Date of sending'
+    )
+
+    class Meta:
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outbox_status_next_idx'
+            ),
+        ]
+        verbose_name = 'Outbox email'
+        verbose_name_plural = 'Outbox emails'
+
+    def __str__(self):
+        return f'{self.to_email}: {self.subject}'
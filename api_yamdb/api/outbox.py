@@ -0,0 +1,146 @@
+"""Outbox of emails.
+
+Requests only insert an OutboxEmail row with queue_email().
+The rows are sent by dispatch_pending(), which reuses one connection
+of the email backend per batch and retries failed emails with
+an exponential backoff. It is called, depending on
+settings.EMAIL_OUTBOX['DISPATCH']:
+- 'thread': by a thread pool after the transaction is committed;
+- 'sync': in the request after the transaction is committed;
+- 'worker': only by the python manage.py send_emails command.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.EMAIL_OUTBOX['THREADS'],
+        thread_name_prefix='outbox'
+    )
+
+
+def queue_email(data):
+    """Saving the email to the outbox and scheduling its dispatch."""
+    OutboxEmail.objects.create(
+        subject=data['email_subject'],
+        body=data['email_body'],
+        to_email=data['to_email']
+    )
+    dispatch = settings.EMAIL_OUTBOX['DISPATCH']
+    if dispatch == 'thread':
+        transaction.on_commit(
+            lambda: get_executor().submit(dispatch_in_thread)
+        )
+    elif dispatch == 'sync':
+        transaction.on_commit(dispatch_pending)
+
+
+def dispatch_in_thread():
+    try:
+        dispatch_pending()
+    except Exception:
+        logger.exception('Outbox dispatch failed')
+    finally:
+        close_old_connections()
+
+
+def claim_batch(batch_size):
+    """Taking due emails and moving their next attempt forward,
+    so other workers skip them while they are being sent.
+    """
+    config = settings.EMAIL_OUTBOX
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(
+            next_attempt_at=now + timedelta(seconds=config['LEASE_SECONDS'])
+        )
+    return emails
+
+
+def get_backoff(attempts):
+    config = settings.EMAIL_OUTBOX
+    return timedelta(seconds=min(
+        config['BACKOFF_SECONDS'] * 2 ** (attempts - 1),
+        config['MAX_BACKOFF_SECONDS']
+    ))
+
+
+def record_failure(email, error):
+    """Scheduling the next attempt of a failed email,
+    or giving up after MAX_ATTEMPTS attempts.
+    """
+    email.last_error = str(error)
+    if email.attempts >= settings.EMAIL_OUTBOX['MAX_ATTEMPTS']:
+        email.status = OutboxEmail.FAILED
+    else:
+        email.next_attempt_at = timezone.now() + get_backoff(email.attempts)
+
+
+def save_attempt(email):
+    email.save(update_fields=[
+        'attempts', 'status', 'next_attempt_at', 'last_error', 'sent_at'
+    ])
+
+
+def dispatch_pending(batch_size=None):
+    """Sending the due emails of the outbox.
+    Returns the numbers of sent and failed emails.
+    """
+    emails = claim_batch(batch_size or settings.EMAIL_OUTBOX['BATCH_SIZE'])
+    if not emails:
+        return 0, 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        # The whole batch counts as an attempt and is retried later.
+        logger.warning('Email backend is unavailable: %s', error)
+        for email in emails:
+            email.attempts += 1
+            record_failure(email, error)
+            save_attempt(email)
+        return 0, len(emails)
+    sent = failed = 0
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                to=[email.to_email],
+                connection=connection
+            )
+            email.attempts += 1
+            try:
+                connection.send_messages([message])
+            except Exception as error:
+                failed += 1
+                record_failure(email, error)
+            else:
+                sent += 1
+                email.status = OutboxEmail.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ''
+            save_attempt(email)
+    finally:
+        connection.close()
+    return sent, failed
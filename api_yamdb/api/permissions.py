@@ -47,3 +47,15 @@ class IsAdminOrReadOnly(permissions.BasePermission):
                 or request.user.role == 'admin'
             )
         )
+
+
+class IsAdmin(permissions.BasePermission):
+    """Only Admin has access.
+    """
+    def has_permission(self, request, view):
+        return (
+            request.user.is_authenticated
+            and (
+                request.user.is_admin
+                or request.user.is_superuser)
+        )
@@ -0,0 +1,176 @@
+"""Process-local pool of database connections.
+
+The api.pooled_postgresql engine takes its connections from here
+instead of opening one per request. A pool holds at most MAX_SIZE
+connections, idle or in use; when all are in use a request waits up
+to TIMEOUT seconds for one. Connections idle for longer than
+IDLE_TIMEOUT are closed, those idle for longer than CHECK_AFTER are
+checked with a query before use. Pools are not shared with the
+processes forked from this one, e.g. the workers of a preloading
+gunicorn: a child forgets the connections of its parent without
+closing them, since closing would end the parent's sessions.
+"""
+import os
+import threading
+import time
+from collections import Counter
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+pools = {}
+pools_lock = threading.Lock()
+
+connects = Counter()
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, check, max_size=10, idle_timeout=300,
+                 timeout=5, check_after=5):
+        self.connect = connect
+        self.check = check
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.check_after = check_after
+        # (release time, connection), the last released is reused first.
+        self.idle = []
+        self.size = 0
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+        self.counters = Counter()
+
+    def acquire(self):
+        """Getting a checked idle connection or a new one."""
+        released_at, connection = self.take()
+        if connection is None:
+            return self.open()
+        if time.monotonic() - released_at < self.check_after:
+            self.count('reused')
+            return connection
+        if self.check(connection):
+            self.count('reused')
+            return connection
+        self.count('failed_checks')
+        self.discard(connection)
+        return self.acquire()
+
+    def take(self):
+        """Getting an idle connection, (None, None) when a new one
+        may be opened instead. Waits while the pool is full.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            self.forget_parent()
+            self.close_expired()
+            while not self.idle and self.size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.count('timeouts')
+                    raise PoolTimeoutError(
+                        f'No free connection in the pool of {self.max_size} '
+                        f'for {self.timeout} seconds'
+                    )
+                self.count('waits')
+                self.condition.wait(remaining)
+            if self.idle:
+                return self.idle.pop()
+            self.size += 1
+            return None, None
+
+    def open(self):
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        self.count('created')
+        return connection
+
+    def release(self, connection, reusable=True):
+        with self.condition:
+            if reusable and self.pid == os.getpid():
+                self.idle.append((time.monotonic(), connection))
+                self.condition.notify()
+                return
+        self.discard(connection)
+
+    def discard(self, connection):
+        with self.condition:
+            if self.pid == os.getpid():
+                self.size -= 1
+                self.condition.notify()
+        self.count('closed')
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def count(self, counter, value=1):
+        with self.condition:
+            self.counters[counter] += value
+
+    def forget_parent(self):
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.idle = []
+            self.size = 0
+
+    def close_expired(self):
+        oldest = time.monotonic() - self.idle_timeout
+        expired = [
+            connection for released_at, connection in self.idle
+            if released_at < oldest
+        ]
+        if not expired:
+            return
+        self.idle = [entry for entry in self.idle if entry[0] >= oldest]
+        self.size -= len(expired)
+        self.count('closed_idle', len(expired))
+        for connection in expired:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'max_size': self.max_size,
+                **self.counters,
+            }
+
+
+def get_pool(key, connect, check, **options):
+    with pools_lock:
+        if key not in pools:
+            pools[key] = ConnectionPool(connect, check, **options)
+        return pools[key]
+
+
+def stats():
+    return {
+        'connects': dict(connects),
+        'pools': [
+            {'alias': alias, **pool.stats()}
+            for (alias, _), pool in list(pools.items())
+        ],
+    }
+
+
+@receiver(connection_created)
+def count_connect(sender, connection, **kwargs):
+    """Django connects once per request without persistent
+    connections and once per checkout from a pool.
+    """
+    connects[connection.alias] += 1
@@ -0,0 +1,77 @@
+"""PostgreSQL engine taking its connections from api.pool.
+
+Closing a connection returns it to the pool of the process, rolled
+back if it is inside a transaction. Use it with CONN_MAX_AGE=0, so
+the connection of a request goes back to the pool when the request
+ends and the threads of a worker share the pool. The pool options
+are read from the POOL key of the database settings.
+"""
+import functools
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from ..pool import PoolTimeoutError, get_pool
+
+Database = base.Database
+
+
+def is_usable(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if (
+            connection.get_transaction_status()
+            != extensions.TRANSACTION_STATUS_IDLE
+        ):
+            connection.rollback()
+    except Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_pool(self, conn_params):
+        options = {
+            name.lower(): value
+            for name, value in self.settings_dict.get('POOL', {}).items()
+        }
+        # Test databases change the name of a database, and a pool
+        # must not hand out the connections of the previous one.
+        key = (self.alias, repr(sorted(conn_params.items())))
+        return get_pool(
+            key, functools.partial(Database.connect, **conn_params),
+            is_usable, **options
+        )
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        try:
+            connection = self.pool.acquire()
+        except PoolTimeoutError as error:
+            raise Database.OperationalError(str(error)) from error
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        connection = self.connection
+        reusable = not self.in_atomic_block and not connection.closed
+        if reusable and (
+            connection.get_transaction_status()
+            != extensions.TRANSACTION_STATUS_IDLE
+        ):
+            try:
+                connection.rollback()
+            except Database.Error:
+                reusable = False
+        self.pool.release(connection, reusable)
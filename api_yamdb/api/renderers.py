@@ -0,0 +1,127 @@
+"""Renderers of the API responses.
+
+ORJSONRenderer gives the same JSON as rest_framework.renderers.JSONRenderer
+with the compact and unicode settings of the project, but serializes
+with orjson. MessagePackRenderer gives the same data as MessagePack
+for clients sending Accept: application/msgpack or ?format=msgpack.
+Values unknown to the libraries, e.g. Decimal or lazy strings, are
+converted by the JSON encoder of DRF, so all renderers give equal data.
+NDJSONRenderer and CSVRenderer render the streaming exports of
+api.export with iter_render().
+"""
+import csv
+import io
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ENCODER = JSONEncoder()
+
+
+def default(obj):
+    return ENCODER.default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def get_options(self, accepted_media_type, renderer_context):
+        """Any requested indent, e.g. by the browsable API,
+        gives two spaces, the only indent of orjson.
+        """
+        if 'indent' in (accepted_media_type or '') or (
+            (renderer_context or {}).get('indent')
+        ):
+            return orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+        return orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        content = orjson.dumps(
+            data,
+            default=default,
+            option=self.get_options(accepted_media_type, renderer_context)
+        )
+        # Escaped by the JSONRenderer of DRF for embedding into <script>.
+        return content.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=default, use_bin_type=True)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """One JSON object per line. A list is rendered as its items,
+    any other data, e.g. an error, as one line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render_chunk(self, rows):
+        return b''.join(
+            orjson.dumps(row, default=default) + b'\n' for row in rows
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.render_chunk(data if isinstance(data, list) else [data])
+
+    def iter_render(self, fields, chunks):
+        for rows in chunks:
+            yield self.render_chunk(rows)
+
+
+class CSVRenderer(BaseRenderer):
+    """A header and a line per object. Lists are joined with commas,
+    None is an empty cell.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    @staticmethod
+    def get_cell(value):
+        if value is None:
+            return ''
+        if isinstance(value, list):
+            return ','.join(str(item) for item in value)
+        return value
+
+    def render_chunk(self, fields, rows, header=False):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(fields)
+        writer.writerows(
+            [self.get_cell(row.get(name)) for name in fields] for row in rows
+        )
+        return buffer.getvalue().encode(self.charset)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        fields = list(dict.fromkeys(name for row in rows for name in row))
+        return self.render_chunk(fields, rows, header=True)
+
+    def iter_render(self, fields, chunks):
+        yield self.render_chunk(fields, [], header=True)
+        for rows in chunks:
+            yield self.render_chunk(fields, rows)
@@ -0,0 +1,113 @@
+"""Routing of reads to the replicas of the default database.
+
+ReplicaMiddleware picks the database of a request: one of
+settings.DATABASE_REPLICAS for the safe methods and the primary
+for the writes. After a successful write the reads of its user stay
+on the primary for STICKY_SECONDS, so the user sees the review or
+comment just posted while the replicas catch up. The user is read
+from the JWT without checking the signature, a forged token can
+only send the reads to the primary. Queries outside requests,
+e.g. of management commands, go to the primary.
+"""
+import random
+import threading
+from contextvars import ContextVar
+
+import jwt
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import create_backend
+
+PRIMARY = 'default'
+
+read_database = ContextVar('read_database', default=PRIMARY)
+
+sticky_users = create_backend(
+    settings.REPLICA_ROUTING,
+    timeout=settings.REPLICA_ROUTING['STICKY_SECONDS']
+)
+
+counters = {'replica': 0, 'primary': 0, 'sticky': 0}
+counters_lock = threading.Lock()
+
+
+def stats():
+    with counters_lock:
+        return {
+            'replicas': len(settings.DATABASE_REPLICAS),
+            'requests': dict(counters),
+        }
+
+
+def get_user_id(request):
+    parts = request.META.get(api_settings.AUTH_HEADER_NAME, '').split()
+    if len(parts) != 2 or parts[0] not in api_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        payload = jwt.decode(parts[1], options={'verify_signature': False})
+    except jwt.InvalidTokenError:
+        return None
+    # The token is not verified here, the claim may be anything.
+    user_id = payload.get(api_settings.USER_ID_CLAIM)
+    if isinstance(user_id, bool) or not isinstance(user_id, (int, str)):
+        return None
+    return str(user_id)
+
+
+def count(counter):
+    with counters_lock:
+        counters[counter] += 1
+
+
+def choose_database(method, user_id):
+    """Getting the alias of the database for the reads of a request."""
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas or method not in SAFE_METHODS:
+        count('primary')
+        return PRIMARY
+    if user_id is not None and sticky_users.get(user_id):
+        count('sticky')
+        return PRIMARY
+    count('replica')
+    return random.choice(replicas)
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user_id = get_user_id(request)
+        token = read_database.set(choose_database(request.method, user_id))
+        try:
+            response = self.get_response(request)
+        finally:
+            read_database.reset(token)
+        if (
+            request.method not in SAFE_METHODS
+            and user_id is not None
+            and response.status_code < 400
+        ):
+            sticky_users.set(user_id, True)
+        return response
+
+
+class ReplicaRouter:
+    """Reads go to the database chosen for the request,
+    writes always go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -0,0 +1,13 @@
+from rest_framework.routers import Route, SimpleRouter
+
+
+class BulkRouter(SimpleRouter):
+    """SimpleRouter that also maps PATCH of the list url
+    to the bulk_update action of the viewsets having it.
+    """
+    routes = [
+        route._replace(mapping={**route.mapping, 'patch': 'bulk_update'})
+        if isinstance(route, Route) and route.name == '{basename}-list'
+        else route
+        for route in SimpleRouter.routes
+    ]
@@ -0,0 +1,123 @@
+"""Read-only serializers of .values() rows for the list endpoints.
+
+They give the same output as TitleReadSerializer, ReviewSerializer
+and CommentSerializer without creating model instances and running
+the serializer fields for every row. tests/test_row_serializers.py
+checks that the outputs are equal.
+
+Given the requested fields, a row serializer selects only
+the columns they need (and the key columns used by pagination)
+and skips the queries of the relations that are not requested.
+"""
+from collections import defaultdict
+
+from rest_framework import serializers
+from reviews.models import GenreTitle
+
+# Formats dates as serializers.DateTimeField of the model serializers.
+DATETIME = serializers.DateTimeField()
+
+
+class RowSerializer:
+    """Serializer of the rows of get_rows(queryset).
+    columns maps the output fields, in the order of output,
+    to the columns of .values() they are built from. A field
+    is the value of its first column, formatted as a date for
+    datetime_fields, or is built by the build_<field>(row) method
+    if the serializer has one.
+    """
+    key_values = ('id',)
+    columns = {}
+    datetime_fields = ()
+
+    def __init__(self, fields=None):
+        self.fields = [
+            name for name in self.columns
+            if fields is None or name in fields
+        ]
+
+    def get_rows(self, queryset):
+        values = dict.fromkeys(self.key_values)
+        for name in self.fields:
+            values.update(dict.fromkeys(self.columns[name]))
+        return queryset.prefetch_related(None).values(*values)
+
+    def get_value(self, name, row):
+        method = getattr(self, f'build_{name}', None)
+        if method is not None:
+            return method(row)
+        value = row.get(self.columns[name][0])
+        if name in self.datetime_fields:
+            return DATETIME.to_representation(value)
+        return value
+
+    def to_representation(self, row):
+        return {name: self.get_value(name, row) for name in self.fields}
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class TitleRowSerializer(RowSerializer):
+    """The genres of all rows are loaded with one query."""
+    columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'genre': (),
+        'rating': ('rating',),
+        'category': ('category__name', 'category__slug'),
+        'description': ('description',),
+    }
+
+    def get_genres(self, title_ids):
+        genres = defaultdict(list)
+        for title_id, name, slug in (
+            GenreTitle.objects.filter(title_id__in=title_ids)
+            .order_by('genre_id')
+            .values_list('title_id', 'genre__name', 'genre__slug')
+        ):
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.genres = {}
+        if 'genre' in self.fields:
+            self.genres = self.get_genres([row['id'] for row in rows])
+        return super().serialize(rows)
+
+    def build_genre(self, row):
+        return self.genres.get(row['id'], [])
+
+    def build_category(self, row):
+        if row.get('category__slug') is None:
+            return None
+        return {
+            'name': row['category__name'],
+            'slug': row['category__slug'],
+        }
+
+
+class ReviewRowSerializer(RowSerializer):
+    key_values = ('id', 'pub_date')
+    columns = {
+        'id': ('id',),
+        'title': ('title__name',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+    datetime_fields = ('pub_date',)
+
+
+class CommentRowSerializer(RowSerializer):
+    key_values = ('id', 'pub_date')
+    columns = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+    datetime_fields = ('pub_date',)
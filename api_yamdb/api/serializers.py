@@ -1,8 +1,29 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from rest_framework.validators import UniqueValidator
+from reviews.models import (Category, CategoryStats, Comment, Genre,
+                            GenreStats, GenreTitle, Review, Title, User)
+from reviews.stats import create_missing_stats, rebuild_stats
 
+from .models import ResourceVersion
 
-class UsersSerializer(serializers.ModelSerializer):
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """Model serializer keeping only the given fields,
+    see api.mixins.SparseFieldsMixin.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class UsersSerializer(SparseFieldsSerializer):
     class Meta:
         model = User
         fields = (
@@ -41,7 +62,193 @@ class SignUpSerializer(serializers.ModelSerializer):
         fields = ('email', 'username')
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField taking the objects from
+    context['prefetched'][model] when a bulk list serializer has
+    loaded them, instead of a query per value.
+    """
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        prefetched = self.context.get('prefetched', {}).get(queryset.model)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            return prefetched[str(data)]
+        except KeyError:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Validation and saving of a list of objects.
+    The related objects of all items are loaded by prefetch()
+    before the items are validated, the errors are reported
+    per item, and the objects are saved by create() and update()
+    of the subclasses in one transaction.
+    The serializer updates the objects when it is given
+    the queryset to look them up in as the instance.
+    """
+    lookup_field = 'id'
+
+    def get_lookup_key(self, item):
+        """Getting the lookup value of an item converted
+        by the model field, None when it is missing or invalid.
+        """
+        key = item.get(self.lookup_field) if isinstance(item, dict) else None
+        if key is None:
+            return None
+        field = self.child.Meta.model._meta.get_field(self.lookup_field)
+        try:
+            return field.to_python(key)
+        except ValidationError:
+            return None
+
+    def prefetch(self, data):
+        self.instances = {}
+        if self.instance is None:
+            return
+        keys = {self.get_lookup_key(item) for item in data} - {None}
+        self.instances = {
+            getattr(instance, self.lookup_field): instance
+            for instance in self.instance.filter(**{
+                f'{self.lookup_field}__in': keys
+            })
+        }
+
+    def get_item_instance(self, item):
+        if self.instance is None:
+            return None
+        instance = self.instances.get(self.get_lookup_key(item))
+        if instance is None:
+            raise serializers.ValidationError(
+                {self.lookup_field: ['Object with this key does not exist.']}
+            )
+        return instance
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError(
+                {'non_field_errors': ['Expected a list of items.']}
+            )
+        if not data:
+            raise serializers.ValidationError(
+                {'non_field_errors': ['This list may not be empty.']}
+            )
+        if len(data) > settings.BULK_MAX_ITEMS:
+            raise serializers.ValidationError({'non_field_errors': [
+                f'No more than {settings.BULK_MAX_ITEMS} items are allowed.'
+            ]})
+        self.prefetch(data)
+        result, errors = [], []
+        for item in data:
+            try:
+                self.child.instance = self.get_item_instance(item)
+                validated = self.child.run_validation(item)
+            except serializers.ValidationError as error:
+                errors.append(error.detail)
+            else:
+                if self.child.instance is not None:
+                    validated[self.lookup_field] = self.child.instance
+                result.append(validated)
+                errors.append({})
+        self.child.instance = None
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return result
+
+    def get_update_fields(self, validated_data):
+        return sorted({
+            name for item in validated_data for name in item
+            if name != self.lookup_field
+        })
+
+
+class SlugListSerializer(BulkListSerializer):
+    """Bulk list serializer of categories and genres.
+    The unique fields of all items are checked with one query
+    per field instead of the UniqueValidator of every item.
+    """
+    lookup_field = 'slug'
+    scope = None
+
+    def prefetch(self, data):
+        super().prefetch(data)
+        model = self.child.Meta.model
+        self.taken = {}
+        for name, field in self.child.fields.items():
+            validators = [
+                validator for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+            if len(validators) == len(field.validators):
+                continue
+            field.validators = validators
+            values = [
+                item.get(name) for item in data
+                if isinstance(item, dict) and isinstance(item.get(name), str)
+            ]
+            self.taken[name] = dict(
+                model.objects.filter(**{f'{name}__in': values})
+                .values_list(name, 'pk')
+            )
+
+    def get_item_instance(self, item):
+        instance = super().get_item_instance(item)
+        # A new item owns its values under a key of its own.
+        owner = object() if instance is None else instance.pk
+        errors = {}
+        for name, taken in self.taken.items():
+            value = item.get(name) if isinstance(item, dict) else None
+            if not isinstance(value, str):
+                continue
+            if taken.get(value, owner) != owner:
+                errors[name] = [f'Object with this {name} already exists.']
+        if errors:
+            raise serializers.ValidationError(errors)
+        for name, taken in self.taken.items():
+            value = item.get(name)
+            if isinstance(value, str):
+                taken[value] = owner
+        return instance
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objects = [model(**item) for item in validated_data]
+        with transaction.atomic():
+            ResourceVersion.objects.bump(self.scope, 'titles')
+            model.objects.bulk_create(objects)
+            create_missing_stats()
+        return objects
+
+    def update(self, instance, validated_data):
+        fields = self.get_update_fields(validated_data)
+        objects = []
+        for item in validated_data:
+            obj = item[self.lookup_field]
+            for name in fields:
+                if name in item:
+                    setattr(obj, name, item[name])
+            objects.append(obj)
+        with transaction.atomic():
+            if fields:
+                self.child.Meta.model.objects.bulk_update(objects, fields)
+            ResourceVersion.objects.bump(self.scope, 'titles')
+        return objects
+
+
+class CategoryListSerializer(SlugListSerializer):
+    scope = 'categories'
+
+
+class GenreListSerializer(SlugListSerializer):
+    scope = 'genres'
+
+
+class CategorySerializer(SparseFieldsSerializer):
 
     class Meta:
         fields = (
@@ -49,9 +256,10 @@ class CategorySerializer(serializers.ModelSerializer):
         )
         lookup_field = ('slug',)
         model = Category
+        list_serializer_class = CategoryListSerializer
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsSerializer):
 
     class Meta:
         fields = (
@@ -59,12 +267,13 @@ class GenreSerializer(serializers.ModelSerializer):
         )
         lookup_field = ('slug',)
         model = Genre
+        list_serializer_class = GenreListSerializer
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsSerializer):
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
-    rating = serializers.IntegerField()
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         fields = (
@@ -78,11 +287,127 @@ class TitleReadSerializer(serializers.ModelSerializer):
         model = Title
 
 
+class TitleListSerializer(BulkListSerializer):
+    """Bulk list serializer of compositions. The genres and
+    categories of all items are loaded with one query each,
+    the genre links are inserted with bulk_create.
+    """
+
+    def prefetch(self, data):
+        super().prefetch(data)
+        slugs = {'genre': set(), 'category': set()}
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            genres = item.get('genre')
+            if isinstance(genres, list):
+                slugs['genre'].update(map(str, genres))
+            if item.get('category') is not None:
+                slugs['category'].add(str(item['category']))
+        self._context['prefetched'] = {
+            model: model.objects.in_bulk(slugs[name], field_name='slug')
+            for name, model in (('genre', Genre), ('category', Category))
+        }
+
+    def save_titles(self, titles):
+        """bulk_create sets the ids on PostgreSQL only,
+        other databases get the titles saved one by one.
+        """
+        if connection.features.can_return_ids_from_bulk_insert:
+            return Title.objects.bulk_create(titles)
+        for title in titles:
+            title.save()
+        return titles
+
+    def save_genres(self, titles, validated_data, replace=False):
+        changed = [
+            (title, item['genre'])
+            for title, item in zip(titles, validated_data)
+            if 'genre' in item
+        ]
+        if replace and changed:
+            GenreTitle.objects.filter(
+                title__in=[title for title, _ in changed]
+            ).delete()
+        GenreTitle.objects.bulk_create([
+            GenreTitle(title=title, genre=genre)
+            for title, genres in changed
+            for genre in dict.fromkeys(genres)
+        ])
+
+    def get_result(self, titles):
+        """Getting the saved titles with their genres in two queries."""
+        saved = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).in_bulk([title.pk for title in titles])
+        return [saved[title.pk] for title in titles]
+
+    def bump_versions(self, titles):
+        ResourceVersion.objects.bump('titles', *(
+            f'title:{title.pk}' for title in titles
+        ))
+
+    def rebuild_stats(self, titles, genre_ids=(), category_ids=()):
+        """Recalculating the statistics of the groups of the titles
+        and of the given groups they have left, the bulk writes
+        do not send the signals updating them.
+        """
+        genre_ids = set(genre_ids).union(
+            GenreTitle.objects.filter(title__in=titles)
+            .values_list('genre_id', flat=True)
+        )
+        category_ids = set(category_ids).union(
+            title.category_id for title in titles
+        )
+        category_ids.discard(None)
+        rebuild_stats(genre_ids=genre_ids, category_ids=category_ids)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            titles = self.save_titles([
+                Title(**{
+                    name: value for name, value in item.items()
+                    if name != 'genre'
+                })
+                for item in validated_data
+            ])
+            self.save_genres(titles, validated_data)
+            self.rebuild_stats(titles)
+            self.bump_versions(titles)
+        return self.get_result(titles)
+
+    def update(self, instance, validated_data):
+        fields = [
+            name for name in self.get_update_fields(validated_data)
+            if name != 'genre'
+        ]
+        titles = []
+        category_ids = set()
+        for item in validated_data:
+            title = item[self.lookup_field]
+            category_ids.add(title.category_id)
+            for name in fields:
+                if name in item:
+                    setattr(title, name, item[name])
+            titles.append(title)
+        with transaction.atomic():
+            genre_ids = list(
+                GenreTitle.objects.filter(title__in=titles)
+                .values_list('genre_id', flat=True)
+            )
+            if fields:
+                Title.objects.bulk_update(titles, fields)
+            self.save_genres(titles, validated_data, replace=True)
+            self.rebuild_stats(titles, genre_ids, category_ids)
+            self.bump_versions(titles)
+        return self.get_result(titles)
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = PrefetchedSlugRelatedField(
         slug_field='slug', many=True, queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
+    category = PrefetchedSlugRelatedField(
         slug_field='slug', queryset=Category.objects.all()
     )
 
@@ -95,9 +420,10 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             'id',
         )
         model = Title
+        list_serializer_class = TitleListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializer):
     title = serializers.SlugRelatedField(
         slug_field='name',
         read_only=True
@@ -129,7 +455,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
@@ -138,3 +464,103 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         fields = ('id', 'text', 'author', 'pub_date')
         model = Comment
+
+
+def get_title_names(stats_list):
+    title_ids = {
+        entry[0] for stats in stats_list
+        for entry in stats.get_leaderboard()
+    }
+    return dict(
+        Title.objects.filter(pk__in=title_ids).values_list('id', 'name')
+    )
+
+
+class StatsListSerializer(serializers.ListSerializer):
+    """The names of the leaderboard compositions of all items
+    are loaded with one query.
+    """
+
+    def to_representation(self, data):
+        data = list(data)
+        self.child.title_names = get_title_names(data)
+        return super().to_representation(data)
+
+
+class StatsSerializer(serializers.ModelSerializer):
+    mean_score = serializers.FloatField(read_only=True)
+    top_titles = serializers.SerializerMethodField()
+
+    title_names = None
+
+    class Meta:
+        fields = (
+            'name', 'slug', 'title_count', 'review_count',
+            'mean_score', 'top_titles',
+        )
+        list_serializer_class = StatsListSerializer
+
+    def get_top_titles(self, obj):
+        names = self.title_names
+        if names is None:
+            names = get_title_names([obj])
+        return [
+            {
+                'id': title_id,
+                'name': names[title_id],
+                'rating': rating,
+                'review_count': review_count,
+            }
+            for title_id, rating, review_count in obj.get_leaderboard()
+            if title_id in names
+        ]
+
+
+class GenreStatsSerializer(StatsSerializer):
+    name = serializers.CharField(source='genre.name')
+    slug = serializers.CharField(source='genre.slug')
+
+    class Meta(StatsSerializer.Meta):
+        model = GenreStats
+
+
+class CategoryStatsSerializer(StatsSerializer):
+    name = serializers.CharField(source='category.name')
+    slug = serializers.CharField(source='category.slug')
+
+    class Meta(StatsSerializer.Meta):
+        model = CategoryStats
+
+
+class TrendingSerializer(serializers.Serializer):
+    window = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.TRENDING['MAX_WINDOW_DAYS'],
+        default=settings.TRENDING['WINDOW_DAYS']
+    )
+    decay = serializers.FloatField(
+        min_value=0,
+        max_value=1,
+        default=settings.TRENDING['DECAY']
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET'], default='GET')
+    path = serializers.RegexField(r'^/api/', max_length=2000)
+    headers = serializers.DictField(
+        child=serializers.CharField(), default=dict
+    )
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f'No more than {settings.BATCH_MAX_REQUESTS} sub-requests '
+                'are allowed.'
+            )
+        return value
@@ -0,0 +1,116 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User, is_cascaded)
+from reviews.signals import bulk_loaded
+
+from .models import ResourceVersion
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_versions(sender, instance, **kwargs):
+    ResourceVersion.objects.bump('categories', 'titles')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_genre_versions(sender, instance, **kwargs):
+    ResourceVersion.objects.bump('genres', 'titles')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def bump_title_versions(sender, instance, **kwargs):
+    ResourceVersion.objects.bump(
+        'titles', f'title:{instance.pk}', f'reviews:{instance.pk}'
+    )
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def bump_genre_title_versions(sender, instance, **kwargs):
+    ResourceVersion.objects.bump('titles', f'title:{instance.title_id}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genre_versions(sender, instance, action, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Title):
+        ResourceVersion.objects.bump('titles', f'title:{instance.pk}')
+    else:
+        # Changed from the genre side, pk_set may be empty on clear().
+        ResourceVersion.objects.bump('titles', 'genres')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_review_versions(sender, instance, **kwargs):
+    if is_cascaded(instance):
+        return
+    ResourceVersion.objects.bump(
+        'titles',
+        f'title:{instance.title_id}',
+        f'reviews:{instance.title_id}',
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_versions(sender, instance, **kwargs):
+    ResourceVersion.objects.bump(f'comments:{instance.review_id}')
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, using, update_fields=None,
+                      **kwargs):
+    instance._previous_username = None
+    if instance.pk is None or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        return
+    instance._previous_username = (
+        User.objects.using(using).filter(pk=instance.pk)
+        .values_list('username', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=User)
+def bump_author_versions(sender, instance, **kwargs):
+    """Reviews and comments show the username of the author,
+    the deletes of a user are covered by bump_reviewed_title_versions()
+    and the deletes of its comments.
+    """
+    previous_username = getattr(instance, '_previous_username', None)
+    if previous_username in (None, instance.username):
+        return
+    title_ids = Review.objects.filter(author=instance).values_list(
+        'title_id', flat=True
+    ).distinct()
+    review_ids = Comment.objects.filter(author=instance).values_list(
+        'review_id', flat=True
+    ).distinct()
+    ResourceVersion.objects.bump(
+        *[f'reviews:{title_id}' for title_id in title_ids],
+        *[f'comments:{review_id}' for review_id in review_ids],
+    )
+
+
+@receiver(post_delete, sender=User)
+def bump_reviewed_title_versions(sender, instance, **kwargs):
+    title_ids = getattr(instance, '_reviewed_titles', None)
+    if not title_ids:
+        return
+    ResourceVersion.objects.bump(
+        'titles',
+        *[f'title:{title_id}' for title_id in title_ids],
+        *[f'reviews:{title_id}' for title_id in title_ids],
+    )
+
+
+@receiver(bulk_loaded)
+def bump_all_versions(sender, **kwargs):
+    ResourceVersion.objects.bump(ResourceVersion.GLOBAL_SCOPE)
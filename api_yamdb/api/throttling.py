@@ -0,0 +1,202 @@
+"""Token bucket throttling of the API.
+
+settings.THROTTLING['RATES'] maps a scope to the rates of its
+buckets, e.g. {'reviews.create': {'user': '10/min', 'ip': '30/min'}}.
+The scope of a request is '<basename>.<action>' of a viewset, or the
+basename alone, and the name of a function view, e.g. 'auth_signup'.
+A bucket of '10/min' holds up to 10 tokens and gets 10 per minute
+back; a request takes a token from every bucket of its scope, one per
+client IP and one per authenticated user, or is answered with 429 and
+Retry-After when one of them is empty. Requests of the scopes that
+are not configured are not throttled.
+
+The client IP is REMOTE_ADDR, or the address added to X-Forwarded-For
+by the last of REST_FRAMEWORK['NUM_PROXIES'] trusted proxies, so a
+client cannot pick its own identity by sending the header.
+
+The buckets are kept by the storage of THROTTLING['BACKEND']:
+LocalBucketStore keeps them in the process, so every worker counts
+on its own, RedisBucketStore shares them between the workers.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from .cache import create_backend
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {
+    's': 1, 'sec': 1,
+    'm': 60, 'min': 60,
+    'h': 3600, 'hour': 3600,
+    'd': 86400, 'day': 86400,
+}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Getting (capacity, tokens per second) of a rate like '10/min'."""
+    count, period = rate.split('/')
+    return int(count), int(count) / PERIODS[period]
+
+
+def refill(tokens, at, capacity, rate, now):
+    return min(capacity, tokens + max(0, now - at) * rate)
+
+
+class LocalBucketStore:
+    """Process-local buckets, at most max_entries of them. The least
+    recently used bucket is dropped first, it is the one most likely
+    to be full again.
+    """
+
+    def __init__(self, max_entries=10000, url=None):
+        self.max_entries = max_entries
+        # key: (tokens, time of the last change)
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, buckets, now):
+        """Taking a token from every (key, capacity, rate) bucket.
+        Returns 0, or the seconds to wait if a bucket is empty,
+        and then no token is taken.
+        """
+        with self.lock:
+            levels = []
+            wait = 0
+            for key, capacity, rate in buckets:
+                tokens, at = self.buckets.get(key, (capacity, now))
+                tokens = refill(tokens, at, capacity, rate, now)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+                levels.append((key, tokens))
+            if wait:
+                return wait
+            for key, tokens in levels:
+                self.buckets[key] = (tokens - 1, now)
+                self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_entries:
+                self.buckets.popitem(last=False)
+            return 0
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+# Checks all the buckets before taking a token from any of them.
+# KEYS are the buckets, ARGV the time, then capacity and rate
+# of every bucket. Returns the seconds to wait as a string.
+CONSUME_SCRIPT = '''
+local now = tonumber(ARGV[1])
+local levels = {}
+local wait = 0
+for index, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[index * 2])
+    local rate = tonumber(ARGV[index * 2 + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+    levels[index] = tokens
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for index, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[index * 2])
+    local rate = tonumber(ARGV[index * 2 + 1])
+    redis.call('HMSET', key, 'tokens', levels[index] - 1, 'at', now)
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return '0'
+'''
+
+
+class RedisBucketStore:
+    """Buckets in Redis shared by all workers, checked and taken
+    atomically by one script call per request. A bucket expires
+    when it would be full again.
+
+    While Redis is unreachable the buckets of the process are used
+    instead, so the limits are still applied, per worker, and the
+    API keeps answering.
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', max_entries=10000,
+                 socket_timeout=0.5):
+        import redis
+
+        self.errors = redis.RedisError
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout
+        )
+        self.script = self.client.register_script(CONSUME_SCRIPT)
+        self.fallback = LocalBucketStore(max_entries)
+
+    def consume(self, buckets, now):
+        args = [now]
+        for _, capacity, rate in buckets:
+            args += [capacity, rate]
+        try:
+            return float(self.script(
+                keys=[key for key, _, _ in buckets], args=args
+            ))
+        except self.errors as error:
+            logger.warning('Throttling with local buckets: %s', error)
+            return self.fallback.consume(buckets, now)
+
+    def clear(self):
+        self.fallback.clear()
+        for key in self.client.scan_iter('throttle:*'):
+            self.client.delete(key)
+
+
+bucket_store = create_backend(settings.THROTTLING)
+
+
+class TokenBucketThrottle(BaseThrottle):
+
+    def get_scope(self, request, view):
+        name = getattr(view, 'basename', None) or type(view).__name__
+        rates = settings.THROTTLING['RATES']
+        action = getattr(view, 'action', None)
+        if action is not None and f'{name}.{action}' in rates:
+            return f'{name}.{action}'
+        return name if name in rates else None
+
+    def get_buckets(self, request, view):
+        scope = self.get_scope(request, view)
+        if scope is None:
+            return []
+        idents = {'ip': self.get_ident(request)}
+        if request.user and request.user.is_authenticated:
+            idents['user'] = request.user.pk
+        buckets = []
+        for kind, rate in settings.THROTTLING['RATES'][scope].items():
+            if kind in idents:
+                buckets.append((
+                    f'throttle:{scope}:{kind}:{idents[kind]}',
+                    *parse_rate(rate)
+                ))
+        return buckets
+
+    def allow_request(self, request, view):
+        buckets = self.get_buckets(request, view)
+        if not buckets:
+            return True
+        self.wait_seconds = bucket_store.consume(buckets, time.time())
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
@@ -1,13 +1,15 @@
 from django.urls import include, path
-from rest_framework.routers import SimpleRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UsersViewSet, auth_signup,
-                    get_auth_token)
+from .export import EXPORTS
+from .routers import BulkRouter
+from .views import (CategoryStatsViewSet, CategoryViewSet, CommentViewSet,
+                    GenreStatsViewSet, GenreViewSet, ReviewViewSet,
+                    TitleViewSet, UsersViewSet, auth_signup, batch, export,
+                    get_auth_token, metrics)
 
 app_name = 'api'
 
-router = SimpleRouter()
+router = BulkRouter()
 router.register(
     'users',
     UsersViewSet,
@@ -28,6 +30,16 @@ router.register(
     GenreViewSet,
     basename='genres'
 )
+router.register(
+    'stats/genres',
+    GenreStatsViewSet,
+    basename='genre-stats'
+)
+router.register(
+    'stats/categories',
+    CategoryStatsViewSet,
+    basename='category-stats'
+)
 router.register(
     r'titles/(?P<title_id>\d+)/reviews',
     ReviewViewSet,
@@ -44,5 +56,12 @@ urlpatterns = [
         path('signup/', auth_signup, name='signup'),
         path('token/', get_auth_token, name='get_token'),
     ])),
+    path('v1/metrics/', metrics, name='metrics'),
+    path('v1/batch/', batch, name='batch'),
+    path('v1/export/', include([
+        path(f'{resource}/', export, {'resource': resource},
+             name=f'export-{resource}')
+        for resource in EXPORTS
+    ])),
     path('v1/', include(router.urls)),
 ]
@@ -1,29 +1,44 @@
-from django.db.models.aggregates import Avg
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, permissions, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       renderer_classes)
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.activity import get_trending
+from reviews.models import (Category, CategoryStats, Genre, GenreStats, Review,
+                            Title, User)
 
+from . import authentication, pool, replicas
+from .batch import run_batch
+from .cache import response_cache
+from .export import EXPORTS
 from .filters import TitleFilter
-from .mixins import CustomMixin
-from .permissions import (IsAdminModerAuthorOrReadOnly, IsAdminOrReadOnly,
-                          UserMeOrAdmin)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, GetTokenSerializer, MeSerializer,
-                          ReviewSerializer, SignUpSerializer,
-                          TitleReadSerializer, TitleWriteSerializer,
+from .mixins import (BulkCreateMixin, BulkUpdateMixin, CachedListMixin,
+                     CachedRetrieveMixin, CustomMixin, RowListMixin,
+                     SparseFieldsMixin)
+from .outbox import queue_email
+from .pagination import KeysetPagination, PubDateKeysetPagination
+from .permissions import (IsAdmin, IsAdminModerAuthorOrReadOnly,
+                          IsAdminOrReadOnly, UserMeOrAdmin)
+from .renderers import CSVRenderer, NDJSONRenderer
+from .row_serializers import (CommentRowSerializer, ReviewRowSerializer,
+                              TitleRowSerializer)
+from .serializers import (BatchSerializer, CategorySerializer,
+                          CategoryStatsSerializer, CommentSerializer,
+                          GenreSerializer, GenreStatsSerializer,
+                          GetTokenSerializer, MeSerializer, ReviewSerializer,
+                          SignUpSerializer, TitleReadSerializer,
+                          TitleWriteSerializer, TrendingSerializer,
                           UsersSerializer)
-from .utils import send_email
 
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def auth_signup(request):
     """Sending a confirmation code to the email.
+    The email is put into the outbox and sent outside the request.
     Authorization is not required.
     It is forbidden to use the value 'me' as a username.
     The email and the username fields must be unique.
@@ -41,7 +56,7 @@ def auth_signup(request):
         'to_email': user.email,
         'email_subject': 'API access confirmation code!'
     }
-    send_email(data)
+    queue_email(data)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -61,7 +76,7 @@ def get_auth_token(request):
             {'username': 'User not found'},
             status=status.HTTP_404_NOT_FOUND)
     if data.get('confirmation_code') == user.confirmation_code:
-        token = RefreshToken.for_user(user).access_token
+        token = authentication.create_access_token(user)
         return Response({'token': str(token)},
                         status=status.HTTP_201_CREATED)
     return Response(
@@ -69,7 +84,7 @@ def get_auth_token(request):
         status=status.HTTP_400_BAD_REQUEST)
 
 
-class UsersViewSet(viewsets.ModelViewSet):
+class UsersViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """Getting data about users. Available for Admin role.
     Endpoint /users/me/ is available for authenticated
     users to edit their own data.
@@ -87,16 +102,19 @@ class UsersViewSet(viewsets.ModelViewSet):
         permission_classes=(permissions.IsAuthenticated,),
         url_path='me')
     def get_current_user_info(self, request):
-        serializer = UsersSerializer(request.user)
+        # request.user is built from the token claims,
+        # the full profile is loaded from the database.
+        user = get_object_or_404(User, pk=request.user.pk)
+        serializer = UsersSerializer(user)
         if request.method == 'PATCH':
-            if request.user.is_admin:
+            if user.is_admin:
                 serializer = UsersSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True)
             else:
                 serializer = MeSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True)
             serializer.is_valid(raise_exception=True)
@@ -105,9 +123,66 @@ class UsersViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CategoryViewSet(CustomMixin):
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def metrics(request):
+    """Getting the counters of the current worker process.
+    Available for Admin role.
+    """
+    return Response({
+        'response_cache': response_cache.stats(),
+        'authentication': authentication.stats(),
+        'replicas': replicas.stats(),
+        'database': pool.stats(),
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def batch(request):
+    """Getting the responses of several GET requests at once.
+    Every sub-request is checked with the permissions of its
+    own endpoint for the user of the batch request.
+    """
+    serializer = BatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    return Response({'responses': run_batch(
+        request, serializer.validated_data['requests'], batch
+    )})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([NDJSONRenderer, CSVRenderer])
+def export(request, resource):
+    """Streaming a whole table as NDJSON or, with ?format=csv
+    or Accept: text/csv, as CSV. Available for Admin role.
+    """
+    exporter = EXPORTS[resource](request.query_params)
+    renderer = request.accepted_renderer
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f'{content_type}; charset={renderer.charset}'
+    response = StreamingHttpResponse(
+        renderer.iter_render(exporter.fields, exporter.iter_chunks()),
+        content_type=content_type
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{resource}.{renderer.format}"'
+    )
+    return response
+
+
+class CategoryViewSet(
+    BulkCreateMixin,
+    BulkUpdateMixin,
+    CachedListMixin,
+    SparseFieldsMixin,
+    CustomMixin
+):
     """Getting all categories.
     Adding, changing, deleting a certain category.
+    Adding and changing a list of categories.
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -115,11 +190,19 @@ class CategoryViewSet(CustomMixin):
     search_fields = ('name',)
     lookup_field = 'slug'
     filter_backends = (filters.SearchFilter,)
+    version_scopes = ('categories',)
 
 
-class GenreViewSet(CustomMixin):
+class GenreViewSet(
+    BulkCreateMixin,
+    BulkUpdateMixin,
+    CachedListMixin,
+    SparseFieldsMixin,
+    CustomMixin
+):
     """Getting all genres.
     Adding, changing, deleting a certain genre.
+    Adding and changing a list of genres.
     """
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
@@ -127,33 +210,130 @@ class GenreViewSet(CustomMixin):
     search_fields = ('name', )
     lookup_field = 'slug'
     filter_backends = (filters.SearchFilter,)
+    version_scopes = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class GenreStatsViewSet(
+    CachedListMixin,
+    CachedRetrieveMixin,
+    viewsets.ReadOnlyModelViewSet
+):
+    """Getting the number of compositions and reviews,
+    the mean score and the top compositions of every genre
+    or of a certain genre. The statistics are precomputed,
+    see reviews.stats.
+    """
+    queryset = GenreStats.objects.select_related('genre')
+    serializer_class = GenreStatsSerializer
+    permission_classes = (permissions.AllowAny,)
+    lookup_field = 'genre__slug'
+    lookup_url_kwarg = 'slug'
+    version_scopes = ('titles', 'genres')
+
+
+class CategoryStatsViewSet(GenreStatsViewSet):
+    """Getting the statistics of every category
+    or of a certain category.
+    """
+    queryset = CategoryStats.objects.select_related('category')
+    serializer_class = CategoryStatsSerializer
+    lookup_field = 'category__slug'
+    version_scopes = ('titles', 'categories')
+
+
+class TitleViewSet(
+    BulkCreateMixin,
+    BulkUpdateMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    RowListMixin,
+    viewsets.ModelViewSet
+):
     """Getting all compositions.
     Adding, changing, deleting a certain composition.
+    Adding and changing a list of compositions.
     """
-    queryset = Title.objects.all().annotate(rating=Avg('reviews__score'))
+    queryset = (
+        Title.objects.all()
+        .select_related('category')
+        .prefetch_related('genre')
+    )
+    row_serializer_class = TitleRowSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = KeysetPagination
     filterset_class = TitleFilter
     filterset_fields = ['name', ]
+    version_scopes = ('titles',)
+    detail_version_scopes = ('title:{pk}', 'categories', 'genres')
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'trending'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(methods=['GET'], detail=False)
+    def trending(self, request):
+        """Getting the compositions with the most reviews and the best
+        scores of the last ?window= days, every day older has ?decay=
+        times the weight of the next one. The filters of the list
+        and ?fields= are supported, see reviews.activity.
+        """
+        return self.get_cached_response(self.get_trending, request)
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def get_trending(self, request):
+        params = TrendingSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        titles = self.filter_queryset(self.get_queryset())
+        # The search SQL names the table of the titles, which is
+        # aliased in a subquery, so the filtered ids are taken first.
+        title_ids = (
+            list(titles.values_list('pk', flat=True))
+            if titles.query.where else None
+        )
+        trending = get_trending(titles=title_ids, **params.validated_data)
+        serializer = self.row_serializer_class(self.get_sparse_fields())
+        rows = {
+            row['id']: row for row in serializer.get_rows(Title.objects.filter(
+                pk__in=[title_id for title_id, _ in trending]
+            ))
+        }
+        ranked = [
+            (rows[title_id], trend) for title_id, trend in trending
+            if title_id in rows
+        ]
+        data = serializer.serialize([row for row, _ in ranked])
+        for item, (_, trend) in zip(data, ranked):
+            item['trend'] = round(trend, 3)
+        return Response(data)
+
+    def trim_queryset(self, queryset, fields):
+        if 'genre' not in fields:
+            queryset = queryset.prefetch_related(None)
+        if 'category' not in fields:
+            queryset = queryset.select_related(None)
+        if 'description' not in fields:
+            return queryset.defer('description')
+        return queryset
+
+
+class CommentViewSet(
+    CachedListMixin,
+    CachedRetrieveMixin,
+    RowListMixin,
+    viewsets.ModelViewSet
+):
     """
     Getting all comments.
     Adding, changing, deleting a certaing comment.
     """
     serializer_class = CommentSerializer
+    row_serializer_class = CommentRowSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAdminModerAuthorOrReadOnly
     )
+    pagination_class = PubDateKeysetPagination
+    version_scopes = ('comments:{review_id}',)
 
     def get_review(self):
         title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
@@ -169,16 +349,29 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return self.get_review().comments.select_related('author')
 
+    def trim_queryset(self, queryset, fields):
+        if 'author' not in fields:
+            return queryset.select_related(None)
+        return queryset
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    CachedListMixin,
+    CachedRetrieveMixin,
+    RowListMixin,
+    viewsets.ModelViewSet
+):
     """Getting all reviews.
     Adding, changing, deleting a certain review.
     """
     serializer_class = ReviewSerializer
+    row_serializer_class = ReviewRowSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAdminModerAuthorOrReadOnly
     )
+    pagination_class = PubDateKeysetPagination
+    version_scopes = ('reviews:{title_id}',)
 
     def get_title(self):
         return get_object_or_404(Title, id=self.kwargs.get('title_id'))
@@ -188,3 +381,8 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return self.get_title().reviews.select_related('author')
+
+    def trim_queryset(self, queryset, fields):
+        if 'author' not in fields:
+            return queryset.select_related(None)
+        return queryset
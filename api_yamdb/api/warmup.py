@@ -0,0 +1,98 @@
+"""Warming up a process before it serves requests.
+
+With preload_app the gunicorn master runs warm_up() once and the
+workers are forked from it with the URL patterns compiled, the views,
+serializers, renderers and parsers imported, the model metadata and
+the serializer fields built and the templates loaded; the workers
+share those pages copy-on-write. gc.freeze() then moves the objects
+to the permanent generation, so the collector of a worker does not
+write to their pages. The database is not touched and the connections
+are closed, since a connection must not be shared across a fork.
+"""
+import gc
+import time
+from importlib import import_module
+
+from django.apps import apps
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.urls import URLResolver, get_resolver
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+MODULES = (
+    'api.views',
+    'api.serializers',
+    'api.row_serializers',
+    'api.renderers',
+    'api.parsers',
+    'api.filters',
+    'api.asgi',
+)
+
+DRF_SETTINGS = (
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_FILTER_BACKENDS',
+    'DEFAULT_PAGINATION_CLASS',
+    'DEFAULT_PARSER_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+    'DEFAULT_RENDERER_CLASSES',
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS',
+    'DEFAULT_METADATA_CLASS',
+    'DEFAULT_VERSIONING_CLASS',
+)
+
+TEMPLATES = (
+    'redoc.html',
+    'rest_framework/api.html',
+)
+
+
+def compile_patterns(resolver):
+    """Compiling the regexes of the patterns and filling
+    the reverse dictionaries of the resolvers.
+    """
+    resolver.reverse_dict
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            compile_patterns(pattern)
+
+
+def build_serializers(module):
+    for serializer_class in vars(module).values():
+        if not (
+            isinstance(serializer_class, type)
+            and issubclass(serializer_class, serializers.ModelSerializer)
+            and hasattr(serializer_class, 'Meta')
+        ):
+            continue
+        try:
+            serializer_class().fields
+        except Exception:
+            # Some serializers need a request in the context,
+            # a failed warm-up only leaves the work to a request.
+            continue
+
+
+def warm_up():
+    """Warming up the process, returns the seconds spent."""
+    started = time.perf_counter()
+    compile_patterns(get_resolver())
+    for name in MODULES:
+        import_module(name)
+    for name in DRF_SETTINGS:
+        getattr(api_settings, name)
+    for model in apps.get_models():
+        model._meta.get_fields()
+    build_serializers(import_module('api.serializers'))
+    for name in TEMPLATES:
+        try:
+            get_template(name)
+        except TemplateDoesNotExist:
+            continue
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    return time.perf_counter() - started
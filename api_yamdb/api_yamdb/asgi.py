@@ -1,7 +1,8 @@
 import os
 
-from django.core.asgi import get_asgi_application
+from api.asgi import CatalogApplication
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+application = CatalogApplication(get_wsgi_application())
@@ -0,0 +1,65 @@
+"""gunicorn settings of the production server:
+gunicorn -c python:api_yamdb.gunicorn api_yamdb.wsgi:application
+
+The application is preloaded and warmed up in the master, so the
+workers start forked from a ready process. Workers are recycled after
+MAX_REQUESTS requests, with a jitter so that they do not restart
+at once. The numbers of workers and threads follow the CPU count
+unless GUNICORN_WORKERS and GUNICORN_THREADS are set.
+
+Every thread keeps a database connection open for CONN_MAX_AGE, so
+the default threads are capped by DB_MAX_CONNECTIONS: the server holds
+at most workers x threads connections to each database, e.g. 17 x 4 =
+68 on 8 CPUs, within the 100 max_connections of PostgreSQL.
+"""
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', default='0:8000')
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', default='gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', default=2 * cpu_count + 1))
+# Connections the server may hold to a database, the rest of
+# max_connections is left to send_emails, manage.py and psql.
+db_max_connections = int(os.getenv('DB_MAX_CONNECTIONS', default=80))
+# Threads of a gthread worker, the requests of the API mostly wait
+# on the database.
+threads = int(os.getenv(
+    'GUNICORN_THREADS',
+    default=max(1, min(2 * cpu_count, db_max_connections // workers))
+))
+
+preload_app = os.getenv('GUNICORN_PRELOAD', default='True') == 'True'
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', default=1000))
+max_requests_jitter = int(
+    os.getenv('GUNICORN_MAX_REQUESTS_JITTER', default=100)
+)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', default=30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', default=5))
+
+# The heartbeat files of the workers, /tmp of a container may be
+# on a slow overlay filesystem.
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG', default='-')
+
+
+def warm_up(log):
+    from api.warmup import warm_up
+
+    log.info('Warmed up in %.3f s', warm_up())
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        warm_up(server.log)
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        warm_up(worker.log)
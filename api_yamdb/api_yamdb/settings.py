@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.replicas.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,10 +66,50 @@ DATABASES = os.getenv('DATA_BASE', default={
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        # Seconds a connection is kept open between requests,
+        # 0 closes it after every request and None never closes it.
+        'CONN_MAX_AGE': None if os.getenv('DB_CONN_MAX_AGE') == 'None' else int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        # Options of DB_ENGINE=api.pooled_postgresql, which is meant
+        # to be used with DB_CONN_MAX_AGE=0.
+        'POOL': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', default=10)),
+            'IDLE_TIMEOUT': int(os.getenv('DB_POOL_IDLE_TIMEOUT', default=300)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', default=5)),
+            'CHECK_AFTER': int(os.getenv('DB_POOL_CHECK_AFTER', default=5)),
+        },
     }
 })
 
+# Read replicas of the default database with its credentials,
+# DB_REPLICAS=host1,host2 for PostgreSQL or the names of copies
+# of the database file for SQLite.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', default='').split(',')), start=1
+):
+    alias = f'replica{number}'
+    location = 'NAME' if 'sqlite3' in DATABASES['default']['ENGINE'] else 'HOST'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        location: replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+# Reads of a user stay on the primary for STICKY_SECONDS after
+# a write, the backend must be shared by the workers, e.g.
+# api.cache.DjangoCacheBackend with Redis, when there are several.
+REPLICA_ROUTING = {
+    'STICKY_SECONDS': int(os.getenv('REPLICA_STICKY_SECONDS', default=10)),
+    'BACKEND': os.getenv('REPLICA_STICKY_BACKEND', default='api.cache.LRUCacheBackend'),
+    'OPTIONS': {
+        'MAX_ENTRIES': int(os.getenv('REPLICA_STICKY_MAX_ENTRIES', default=10000)),
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': ('django.contrib.auth.password_validation'
@@ -110,11 +151,34 @@ DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'api.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'TEST_REQUEST_RENDERER_CLASSES': (
+        'rest_framework.renderers.MultiPartRenderer',
+        'api.renderers.ORJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+    ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'api.throttling.TokenBucketThrottle',
+    ),
+    # Proxies in front of the application, the client IP of throttling
+    # is taken from the X-Forwarded-For hop the last of them added.
+    # 0 when the application is reached directly: the header is ignored.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=0)),
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
@@ -122,8 +186,75 @@ REST_FRAMEWORK = {
 
 AUTH_USER_MODEL = 'users.User'
 
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', default=1000))
+
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', default=20))
+
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', default=2000))
+
+# Length of the leaderboards of genres and categories,
+# run rebuild_stats after changing it.
+STATS_TOP_SIZE = int(os.getenv('STATS_TOP_SIZE', default=10))
+
+# Reviews are counted in hourly buckets, which compact_activity merges
+# into daily ones after HOURLY_BUCKET_HOURS and deletes after
+# MAX_WINDOW_DAYS. DECAY is the weight of a day against the next one.
+TRENDING = {
+    'WINDOW_DAYS': int(os.getenv('TRENDING_WINDOW_DAYS', default=7)),
+    'MAX_WINDOW_DAYS': int(os.getenv('TRENDING_MAX_WINDOW_DAYS', default=30)),
+    'DECAY': float(os.getenv('TRENDING_DECAY', default=0.8)),
+    'HOURLY_BUCKET_HOURS': int(
+        os.getenv('TRENDING_HOURLY_BUCKET_HOURS', default=48)
+    ),
+}
+
+# Threads of an ASGI worker running the catalog reads, see api.asgi.
+ASGI = {
+    'READ_THREADS': int(os.getenv('ASGI_READ_THREADS', default=32)),
+}
+
+# Token buckets per client IP and per user of a viewset action or
+# a function view, see api.throttling. The buckets are shared by
+# the workers with api.throttling.RedisBucketStore.
+THROTTLING = {
+    'BACKEND': os.getenv('THROTTLE_BACKEND', default='api.throttling.LocalBucketStore'),
+    'OPTIONS': {
+        'URL': os.getenv('THROTTLE_REDIS_URL', default='redis://redis:6379/0'),
+        'MAX_ENTRIES': int(os.getenv('THROTTLE_MAX_ENTRIES', default=10000)),
+    },
+    'RATES': {
+        'auth_signup': {'ip': '10/hour'},
+        'get_auth_token': {'ip': '30/hour'},
+        'reviews.create': {'user': '10/min', 'ip': '30/min'},
+        'comments.create': {'user': '20/min', 'ip': '60/min'},
+    },
+}
+
+STATELESS_JWT = {
+    'TOKEN_CACHE_SIZE': int(os.getenv('JWT_TOKEN_CACHE_SIZE', default=10000)),
+    'REVALIDATE_SECONDS': int(os.getenv('JWT_REVALIDATE_SECONDS', default=60)),
+}
+
+RESPONSE_CACHE = {
+    'BACKEND': os.getenv('RESPONSE_CACHE_BACKEND', default='api.cache.LRUCacheBackend'),
+    'OPTIONS': {
+        'MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', default=1000)),
+        'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', default=60)),
+    },
+}
+
 if DEBUG:
     EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
     EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+EMAIL_OUTBOX = {
+    'DISPATCH': os.getenv('EMAIL_OUTBOX_DISPATCH', default='thread'),
+    'THREADS': int(os.getenv('EMAIL_OUTBOX_THREADS', default=2)),
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_SECONDS': 30,
+    'MAX_BACKOFF_SECONDS': 3600,
+    'LEASE_SECONDS': 300,
+}
+
 STRING_LEN: int = 15
@@ -0,0 +1,254 @@
+"""Review activity of compositions in time buckets for trending lists.
+
+A review is counted in the hourly TitleActivity bucket of its
+publication time when it is created, and taken back from the bucket
+holding it when it is deleted. The buckets of a deleted composition
+are deleted with it, the buckets of the compositions reviewed by
+a deleted user are recounted once after the delete.
+compact_activity() merges the hourly buckets older than
+HOURLY_BUCKET_HOURS into daily ones and deletes the buckets older
+than MAX_WINDOW_DAYS, so the table holds at most one row per
+composition and day of the longest window.
+get_trending() ranks the compositions by the score sum of the buckets
+of the window, every day older weighted by DECAY less; a review
+counts as much as its score. Daily buckets start at midnight, so
+the window may miss up to a day of reviews at its far end.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (Case, Count, ExpressionWrapper, F, FloatField,
+                              Sum, Value, When)
+from django.db.models.functions import TruncDay, TruncHour
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .management.bulk import iter_batches
+from .models import Review, TitleActivity, User, is_cascaded
+from .signals import bulk_loaded
+
+BATCH_SIZE = 5000
+
+
+def truncate_hour(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def truncate_day(moment):
+    return truncate_hour(moment).replace(hour=0)
+
+
+def get_boundaries(now=None):
+    """Getting the start of the hourly buckets and the start
+    of the kept buckets, both at midnight.
+    """
+    now = now or timezone.now()
+    options = settings.TRENDING
+    hourly_from = truncate_day(
+        now - datetime.timedelta(hours=options['HOURLY_BUCKET_HOURS'])
+    )
+    kept_from = truncate_day(
+        now - datetime.timedelta(days=options['MAX_WINDOW_DAYS'])
+    )
+    return hourly_from, kept_from
+
+
+def add_review(title_id, pub_date, reviews, score):
+    """Adding a review to the hourly bucket of its publication time,
+    the bucket is created first if it is missing.
+    """
+    buckets = TitleActivity.objects.filter(
+        title_id=title_id, period=TitleActivity.HOUR,
+        start=truncate_hour(pub_date)
+    )
+    changes = {
+        'review_count': F('review_count') + reviews,
+        'score_sum': F('score_sum') + score,
+    }
+    if buckets.update(**changes):
+        return
+    TitleActivity.objects.bulk_create([TitleActivity(
+        title_id=title_id, period=TitleActivity.HOUR,
+        start=truncate_hour(pub_date)
+    )], ignore_conflicts=True)
+    buckets.update(**changes)
+
+
+def change_review(title_id, pub_date, reviews, score):
+    """Changing the counters of the bucket holding a review,
+    hourly or, after compaction, daily. Reviews of the buckets
+    already deleted are not counted any more.
+    """
+    changes = {
+        'review_count': F('review_count') + reviews,
+        'score_sum': F('score_sum') + score,
+    }
+    for period, start in (
+        (TitleActivity.HOUR, truncate_hour(pub_date)),
+        (TitleActivity.DAY, truncate_day(pub_date)),
+    ):
+        if TitleActivity.objects.filter(
+            title_id=title_id, period=period, start=start
+        ).update(**changes):
+            return
+
+
+def insert_buckets(rows, period):
+    """Inserting buckets from (title id, start, count, score sum) rows."""
+    for batch in iter_batches(rows, BATCH_SIZE):
+        TitleActivity.objects.bulk_create([
+            TitleActivity(
+                title_id=title_id, period=period, start=start,
+                review_count=count, score_sum=score
+            )
+            for title_id, start, count, score in batch
+        ])
+
+
+def group_reviews(reviews, trunc):
+    return reviews.annotate(start=trunc('pub_date')).order_by().values(
+        'title_id', 'start'
+    ).annotate(
+        count=Count('id'), score=Sum('score')
+    ).values_list('title_id', 'start', 'count', 'score').iterator()
+
+
+def rebuild_activity(now=None, title_ids=None):
+    """Recounting the buckets of the given compositions, of all
+    if None, from the reviews of the kept days.
+    """
+    hourly_from, kept_from = get_boundaries(now)
+    buckets = TitleActivity.objects.all()
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        buckets = buckets.filter(title_id__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    with transaction.atomic():
+        buckets.delete()
+        insert_buckets(group_reviews(
+            reviews.filter(pub_date__gte=hourly_from), TruncHour
+        ), TitleActivity.HOUR)
+        insert_buckets(group_reviews(
+            reviews.filter(
+                pub_date__gte=kept_from, pub_date__lt=hourly_from
+            ),
+            TruncDay
+        ), TitleActivity.DAY)
+
+
+def compact_activity(now=None):
+    """Merging the old hourly buckets into daily ones and deleting
+    the buckets of the days out of the longest window.
+    Returns the numbers of merged and deleted buckets.
+    """
+    hourly_from, kept_from = get_boundaries(now)
+    with transaction.atomic():
+        old_hours = TitleActivity.objects.filter(
+            period=TitleActivity.HOUR, start__lt=hourly_from
+        )
+        days = {
+            (title_id, start): (count, score)
+            for title_id, start, count, score in old_hours.annotate(
+                day=TruncDay('start')
+            ).order_by().values('title_id', 'day').annotate(
+                count=Sum('review_count'), score=Sum('score_sum')
+            ).values_list('title_id', 'day', 'count', 'score')
+        }
+        existing = []
+        for bucket in TitleActivity.objects.filter(
+            period=TitleActivity.DAY,
+            start__in={start for _, start in days},
+            title_id__in={title_id for title_id, _ in days},
+        ):
+            key = (bucket.title_id, bucket.start)
+            if key in days:
+                count, score = days.pop(key)
+                bucket.review_count += count
+                bucket.score_sum += score
+                existing.append(bucket)
+        TitleActivity.objects.bulk_update(
+            existing, ['review_count', 'score_sum'], batch_size=BATCH_SIZE
+        )
+        insert_buckets(
+            [key + value for key, value in days.items()], TitleActivity.DAY
+        )
+        merged, _ = old_hours.delete()
+        deleted, _ = TitleActivity.objects.filter(
+            start__lt=kept_from
+        ).delete()
+    return merged, deleted
+
+
+def get_weight(decay, window, now):
+    """Weight of a bucket: decay to the power of its age in days."""
+    return Case(
+        *[
+            When(
+                start__gte=now - datetime.timedelta(days=age + 1),
+                then=Value(decay ** age)
+            )
+            for age in range(window)
+        ],
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+
+
+def get_trending(window=None, decay=None, limit=10, titles=None, now=None):
+    """Getting [(title id, trend)] of the top compositions
+    of the last window days, only of the titles (a queryset or ids)
+    if given.
+    """
+    options = settings.TRENDING
+    window = window or options['WINDOW_DAYS']
+    decay = options['DECAY'] if decay is None else decay
+    now = now or timezone.now()
+    buckets = TitleActivity.objects.filter(
+        start__gte=now - datetime.timedelta(days=window)
+    )
+    if titles is not None:
+        buckets = buckets.filter(title__in=titles)
+    return list(
+        buckets.values('title_id').annotate(trend=Sum(ExpressionWrapper(
+            F('score_sum') * get_weight(decay, window, now),
+            output_field=FloatField()
+        ))).filter(trend__gt=0).order_by('-trend', 'title_id').values_list(
+            'title_id', 'trend'
+        )[:limit]
+    )
+
+
+@receiver(post_save, sender=Review)
+def add_review_activity(sender, instance, created, **kwargs):
+    previous_score = getattr(instance, '_previous_score', None)
+    if created:
+        add_review(instance.title_id, instance.pub_date, 1, instance.score)
+    elif previous_score is not None and previous_score != instance.score:
+        change_review(
+            instance.title_id, instance.pub_date, 0,
+            instance.score - previous_score
+        )
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_activity(sender, instance, **kwargs):
+    if is_cascaded(instance):
+        return
+    change_review(
+        instance.title_id, instance.pub_date, -1, -instance.score
+    )
+
+
+@receiver(post_delete, sender=User)
+def rebuild_reviewed_title_activity(sender, instance, **kwargs):
+    title_ids = getattr(instance, '_reviewed_titles', None)
+    if title_ids:
+        rebuild_activity(title_ids=title_ids)
+
+
+@receiver(bulk_loaded)
+def rebuild_loaded_activity(sender, models=(), **kwargs):
+    if Review in models:
+        rebuild_activity()
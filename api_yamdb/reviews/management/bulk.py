@@ -0,0 +1,149 @@
+"""Helpers for management commands that insert many rows at once.
+
+Rows are written in batches: with COPY FROM STDIN on PostgreSQL
+and with bulk_create on other databases.
+"""
+from contextlib import contextmanager
+from io import StringIO
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection
+from django.utils import timezone
+
+
+def iter_batches(iterable, batch_size):
+    """Splitting an iterable into lists of batch_size items
+    without reading it as a whole.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def get_fields(model, names):
+    """Getting the model fields by names or attnames (e.g. 'title_id')."""
+    return [model._meta.get_field(name) for name in names]
+
+
+def to_python(field, value):
+    """Converting a CSV string into the field value."""
+    if value == '' and field.null:
+        return None
+    value = field.to_python(value)
+    if (
+        not settings.USE_TZ
+        and hasattr(value, 'tzinfo')
+        and timezone.is_aware(value)
+    ):
+        return timezone.make_naive(value)
+    return value
+
+
+def can_copy():
+    return connection.vendor == 'postgresql'
+
+
+def insert_rows(model, fields, rows, use_copy=True):
+    """Inserting rows, which are tuples of values of the fields."""
+    if use_copy and can_copy():
+        copy_rows(model, fields, rows)
+        return
+    names = [field.attname for field in fields]
+    with keep_auto_dates(fields):
+        model.objects.bulk_create(
+            [model(**dict(zip(names, row))) for row in rows]
+        )
+
+
+@contextmanager
+def keep_auto_dates(fields):
+    """bulk_create replaces the values of auto_now_add fields
+    with the current time, so they are switched off while loading.
+    """
+    switched = [
+        field for field in fields
+        if getattr(field, 'auto_now_add', False)
+        or getattr(field, 'auto_now', False)
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in switched]
+    for field in switched:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(switched, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def get_default_fields(model, fields):
+    """Getting the fields missing from the rows that must be filled
+    with defaults, since Django keeps defaults out of the schema.
+    """
+    given = {field.attname for field in fields}
+    return [
+        field for field in model._meta.concrete_fields
+        if field.attname not in given
+        and not field.primary_key
+        and (field.has_default() or not field.null)
+    ]
+
+
+def get_default(field):
+    if getattr(field, 'auto_now_add', False) or getattr(
+        field, 'auto_now', False
+    ):
+        return timezone.now()
+    return field.get_default()
+
+
+def copy_value(value):
+    """Formatting a value for the text format of COPY."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def copy_rows(model, fields, rows):
+    default_fields = get_default_fields(model, fields)
+    all_fields = fields + default_fields
+    buffer = StringIO()
+    for row in rows:
+        values = [
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(fields, row)
+        ] + [get_default(field) for field in default_fields]
+        buffer.write('\t'.join(copy_value(value) for value in values))
+        buffer.write('\n')
+    buffer.seek(0)
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in all_fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN',
+            buffer
+        )
+
+
+def reset_sequences(models):
+    """Moving the id sequences past the loaded ids (PostgreSQL)."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if not statements:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
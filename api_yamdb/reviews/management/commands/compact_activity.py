@@ -0,0 +1,27 @@
+from django.core.management import BaseCommand
+from reviews.activity import compact_activity, rebuild_activity
+
+
+class Command(BaseCommand):
+    """Compacting the review activity buckets of the trending list
+    is performed by the python manage.py compact_activity command,
+    which should be run by cron, e.g. hourly.
+    """
+    help = 'Merge old hourly activity buckets into daily ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recount all buckets from the reviews'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            rebuild_activity()
+            self.stdout.write(self.style.SUCCESS('All buckets are rebuilt'))
+            return
+        merged, deleted = compact_activity()
+        self.stdout.write(self.style.SUCCESS(
+            f'{merged} hourly buckets merged, {deleted} old buckets deleted'
+        ))
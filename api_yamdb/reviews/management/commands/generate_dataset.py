@@ -0,0 +1,103 @@
+import datetime
+
+from django.core.management import BaseCommand, CommandError
+from reviews.management.bulk import can_copy
+from reviews.management.dataset import SCORE_WEIGHTS, Dataset, write_dataset
+
+
+def score_weights(value):
+    weights = [float(weight) for weight in value.split(',')]
+    if len(weights) != 10 or min(weights) < 0 or not sum(weights):
+        raise ValueError('Ten non-negative weights of the scores 1..10')
+    return weights
+
+
+class Command(BaseCommand):
+    """Filling the database with synthetic data is performed
+    by the python manage.py generate_dataset command.
+    The same seed and options give the same data.
+    """
+    help = 'Generate users, compositions, reviews and comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000,
+                            help='Number of users')
+        parser.add_argument('--titles', type=int, default=10000,
+                            help='Number of compositions')
+        parser.add_argument('--reviews', type=int, default=100000,
+                            help='Number of reviews')
+        parser.add_argument('--comments', type=int, default=50000,
+                            help='Number of comments')
+        parser.add_argument('--categories', type=int, default=10,
+                            help='Number of categories')
+        parser.add_argument('--genres', type=int, default=30,
+                            help='Number of genres')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the random generators')
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Exponent of the Zipf distribution of reviews '
+                 'per composition, 0 spreads them evenly'
+        )
+        parser.add_argument(
+            '--score-weights',
+            type=score_weights,
+            default=SCORE_WEIGHTS,
+            help='Comma-separated weights of the scores 1..10'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=3 * 365,
+            help='Reviews are spread over this number of days'
+        )
+        parser.add_argument(
+            '--end-date',
+            type=datetime.date.fromisoformat,
+            help='Date of the newest review (YYYY-MM-DD), today by default'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of rows inserted at once'
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Use bulk_create even on PostgreSQL'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            dataset = Dataset(
+                users=options['users'],
+                titles=options['titles'],
+                reviews=options['reviews'],
+                comments=options['comments'],
+                categories=options['categories'],
+                genres=options['genres'],
+                seed=options['seed'],
+                zipf=options['zipf'],
+                score_weights=options['score_weights'],
+                days=options['days'],
+                end_date=options['end_date']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        use_copy = not options['no_copy']
+        self.method = 'COPY' if use_copy and can_copy() else 'bulk_create'
+        counts = write_dataset(
+            dataset, options['batch_size'], use_copy, self.report
+        )
+        for model, count in counts.items():
+            self.stdout.write(f'{model.__name__}: {count} rows generated')
+        self.stdout.write(self.style.SUCCESS('The dataset is generated'))
+
+    def report(self, model, count):
+        self.stdout.write(
+            f'{model.__name__}: {count} rows ({self.method})', ending='\r'
+        )
+        self.stdout.flush()
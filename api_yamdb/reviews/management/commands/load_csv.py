@@ -1,9 +1,14 @@
+import os
 from csv import DictReader
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, call_command
+from django.db import transaction
+from reviews.management.bulk import (can_copy, get_fields, insert_rows,
+                                     iter_batches, reset_sequences, to_python)
 from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import bulk_loaded
 
 User = get_user_model()
 
@@ -21,21 +26,84 @@ DATASET = {
 class Command(BaseCommand):
     """Loading data into the database from the corresponding csv
     files is performed by the python manage.py load_csv command.
+    Files are read in batches, each file is loaded in its own
+    transaction, so a failed file does not roll back the ones
+    loaded before it. On PostgreSQL rows are sent with COPY.
     """
-    def handle(self, *args, **kwargs):
-        try:
-            for model, file_name in DATASET.items():
-                with open(
-                    f'{settings.BASE_DIR}/static/data/{file_name}',
-                    'r',
-                    encoding='utf-8'
-                ) as csv_data:
-                    reader = DictReader(csv_data)
-                    model.objects.bulk_create(
-                        model(**data) for data in reader)
-                    csv_data.close()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Directory with the csv files'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of rows inserted at once'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=[file_name for file_name in DATASET.values()],
+            help='Load only these files, e.g. to resume a failed run'
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Use bulk_create even on PostgreSQL'
+        )
+
+    def handle(self, *args, **options):
+        use_copy = not options['no_copy']
+        loaded = []
+        for model, file_name in DATASET.items():
+            if options['only'] and file_name not in options['only']:
+                continue
+            try:
+                with transaction.atomic():
+                    count = self.load_file(
+                        model,
+                        os.path.join(options['path'], file_name),
+                        options['batch_size'],
+                        use_copy
+                    )
+                    reset_sequences([model])
+            except Exception as error:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'There is an error in loading data {file_name}: '
+                        f'{error}'))
+                break
+            loaded.append(model)
+            self.stdout.write(f'{file_name}: {count} rows loaded')
+        if not loaded:
+            return
+        if Review in loaded:
+            call_command('rebuild_ratings', stdout=self.stdout)
+        bulk_loaded.send(sender=self.__class__, models=loaded)
+        if len(loaded) == len(options['only'] or DATASET):
             self.stdout.write(self.style.SUCCESS('All data is loaded'))
-        except Exception as error:
-            self.stdout.write(
-                self.style.ERROR(
-                    f'There is an error in loading data {file_name}: {error}'))
+
+    def load_file(self, model, path, batch_size, use_copy):
+        method = 'COPY' if use_copy and can_copy() else 'bulk_create'
+        count = 0
+        with open(path, 'r', encoding='utf-8') as csv_data:
+            reader = DictReader(csv_data)
+            fields = get_fields(model, reader.fieldnames)
+            rows = (
+                tuple(
+                    to_python(field, data[name])
+                    for field, name in zip(fields, reader.fieldnames)
+                )
+                for data in reader
+            )
+            for batch in iter_batches(rows, batch_size):
+                insert_rows(model, fields, batch, use_copy)
+                count += len(batch)
+                self.stdout.write(
+                    f'{os.path.basename(path)}: {count} rows ({method})',
+                    ending='\r'
+                )
+                self.stdout.flush()
+        return count
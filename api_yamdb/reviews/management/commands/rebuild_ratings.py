@@ -0,0 +1,34 @@
+from django.core.management import BaseCommand
+from django.db.models import Max
+from reviews.models import Title
+
+
+def rebuild_ratings(id_from, id_to):
+    """Recalculating score sum, review count and rating
+    of the compositions with id in [id_from, id_to).
+    """
+    Title.recount_reviews(
+        Title.objects.filter(pk__gte=id_from, pk__lt=id_to)
+    )
+
+
+class Command(BaseCommand):
+    """Recalculating the stored ratings of all compositions
+    is performed by the python manage.py rebuild_ratings command.
+    """
+    help = 'Rebuild score_sum, review_count and rating of compositions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Number of compositions updated in one transaction'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = Title.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        for id_from in range(0, last_id + 1, batch_size):
+            rebuild_ratings(id_from, id_from + batch_size)
+        self.stdout.write(self.style.SUCCESS('All ratings are rebuilt'))
@@ -0,0 +1,21 @@
+from django.core.management import BaseCommand
+from reviews.models import CategoryStats, GenreStats
+from reviews.signals import bulk_loaded
+from reviews.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    """Recalculating the statistics of all genres and categories
+    is performed by the python manage.py rebuild_stats command.
+    The ratings of the compositions should be correct,
+    see rebuild_ratings.
+    """
+    help = 'Rebuild the counters and leaderboards of genres and categories'
+
+    def handle(self, *args, **options):
+        rebuild_stats()
+        # The statistics are rewritten bypassing the model signals.
+        bulk_loaded.send(
+            sender=self.__class__, models=[GenreStats, CategoryStats]
+        )
+        self.stdout.write(self.style.SUCCESS('All statistics are rebuilt'))
@@ -0,0 +1,258 @@
+"""Synthetic data for capacity planning and benchmarks.
+
+The data depends only on the seed and the settings, so a run can be
+repeated. Rows get ids after the largest ids in the tables, so a
+dataset can be added to a database that already has data.
+Reviews per composition follow a Zipf distribution over randomly
+ranked compositions, scores follow a histogram, and every review
+of a composition has its own author, which keeps the unique
+(title, author) constraint of reviews.
+"""
+import datetime
+import math
+import random
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max
+from reviews.management.bulk import (get_fields, insert_rows, iter_batches,
+                                     reset_sequences)
+from reviews.management.commands.rebuild_ratings import rebuild_ratings
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import bulk_loaded
+
+User = get_user_model()
+
+# Weights of the scores 1..10.
+SCORE_WEIGHTS = (2, 1, 2, 3, 5, 8, 14, 22, 22, 21)
+
+GENRES_PER_TITLE = (1, 1, 2, 2, 3)
+
+WORDS = (
+    'amber', 'autumn', 'bitter', 'black', 'broken', 'city', 'cold', 'dark',
+    'dawn', 'dream', 'empty', 'fire', 'frozen', 'garden', 'ghost', 'golden',
+    'green', 'heart', 'hidden', 'island', 'last', 'light', 'lost', 'moon',
+    'night', 'ocean', 'quiet', 'rain', 'red', 'river', 'road', 'secret',
+    'shadow', 'silent', 'silver', 'sky', 'song', 'star', 'storm', 'summer',
+    'sun', 'wild', 'wind', 'winter', 'wolf', 'world',
+)
+
+
+def zipf_weights(size, exponent):
+    return [1 / rank ** exponent for rank in range(1, size + 1)]
+
+
+def zipf_counts(total, size, exponent, cap):
+    """Splitting total between size ranks by the Zipf law,
+    no rank gets more than cap.
+    """
+    weights = zipf_weights(size, exponent)
+    scale = total / sum(weights)
+    counts = [min(cap, int(weight * scale)) for weight in weights]
+    left = total - sum(counts)
+    while left > 0:
+        for rank in range(size):
+            if counts[rank] < cap:
+                counts[rank] += 1
+                left -= 1
+                if not left:
+                    break
+    return counts
+
+
+def get_next_id(model):
+    return (model.objects.aggregate(last_id=Max('id'))['last_id'] or 0) + 1
+
+
+class Dataset:
+    """Generator of the rows of all tables."""
+
+    def __init__(self, users, titles, reviews, comments, categories=10,
+                 genres=30, seed=0, zipf=1.1, score_weights=SCORE_WEIGHTS,
+                 days=3 * 365, end_date=None):
+        if reviews > titles * users:
+            raise ValueError(
+                f'{reviews} reviews need more than {users} users '
+                f'for {titles} compositions'
+            )
+        self.users = users
+        self.titles = titles
+        self.reviews = reviews
+        self.comments = comments if reviews else 0
+        self.categories = categories
+        self.genres = genres
+        self.seed = seed
+        self.zipf = zipf
+        self.score_weights = score_weights
+        end_date = end_date or datetime.date.today()
+        self.end = datetime.datetime.combine(end_date, datetime.time())
+        self.span = days * 24 * 3600
+        self.first = {
+            model: get_next_id(model)
+            for model in (User, Category, Genre, Title, Review, Comment)
+        }
+
+    def random(self, table):
+        return random.Random(f'{self.seed}:{table}')
+
+    def get_tables(self):
+        """Getting (model, field names, rows) in the order of loading."""
+        return [
+            (User, ('id', 'username', 'email', 'password'),
+             self.iter_users()),
+            (Category, ('id', 'name', 'slug'), self.iter_categories()),
+            (Genre, ('id', 'name', 'slug'), self.iter_genres()),
+            (Title, ('id', 'name', 'year', 'description', 'category_id'),
+             self.iter_titles()),
+            (GenreTitle, ('title_id', 'genre_id'), self.iter_genre_titles()),
+            (Review,
+             ('id', 'title_id', 'author_id', 'text', 'score', 'pub_date'),
+             (review[:-1] for review in self.iter_reviews())),
+            (Comment, ('id', 'review_id', 'author_id', 'text', 'pub_date'),
+             self.iter_comments()),
+        ]
+
+    def get_text(self, rng, words):
+        return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+    def iter_users(self):
+        first = self.first[User]
+        for user_id in range(first, first + self.users):
+            yield (
+                user_id,
+                f'user{user_id}',
+                f'user{user_id}@yamdb.fake',
+                '!'
+            )
+
+    def iter_categories(self):
+        first = self.first[Category]
+        for category_id in range(first, first + self.categories):
+            yield category_id, f'Category {category_id}', (
+                f'category-{category_id}'
+            )
+
+    def iter_genres(self):
+        first = self.first[Genre]
+        for genre_id in range(first, first + self.genres):
+            yield genre_id, f'Genre {genre_id}', f'genre-{genre_id}'
+
+    def iter_titles(self):
+        rng = self.random('titles')
+        category_weights = zipf_weights(self.categories, self.zipf)
+        first = self.first[Title]
+        for title_id in range(first, first + self.titles):
+            year = max(1900, self.end.year - int(abs(rng.gauss(0, 20))))
+            category = rng.choices(
+                range(self.categories), category_weights
+            )[0] if self.categories else None
+            yield (
+                title_id,
+                f'{self.get_text(rng, 2).title()} {title_id}',
+                year,
+                self.get_text(rng, 12),
+                None if category is None else self.first[Category] + category
+            )
+
+    def iter_genre_titles(self):
+        rng = self.random('genre_titles')
+        for title_id in range(
+            self.first[Title], self.first[Title] + self.titles
+        ):
+            count = min(rng.choice(GENRES_PER_TITLE), self.genres)
+            for genre in sorted(rng.sample(range(self.genres), count)):
+                yield title_id, self.first[Genre] + genre
+
+    def get_review_counts(self):
+        """Getting the number of reviews of every composition,
+        the ranks of popularity are shuffled over the compositions.
+        """
+        counts = zipf_counts(self.reviews, self.titles, self.zipf, self.users)
+        self.random('popularity').shuffle(counts)
+        return counts
+
+    def iter_reviews(self):
+        """Yielding reviews with the position of the author,
+        which is needed to pick the authors of the comments.
+        The authors of a composition are users taken with a stride
+        coprime with the number of users, so they are distinct.
+        """
+        if not self.reviews:
+            return
+        rng = self.random('reviews')
+        review_id = self.first[Review]
+        for title, count in enumerate(self.get_review_counts()):
+            offset = rng.randrange(self.users)
+            stride = rng.randrange(1, self.users + 1)
+            while math.gcd(stride, self.users) != 1:
+                stride -= 1
+            scores = rng.choices(range(1, 11), self.score_weights, k=count)
+            for number, score in enumerate(scores):
+                author = (offset + number * stride) % self.users
+                yield (
+                    review_id,
+                    self.first[Title] + title,
+                    self.first[User] + author,
+                    self.get_text(rng, 20),
+                    score,
+                    self.end - datetime.timedelta(
+                        seconds=rng.randrange(self.span)
+                    ),
+                    author
+                )
+                review_id += 1
+
+    def iter_comments(self):
+        """Yielding comments of the reviews, generated again with
+        the same seed, so their dates are not kept in memory.
+        A review gets the mean number of the comments left per
+        review left, so the total is exact.
+        """
+        rng = self.random('comments')
+        comment_id = self.first[Comment]
+        last_id = comment_id + self.comments
+        reviews_left = self.reviews
+        for review in self.iter_reviews():
+            review_id, pub_date, author = review[0], review[5], review[6]
+            mean = (last_id - comment_id) / reviews_left
+            reviews_left -= 1
+            count = int(mean) + (rng.random() < mean - int(mean))
+            seconds = int((self.end - pub_date).total_seconds())
+            for _ in range(count):
+                yield (
+                    comment_id,
+                    review_id,
+                    self.first[User] + (
+                        author + rng.randrange(1, max(self.users, 2))
+                    ) % self.users,
+                    self.get_text(rng, 10),
+                    pub_date + datetime.timedelta(
+                        seconds=rng.randrange(seconds + 1)
+                    )
+                )
+                comment_id += 1
+
+
+def write_dataset(dataset, batch_size=5000, use_copy=True, report=None):
+    """Writing the dataset, every table in its own transaction.
+    Returns {model: number of rows}.
+    """
+    counts = {}
+    for model, names, rows in dataset.get_tables():
+        fields = get_fields(model, names)
+        counts[model] = 0
+        with transaction.atomic():
+            for batch in iter_batches(rows, batch_size):
+                insert_rows(model, fields, batch, use_copy)
+                counts[model] += len(batch)
+                if report is not None:
+                    report(model, counts[model])
+            reset_sequences([model])
+    first_title = dataset.first[Title]
+    for id_from in range(first_title, first_title + dataset.titles,
+                         batch_size):
+        rebuild_ratings(
+            id_from, min(id_from + batch_size, first_title + dataset.titles)
+        )
+    bulk_loaded.send(sender=Dataset, models=list(counts))
+    return counts
@@ -0,0 +1,84 @@
+# Generated by Django 2.2.16 on 2026-10-18 15:40
+
+import json
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_stats(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    for model_name, group_name, lookup in (
+        ('GenreStats', 'Genre', 'genre'),
+        ('CategoryStats', 'Category', 'category'),
+    ):
+        model = apps.get_model('reviews', model_name)
+        group_model = apps.get_model('reviews', group_name)
+        counters = {
+            row[lookup]: row for row in Title.objects.filter(
+                **{f'{lookup}__isnull': False}
+            ).order_by().values(lookup).annotate(
+                titles=Count('id'),
+                reviews=Sum('review_count'),
+                score=Sum('score_sum'),
+            )
+        }
+        rows = []
+        for group_id in group_model.objects.values_list('pk', flat=True):
+            counter = counters.get(group_id, {})
+            top = Title.objects.filter(
+                **{lookup: group_id}, rating__isnull=False
+            ).order_by('-rating', '-review_count', 'id').values_list(
+                'id', 'rating', 'review_count'
+            )[:settings.STATS_TOP_SIZE]
+            rows.append(model(
+                pk=group_id,
+                title_count=counter.get('titles', 0),
+                review_count=counter.get('reviews') or 0,
+                score_sum=counter.get('score') or 0,
+                leaderboard=json.dumps([list(entry) for entry in top]),
+            ))
+        model.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('title_count', models.PositiveIntegerField(default=0, verbose_name='Number of compositions')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Number of reviews')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Sum of review scores')),
+                ('leaderboard', models.TextField(default='[]', verbose_name='Top compositions')),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.Category', verbose_name='Category')),
+            ],
+            options={
+                'verbose_name': 'Category statistics',
+                'verbose_name_plural': 'Category statistics',
+                'ordering': ('category',),
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreStats',
+            fields=[
+                ('title_count', models.PositiveIntegerField(default=0, verbose_name='Number of compositions')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Number of reviews')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Sum of review scores')),
+                ('leaderboard', models.TextField(default='[]', verbose_name='Top compositions')),
+                ('genre', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.Genre', verbose_name='Genre')),
+            ],
+            options={
+                'verbose_name': 'Genre statistics',
+                'verbose_name_plural': 'Genre statistics',
+                'ordering': ('genre',),
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:05
+
+import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+
+def fill_activity(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleActivity = apps.get_model('reviews', 'TitleActivity')
+    now = timezone.now()
+    hourly_from = (now - datetime.timedelta(
+        hours=settings.TRENDING['HOURLY_BUCKET_HOURS']
+    )).replace(hour=0, minute=0, second=0, microsecond=0)
+    kept_from = (now - datetime.timedelta(
+        days=settings.TRENDING['MAX_WINDOW_DAYS']
+    )).replace(hour=0, minute=0, second=0, microsecond=0)
+    for period, trunc, reviews in (
+        ('hour', TruncHour, Review.objects.filter(pub_date__gte=hourly_from)),
+        ('day', TruncDay, Review.objects.filter(
+            pub_date__gte=kept_from, pub_date__lt=hourly_from
+        )),
+    ):
+        TitleActivity.objects.bulk_create(
+            TitleActivity(
+                title_id=row['title_id'], period=period, start=row['start'],
+                review_count=row['count'], score_sum=row['score'],
+            )
+            for row in reviews.annotate(start=trunc('pub_date')).order_by()
+            .values('title_id', 'start')
+            .annotate(count=Count('id'), score=Sum('score'))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_group_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4, verbose_name='Period')),
+                ('start', models.DateTimeField(verbose_name='Start of the period')),
+                ('review_count', models.IntegerField(default=0, verbose_name='Number of reviews')),
+                ('score_sum', models.IntegerField(default=0, verbose_name='Sum of review scores')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='reviews.Title', verbose_name='Composition')),
+            ],
+            options={
+                'verbose_name': 'Composition activity',
+                'verbose_name_plural': 'Composition activity',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleactivity',
+            index=models.Index(fields=['start', 'title'], name='title_activity_start_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titleactivity',
+            constraint=models.UniqueConstraint(fields=('title', 'period', 'start'), name='title_activity_unique'),
+        ),
+        migrations.RunPython(fill_activity, migrations.RunPython.noop),
+    ]
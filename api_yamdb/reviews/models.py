@@ -1,12 +1,28 @@
+import json
+from contextvars import ContextVar
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import (Case, Count, F, IntegerField, OuterRef, Subquery,
+                              Sum, When)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
 
 from .validators import validate_year
 
 User = get_user_model()
 
+# Compositions and authors being deleted. The cascade deletes their
+# reviews, which the receivers of the review deletes skip: the
+# receivers of the composition or author delete update the counters
+# once for all of them.
+deleting_titles = ContextVar('deleting_titles', default=frozenset())
+deleting_authors = ContextVar('deleting_authors', default=frozenset())
+
 
 class Category(models.Model):
     name = models.CharField(
@@ -76,18 +92,105 @@ class Title(models.Model):
         related_name='title_category',
         verbose_name='Category'
     )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Sum of review scores'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of reviews'
+    )
+    rating = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Rating'
+    )
 
     class Meta:
+        ordering = ('id',)
         verbose_name = 'Composition'
         verbose_name_plural = 'Compositions'
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def apply_review_score(title_id, score_delta, count_delta):
+        """Shifting the stored score sum and review count of a composition.
+        Both counters are changed with F() expressions inside one UPDATE,
+        so concurrent reviews never overwrite each other. The rating is
+        then recalculated from the locked row.
+        """
+        with transaction.atomic():
+            Title.objects.filter(pk=title_id).update(
+                score_sum=F('score_sum') + score_delta,
+                review_count=F('review_count') + count_delta,
+            )
+            Title.objects.filter(pk=title_id).update(
+                rating=Case(
+                    When(
+                        review_count__gt=0,
+                        then=F('score_sum') / F('review_count')
+                    ),
+                    default=None,
+                )
+            )
+
+    @staticmethod
+    def recount_reviews(titles):
+        """Recalculating score sum, review count and rating
+        of the compositions of a queryset from their reviews.
+        """
+        reviews = (
+            Review.objects.filter(title=OuterRef('pk'))
+            .order_by()
+            .values('title')
+        )
+        with transaction.atomic():
+            titles.update(
+                score_sum=Coalesce(
+                    Subquery(
+                        reviews.annotate(total=Sum('score')).values('total'),
+                        output_field=IntegerField()
+                    ),
+                    0
+                ),
+                review_count=Coalesce(
+                    Subquery(
+                        reviews.annotate(total=Count('id')).values('total'),
+                        output_field=IntegerField()
+                    ),
+                    0
+                ),
+            )
+            titles.update(
+                rating=Case(
+                    When(
+                        review_count__gt=0,
+                        then=F('score_sum') / F('review_count')
+                    ),
+                    default=None,
+                )
+            )
+
 
 class GenreTitle(models.Model):
-    title = models.ForeignKey(Title, on_delete=models.CASCADE)
-    genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
+    # Served by genre_title_unique and genre_title_genre_idx,
+    # single-column indexes would only compete with them.
+    title = models.ForeignKey(Title, on_delete=models.CASCADE,
+                              db_index=False)
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE,
+                              db_index=False)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(
+            fields=['title', 'genre'],
+            name='genre_title_unique'
+        )]
+        indexes = [models.Index(
+            fields=['genre', 'title'],
+            name='genre_title_genre_idx'
+        )]
 
     def __str__(self):
         return f'{self.title} {self.genre}'
@@ -130,12 +233,26 @@ class Review(models.Model):
             fields=['title', 'author'],
             name='all_keys_unique_together'
         )]
+        indexes = [models.Index(
+            fields=['title', '-pub_date', '-id'],
+            name='review_title_pub_date_idx'
+        )]
         verbose_name = 'Review'
         verbose_name_plural = 'Reviews'
 
     def __str__(self):
         return self.text[settings.STRING_LEN]
 
+    def save(self, *args, **kwargs):
+        # The previous score is read with a row lock by
+        # remember_review_score(), which is held until the
+        # counters of the title are shifted after the save.
+        using = kwargs.get('using') or router.db_for_write(
+            Review, instance=self
+        )
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -161,8 +278,209 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [models.Index(
+            fields=['review', '-pub_date', '-id'],
+            name='comment_review_pub_date_idx'
+        )]
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
 
     def __str__(self):
         return self.text[settings.STRING_LEN]
+
+
+class GroupStats(models.Model):
+    """Precomputed statistics of the compositions of a genre
+    or a category, kept up to date by reviews.stats.
+    The leaderboard is a JSON list of [title id, rating, review count]
+    of the top STATS_TOP_SIZE compositions by rating.
+    """
+    title_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of compositions'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of reviews'
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Sum of review scores'
+    )
+    leaderboard = models.TextField(
+        default='[]',
+        verbose_name='Top compositions'
+    )
+
+    # Lookup of the compositions of the group on Title.
+    title_lookup = None
+
+    class Meta:
+        abstract = True
+
+    @property
+    def mean_score(self):
+        if not self.review_count:
+            return None
+        return round(self.score_sum / self.review_count, 2)
+
+    def get_leaderboard(self):
+        return json.loads(self.leaderboard)
+
+    def set_leaderboard(self, entries):
+        self.leaderboard = json.dumps(entries)
+
+
+class GenreStats(GroupStats):
+    genre = models.OneToOneField(
+        Genre,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Genre'
+    )
+
+    title_lookup = 'genre'
+
+    class Meta:
+        ordering = ('genre',)
+        verbose_name = 'Genre statistics'
+        verbose_name_plural = 'Genre statistics'
+
+    def __str__(self):
+        return f'{self.genre_id}: {self.title_count} compositions'
+
+
+class CategoryStats(GroupStats):
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Category'
+    )
+
+    title_lookup = 'category'
+
+    class Meta:
+        ordering = ('category',)
+        verbose_name = 'Category statistics'
+        verbose_name_plural = 'Category statistics'
+
+    def __str__(self):
+        return f'{self.category_id}: {self.title_count} compositions'
+
+
+class TitleActivity(models.Model):
+    """Number and score sum of the reviews of a composition published
+    in an hour or a day starting at start, see reviews.activity.
+    """
+    HOUR = 'hour'
+    DAY = 'day'
+    PERIOD_CHOICES = [
+        (HOUR, 'Hour'),
+        (DAY, 'Day'),
+    ]
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='activity',
+        verbose_name='Composition'
+    )
+    period = models.CharField(
+        max_length=4,
+        choices=PERIOD_CHOICES,
+        verbose_name='Period'
+    )
+    start = models.DateTimeField(verbose_name='Start of the period')
+    review_count = models.IntegerField(
+        default=0,
+        verbose_name='Number of reviews'
+    )
+    score_sum = models.IntegerField(
+        default=0,
+        verbose_name='Sum of review scores'
+    )
+
+    class Meta:
+        constraints = [models.UniqueConstraint(
+            fields=['title', 'period', 'start'],
+            name='title_activity_unique'
+        )]
+        indexes = [models.Index(
+            fields=['start', 'title'],
+            name='title_activity_start_idx'
+        )]
+        verbose_name = 'Composition activity'
+        verbose_name_plural = 'Composition activity'
+
+    def __str__(self):
+        return f'{self.title_id} {self.period} {self.start}'
+
+
+def is_cascaded(review):
+    """Whether a review is deleted with its composition or author."""
+    return (
+        review.title_id in deleting_titles.get()
+        or review.author_id in deleting_authors.get()
+    )
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, using, **kwargs):
+    instance._previous_score = None
+    if instance.pk is not None:
+        instance._previous_score = (
+            Review.objects.using(using).select_for_update()
+            .filter(pk=instance.pk)
+            .values_list('score', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def add_review_score(sender, instance, created, **kwargs):
+    previous_score = getattr(instance, '_previous_score', None)
+    if created:
+        Title.apply_review_score(instance.title_id, instance.score, 1)
+    elif previous_score is not None and previous_score != instance.score:
+        Title.apply_review_score(
+            instance.title_id, instance.score - previous_score, 0
+        )
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    if is_cascaded(instance):
+        return
+    Title.apply_review_score(instance.title_id, -instance.score, -1)
+
+
+@receiver(pre_delete, sender=Title)
+def mark_deleting_title(sender, instance, **kwargs):
+    deleting_titles.set(deleting_titles.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Title)
+def unmark_deleting_title(sender, instance, **kwargs):
+    deleting_titles.set(deleting_titles.get() - {instance.pk})
+
+
+@receiver(pre_delete, sender=User)
+def remember_reviewed_titles(sender, instance, using, **kwargs):
+    instance._reviewed_titles = list(
+        Review.objects.using(using).filter(author=instance)
+        .values_list('title_id', flat=True)
+    )
+    deleting_authors.set(deleting_authors.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=User)
+def recount_reviewed_titles(sender, instance, **kwargs):
+    """The receivers of the stats, the activity and the response
+    cache read the same _reviewed_titles after this one.
+    """
+    deleting_authors.set(deleting_authors.get() - {instance.pk})
+    title_ids = getattr(instance, '_reviewed_titles', None)
+    if title_ids:
+        Title.recount_reviews(Title.objects.filter(pk__in=title_ids))
@@ -0,0 +1,103 @@
+"""Full-text search over the name and description of compositions.
+
+The backend is chosen by the database vendor:
+PostgreSQL uses a GIN index on a tsvector expression,
+SQLite uses the reviews_title_fts FTS5 table,
+other databases fall back to case-insensitive LIKE.
+Indexes and the FTS5 table are created by migration 0004_title_search.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+TOKEN_RE = re.compile(r'\w+')
+
+POSTGRES_VECTOR = (
+    "to_tsvector('simple'::regconfig, "
+    "COALESCE(\"reviews_title\".\"name\", '') || ' ' || "
+    "COALESCE(\"reviews_title\".\"description\", ''))"
+)
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query.lower())
+
+
+class PostgresTitleSearch:
+    """Prefix search ranked with ts_rank."""
+
+    def search(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        ts_query = ' & '.join(f'{token}:*' for token in tokens)
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"ts_rank({POSTGRES_VECTOR}, "
+                "to_tsquery('simple'::regconfig, %s))",
+                (ts_query,),
+                output_field=FloatField()
+            )
+        ).extra(
+            where=[
+                f"{POSTGRES_VECTOR} @@ to_tsquery('simple'::regconfig, %s)"
+            ],
+            params=[ts_query]
+        ).order_by('-search_rank', 'id')
+
+
+class SqliteTitleSearch:
+    """Prefix search ranked with the FTS5 bm25 rank."""
+
+    def search(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return queryset.annotate(
+            search_rank=RawSQL(
+                '(SELECT -rank FROM reviews_title_fts '
+                'WHERE reviews_title_fts MATCH %s '
+                'AND reviews_title_fts.rowid = "reviews_title"."id")',
+                (match,),
+                output_field=FloatField()
+            )
+        ).extra(
+            where=[
+                '"reviews_title"."id" IN (SELECT rowid FROM reviews_title_fts '
+                'WHERE reviews_title_fts MATCH %s)'
+            ],
+            params=[match]
+        ).order_by('-search_rank', 'id')
+
+
+class BasicTitleSearch:
+    """Unindexed search for databases without full-text support."""
+
+    def search(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(name__icontains=token) | Q(description__icontains=token)
+            )
+        return queryset.annotate(
+            search_rank=Value(1.0, output_field=FloatField())
+        ).order_by('id')
+
+
+BACKENDS = {
+    'postgresql': PostgresTitleSearch,
+    'sqlite': SqliteTitleSearch,
+}
+
+
+def search_titles(queryset, query):
+    """Filtering the compositions by the words of the query,
+    the best matches go first.
+    """
+    backend = BACKENDS.get(connection.vendor, BasicTitleSearch)
+    return backend().search(queryset, query)
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after management commands insert rows in bulk, bypassing
+# the post_save and post_delete signals of the models.
+bulk_loaded = Signal(providing_args=['models'])
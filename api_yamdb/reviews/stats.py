@@ -0,0 +1,323 @@
+"""Precomputed statistics of genres and categories.
+
+GenreStats and CategoryStats keep the number of compositions of
+a group, the number and the score sum of their reviews and the
+leaderboard of the group. The receivers below shift the counters
+with F() expressions on every write of a single review, composition
+or genre link, reading the counters of the composition from its row,
+so the result does not depend on the order of cascade deletions.
+The reviews deleted with their composition are left to the removal
+of the composition from its groups, the groups of the compositions
+reviewed by a deleted user are rebuilt once after the delete.
+A leaderboard is changed in place when possible and is read again
+from the compositions only when one of its entries goes down or
+leaves a full leaderboard.
+Bulk writes, which send no model signals, rebuild the statistics
+of the touched groups with rebuild_stats().
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from .models import (Category, CategoryStats, Genre, GenreStats, GenreTitle,
+                     Review, Title, User, is_cascaded)
+from .signals import bulk_loaded
+
+GROUPS = (
+    (GenreStats, Genre),
+    (CategoryStats, Category),
+)
+
+# Models which bulk loads of change the statistics.
+SOURCE_MODELS = {Category, Genre, GenreTitle, Review, Title}
+
+
+def sort_key(entry):
+    """Higher rating first, then more reviews, then older composition."""
+    title_id, rating, review_count = entry
+    return -rating, -review_count, title_id
+
+
+def get_title(title_id):
+    """Getting (id, rating, review count, score sum, category id)."""
+    return Title.objects.filter(pk=title_id).values_list(
+        'id', 'rating', 'review_count', 'score_sum', 'category_id'
+    ).first()
+
+
+def get_genre_ids(title_id):
+    return list(
+        GenreTitle.objects.filter(title_id=title_id)
+        .values_list('genre_id', flat=True)
+    )
+
+
+def get_top_titles(model, group_id, size):
+    return [
+        list(entry) for entry in Title.objects.filter(
+            **{model.title_lookup: group_id}, rating__isnull=False
+        ).order_by('-rating', '-review_count', 'id').values_list(
+            'id', 'rating', 'review_count'
+        )[:size]
+    ]
+
+
+def place(leaderboard, title_id, entry, size):
+    """Getting the leaderboard with the composition put to its place,
+    entry is None when the composition has no rating or leaves the group.
+    Returns None when the leaderboard has to be read again:
+    an entry of a full leaderboard went down or left it, so one of
+    the compositions below may take its place. A leaderboard that
+    is not full holds every rated composition of the group.
+    """
+    old = next(
+        (item for item in leaderboard if item[0] == title_id), None
+    )
+    full = len(leaderboard) >= size
+    if old is not None and full and (
+        entry is None or sort_key(entry) > sort_key(old)
+    ):
+        return None
+    rest = [item for item in leaderboard if item[0] != title_id]
+    if entry is None:
+        return rest
+    if old is None and full and sort_key(entry) > sort_key(leaderboard[-1]):
+        return leaderboard
+    return sorted(rest + [entry], key=sort_key)[:size]
+
+
+def update_groups(model, group_ids, title, titles=0, reviews=0, score=0,
+                  member=True):
+    """Shifting the counters of the groups by the given deltas
+    and putting the composition to its place on their leaderboards.
+    member is False when the composition leaves the groups.
+    Groups without statistics are skipped, rebuild_stats() adds them.
+    """
+    group_ids = [group_id for group_id in group_ids if group_id is not None]
+    if not group_ids or title is None:
+        return
+    title_id, rating = title[0], title[1]
+    entry = [title_id, rating, title[2]] if (
+        member and rating is not None
+    ) else None
+    size = settings.STATS_TOP_SIZE
+    with transaction.atomic():
+        if titles or reviews or score:
+            model.objects.filter(pk__in=group_ids).update(
+                title_count=F('title_count') + titles,
+                review_count=F('review_count') + reviews,
+                score_sum=F('score_sum') + score,
+            )
+        for stats in model.objects.select_for_update().filter(
+            pk__in=group_ids
+        ).only('pk', 'leaderboard'):
+            leaderboard = stats.get_leaderboard()
+            changed = place(leaderboard, title_id, entry, size)
+            if changed is None:
+                changed = get_top_titles(model, stats.pk, size)
+            if changed != leaderboard:
+                stats.set_leaderboard(changed)
+                stats.save(update_fields=['leaderboard'])
+
+
+def update_title_groups(title_id, reviews, score):
+    title = get_title(title_id)
+    if title is None:
+        return
+    update_groups(
+        CategoryStats, [title[4]], title, reviews=reviews, score=score
+    )
+    update_groups(
+        GenreStats, get_genre_ids(title_id), title,
+        reviews=reviews, score=score
+    )
+
+
+def link_genres(title_id, genre_ids, sign):
+    """Adding (sign 1) or removing (sign -1) a composition
+    with its reviews to or from genres.
+    """
+    title = get_title(title_id)
+    if title is None:
+        return
+    update_groups(
+        GenreStats, genre_ids, title,
+        titles=sign, reviews=sign * title[2], score=sign * title[3],
+        member=sign > 0
+    )
+
+
+def move_category(title, category_id, sign):
+    update_groups(
+        CategoryStats, [category_id], title,
+        titles=sign, reviews=sign * title[2], score=sign * title[3],
+        member=sign > 0
+    )
+
+
+def create_missing_stats():
+    """Adding empty statistics of the groups that have none,
+    e.g. of the genres created with bulk_create.
+    """
+    for model, group_model in GROUPS:
+        model.objects.bulk_create([
+            model(pk=pk) for pk in group_model.objects.filter(
+                stats__isnull=True
+            ).values_list('pk', flat=True)
+        ])
+
+
+def rebuild_group_stats(model, group_model, group_ids=None):
+    groups = group_model.objects.all()
+    # One filter() call, a second one would join the genres again.
+    lookup = {f'{model.title_lookup}__isnull': False}
+    if group_ids is not None:
+        groups = groups.filter(pk__in=group_ids)
+        lookup = {f'{model.title_lookup}__in': group_ids}
+    titles = Title.objects.filter(**lookup)
+    counters = {
+        row[model.title_lookup]: row for row in titles.order_by().values(
+            model.title_lookup
+        ).annotate(
+            titles=Count('id'),
+            reviews=Sum('review_count'),
+            score=Sum('score_sum'),
+        )
+    }
+    size = settings.STATS_TOP_SIZE
+    rows = []
+    for group_id in groups.values_list('pk', flat=True):
+        counter = counters.get(group_id)
+        stats = model(pk=group_id)
+        if counter is not None:
+            stats.title_count = counter['titles']
+            stats.review_count = counter['reviews'] or 0
+            stats.score_sum = counter['score'] or 0
+            stats.set_leaderboard(get_top_titles(model, group_id, size))
+        rows.append(stats)
+    with transaction.atomic():
+        stats = model.objects.all()
+        if group_ids is not None:
+            stats = stats.filter(pk__in=group_ids)
+        stats.delete()
+        model.objects.bulk_create(rows)
+
+
+def rebuild_stats(genre_ids=None, category_ids=None):
+    """Recalculating the statistics of the given genres and
+    categories from the compositions, of all groups if None.
+    """
+    for (model, group_model), group_ids in zip(
+        GROUPS, (genre_ids, category_ids)
+    ):
+        rebuild_group_stats(model, group_model, group_ids)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def create_group_stats(sender, instance, created, **kwargs):
+    if created:
+        model = GenreStats if sender is Genre else CategoryStats
+        model.objects.get_or_create(pk=instance.pk)
+
+
+@receiver(post_save, sender=Review)
+def add_review_stats(sender, instance, created, **kwargs):
+    previous_score = getattr(instance, '_previous_score', None)
+    if created:
+        update_title_groups(instance.title_id, 1, instance.score)
+    elif previous_score is not None and previous_score != instance.score:
+        update_title_groups(
+            instance.title_id, 0, instance.score - previous_score
+        )
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_stats(sender, instance, **kwargs):
+    if is_cascaded(instance):
+        return
+    update_title_groups(instance.title_id, -1, -instance.score)
+
+
+@receiver(pre_save, sender=Title)
+def remember_title_category(sender, instance, **kwargs):
+    instance._previous_category = (
+        Title.objects.filter(pk=instance.pk)
+        .values_list('category_id', flat=True).first()
+        if instance.pk is not None else None
+    )
+
+
+@receiver(post_save, sender=Title)
+def add_title_stats(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_category', None)
+    if not created and previous == instance.category_id:
+        return
+    title = get_title(instance.pk)
+    if not created:
+        move_category(title, previous, -1)
+    move_category(title, instance.category_id, 1)
+
+
+@receiver(pre_delete, sender=Title)
+def remove_title_stats(sender, instance, **kwargs):
+    """The category is detached first, so the reviews deleted
+    with the composition are not subtracted from it again.
+    The genres are left by the deletion of the genre links.
+    """
+    title = get_title(instance.pk)
+    if title is None or title[4] is None:
+        return
+    Title.objects.filter(pk=instance.pk).update(category=None)
+    move_category(title, title[4], -1)
+
+
+@receiver(post_delete, sender=User)
+def rebuild_reviewed_title_stats(sender, instance, **kwargs):
+    title_ids = getattr(instance, '_reviewed_titles', None)
+    if not title_ids:
+        return
+    rebuild_stats(
+        genre_ids=set(
+            GenreTitle.objects.filter(title_id__in=title_ids)
+            .values_list('genre_id', flat=True)
+        ),
+        category_ids=set(
+            Title.objects.filter(pk__in=title_ids, category__isnull=False)
+            .values_list('category_id', flat=True)
+        ),
+    )
+
+
+@receiver(post_save, sender=GenreTitle)
+def add_genre_title_stats(sender, instance, created, **kwargs):
+    if created:
+        link_genres(instance.title_id, [instance.genre_id], 1)
+
+
+@receiver(post_delete, sender=GenreTitle)
+def remove_genre_title_stats(sender, instance, **kwargs):
+    link_genres(instance.title_id, [instance.genre_id], -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def add_title_genres_stats(sender, instance, action, pk_set, **kwargs):
+    """genre.add() and set() insert the links with bulk_create,
+    the removed links are deleted with their post_delete signals.
+    """
+    if action != 'post_add' or not pk_set:
+        return
+    if isinstance(instance, Title):
+        link_genres(instance.pk, list(pk_set), 1)
+        return
+    for title_id in pk_set:
+        link_genres(title_id, [instance.pk], 1)
+
+
+@receiver(bulk_loaded)
+def rebuild_loaded_stats(sender, models=(), **kwargs):
+    if SOURCE_MODELS.intersection(models):
+        rebuild_stats()
@@ -1,7 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.tokens import default_token_generator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
 from .validators import validate_username
@@ -58,6 +58,14 @@ class User(AbstractUser):
         default='00000',
         verbose_name='код подтверждения'
     )
+    token_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='версия токенов'
+    )
+
+    TOKEN_CLAIM_FIELDS = (
+        'username', 'role', 'is_staff', 'is_superuser', 'is_active'
+    )
 
     @property
     def is_user(self):
@@ -80,6 +88,25 @@ class User(AbstractUser):
         return self.username
 
 
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, **kwargs):
+    """Tokens carry the role and the flags of the user as claims,
+    so changing them makes the issued tokens stale.
+    """
+    if instance.pk is None:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(
+        *User.TOKEN_CLAIM_FIELDS
+    ).first()
+    if previous is None:
+        return
+    if any(
+        previous[field] != getattr(instance, field)
+        for field in User.TOKEN_CLAIM_FIELDS
+    ):
+        instance.token_version += 1
+
+
 @receiver(post_save, sender=User)
 def post_save(sender, instance, created, **kwargs):
     if created:
@@ -0,0 +1,147 @@
+import asyncio
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+def make_scope(method, path, headers=()):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': b'',
+        'headers': list(headers),
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+
+def call(application, scope, body=b''):
+    """Getting (status, headers, body) of an ASGI request."""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.new_event_loop().run_until_complete(
+        application(scope, receive, send)
+    )
+    start, *bodies = messages
+    return (
+        start['status'],
+        dict(start['headers']),
+        b''.join(message.get('body', b'') for message in bodies),
+    )
+
+
+@pytest.fixture
+def application():
+    from api.asgi import CatalogApplication
+    from django.core.wsgi import get_wsgi_application
+
+    application = CatalogApplication(get_wsgi_application(), read_threads=4)
+    yield application
+    application.executor.shutdown()
+
+
+class TestCatalogPaths:
+
+    @pytest.mark.parametrize('method, path, expected', [
+        ('GET', '/api/v1/titles/', True),
+        ('HEAD', '/api/v1/titles/1/', True),
+        ('GET', '/api/v1/genres/', True),
+        ('GET', '/api/v1/categories/', True),
+        ('GET', '/api/v1/titles/1/reviews/', True),
+        ('GET', '/api/v1/titles/1/reviews/2/comments/', False),
+        ('GET', '/api/v1/users/', False),
+        ('POST', '/api/v1/titles/', False),
+        ('DELETE', '/api/v1/genres/drama/', False),
+    ])
+    def test_catalog_reads(self, method, path, expected):
+        from api.asgi import is_catalog_read
+
+        assert is_catalog_read(make_scope(method, path)) is expected, (
+            'Проверьте, что асинхронно обслуживается только чтение каталога'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCatalogApplication:
+
+    def test_catalog_read(self, application, client, title):
+        status, headers, body = call(
+            application, make_scope('GET', '/api/v1/titles/')
+        )
+        assert status == 200
+        assert headers[b'content-type'].startswith(b'application/json')
+        assert json.loads(body) == client.get('/api/v1/titles/').json(), (
+            'Проверьте, что ASGI-приложение отдаёт тот же ответ, что и WSGI'
+        )
+        status, _, body = call(
+            application, make_scope('HEAD', f'/api/v1/titles/{title.id}/')
+        )
+        assert (status, body) == (200, b'')
+
+    def test_writes_use_viewsets(self, application, admin):
+        from api.authentication import create_access_token
+        from reviews.models import Genre
+
+        token = create_access_token(admin)
+        body = b'{"name": "Musical", "slug": "musical"}'
+        status, _, _ = call(
+            application,
+            make_scope('POST', '/api/v1/genres/', [
+                (b'authorization', f'Bearer {token}'.encode()),
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+            ]),
+            body=body
+        )
+        assert status == 201, (
+            'Проверьте, что запросы на запись проходят через вьюсеты'
+        )
+        assert Genre.objects.filter(slug='musical').exists()
+        status, _, _ = call(
+            application, make_scope('POST', '/api/v1/genres/'), b'{}'
+        )
+        assert status == 401
+
+    def test_lifespan(self, application):
+        messages = iter([
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}
+        ])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.new_event_loop().run_until_complete(
+            application({'type': 'lifespan'}, receive, send)
+        )
+        assert sent == [
+            'lifespan.startup.complete', 'lifespan.shutdown.complete'
+        ]
+
+    def test_benchmark_suite(self, title):
+        out = StringIO()
+        call_command(
+            'benchmark', 'asgi', iterations=2, warmup=1, concurrency=4,
+            stdout=out
+        )
+        output = out.getvalue()
+        for name in ('titles-list wsgi x4', 'titles-list asgi x4',
+                     'reviews-list asgi x4'):
+            assert name in output, (
+                f'Проверьте, что бенчмарк asgi измеряет случай {name}'
+            )
@@ -0,0 +1,107 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestBatch:
+
+    @pytest.fixture
+    def review(self, title, user):
+        from reviews.models import Comment, Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=8
+        )
+        Comment.objects.create(review=review, author=user, text='Коммент')
+        return review
+
+    def test_batch_returns_all_responses(self, client, title, review):
+        response = client.post('/api/v1/batch/', {'requests': [
+            {'path': f'/api/v1/titles/{title.id}/'},
+            {'path': f'/api/v1/titles/{title.id}/reviews/?limit=5'},
+            {'path': (
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            )},
+            {'path': '/api/v1/titles/0/'},
+        ]}, content_type='application/json')
+        assert response.status_code == 200, (
+            'Проверьте, что POST-запрос к /api/v1/batch/ '
+            'возвращает статус 200'
+        )
+        responses = response.json()['responses']
+        assert [item['status'] for item in responses] == [200, 200, 200, 404]
+        assert responses[0]['body']['name'] == title.name
+        assert responses[1]['body']['results'][0]['text'] == 'Отзыв'
+        assert responses[2]['body']['results'][0]['text'] == 'Коммент'
+        assert 'ETag' in responses[0]['headers'], (
+            'Проверьте, что подзапросы возвращают заголовки ETag'
+        )
+
+    def test_conditional_sub_request(self, client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        response = client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        response = client.post('/api/v1/batch/', {'requests': [
+            {'path': url, 'headers': {'If-None-Match': etag}},
+            {'path': url, 'headers': {'if-none-match': etag}},
+            {'path': url, 'headers': {'IF-MODIFIED-SINCE': last_modified}},
+        ]}, content_type='application/json')
+        assert [
+            item['status'] for item in response.json()['responses']
+        ] == [304, 304, 304], (
+            'Проверьте, что имена заголовков подзапроса '
+            'не зависят от регистра'
+        )
+
+    def test_caller_authentication_is_used(self, admin, user, title):
+        from api.authentication import create_access_token
+        from rest_framework.test import APIClient
+
+        requests = {'requests': [
+            {'path': '/api/v1/users/me/'},
+            {'path': '/api/v1/users/'},
+        ]}
+        client = APIClient()
+        responses = client.post(
+            '/api/v1/batch/', requests, format='json'
+        ).json()['responses']
+        assert [item['status'] for item in responses] == [401, 401]
+
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {create_access_token(user)}'
+        )
+        responses = client.post(
+            '/api/v1/batch/', requests, format='json'
+        ).json()['responses']
+        assert responses[0]['status'] == 200
+        assert responses[0]['body']['username'] == user.username
+        assert responses[1]['status'] == 403, (
+            'Проверьте, что подзапросы проверяют права вызывающего'
+        )
+
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {create_access_token(admin)}'
+        )
+        responses = client.post(
+            '/api/v1/batch/', requests, format='json'
+        ).json()['responses']
+        assert [item['status'] for item in responses] == [200, 200]
+
+    def test_only_api_get_requests(self, client, settings):
+        for requests in (
+            [{'path': '/api/v1/titles/', 'method': 'POST'}],
+            [{'path': '/admin/'}],
+            [],
+            [{'path': '/api/v1/titles/'}] * 3,
+        ):
+            settings.BATCH_MAX_REQUESTS = 2
+            response = client.post(
+                '/api/v1/batch/', {'requests': requests},
+                content_type='application/json'
+            )
+            assert response.status_code == 400, (
+                f'Проверьте, что пакет {requests} отклоняется'
+            )
+        response = client.post('/api/v1/batch/', {'requests': [
+            {'path': '/api/v1/batch/'},
+        ]}, content_type='application/json')
+        assert response.json()['responses'][0]['status'] == 400
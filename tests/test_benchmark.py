@@ -0,0 +1,149 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+class TestBenchmarkRunner:
+
+    def test_percentile(self):
+        from api.benchmarks.runner import percentile
+
+        samples = [1, 2, 3, 4, 5]
+        assert percentile(samples, 50) == 3
+        assert percentile(samples, 100) == 5
+        assert percentile([1, 2], 50) == 1.5, (
+            'Проверьте, что перцентиль интерполируется между соседями'
+        )
+        assert percentile([], 50) is None
+
+    def test_compare_finds_regressions(self):
+        from api.benchmarks.runner import compare
+
+        baseline = {
+            'titles-list': {'p95_ms': 10, 'queries': 2},
+            'genres-list': {'p95_ms': 10, 'queries': 1},
+        }
+        results = {
+            'titles-list': {'p95_ms': 11, 'queries': 3},
+            'genres-list': {'p95_ms': 15, 'queries': 1},
+            'metrics': {'p95_ms': 1, 'queries': 1},
+        }
+        regressions = compare(results, baseline, threshold=0.2)
+        assert regressions == [
+            'titles-list: queries 2 -> 3',
+            'genres-list: p95 10 -> 15 ms',
+        ], (
+            'Проверьте, что сравнение с базовой линией находит рост p95 '
+            'выше порога и рост числа запросов'
+        )
+
+
+@pytest.mark.django_db
+class TestBenchmarkCommand:
+
+    def test_benchmark_saves_baseline(self, tmp_path):
+        path = tmp_path / 'baseline.json'
+        out = StringIO()
+        call_command(
+            'benchmark',
+            users=5,
+            titles=3,
+            reviews=6,
+            comments=12,
+            iterations=3,
+            warmup=1,
+            save=str(path),
+            stdout=out
+        )
+        results = json.loads(path.read_text())['results']
+        for name in (
+            'titles-list', 'titles-detail', 'reviews-list', 'comments-detail',
+            'genres-list', 'users-list', 'metrics',
+        ):
+            assert name in results, (
+                f'Проверьте, что бенчмарк запрашивает маршрут {name}'
+            )
+        assert set(results['titles-list']) == {
+            'iterations', 'queries', 'p50_ms', 'p95_ms', 'p99_ms', 'rps',
+            'items_per_s',
+        }
+        assert results['titles-list']['queries'] >= 1
+
+        out = StringIO()
+        call_command(
+            'benchmark', iterations=3, only='titles-list', compare=str(path),
+            threshold=100, stdout=out
+        )
+        assert 'No regressions' in out.getvalue()
+
+    def test_endpoints_measure_views(self, title, django_user_model):
+        from api.benchmarks import get_cases
+        from api.benchmarks.endpoints import remove_admin
+        from api.benchmarks.runner import QueryCounter, measure
+        from django.db import connection
+
+        queries = {}
+        for cached in (False, True):
+            case = next(
+                case for case in get_cases('endpoints', cached=cached)
+                if case.name == 'titles-list'
+            )
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                measure(case, iterations=3)
+            queries[cached] = counter.count
+        assert queries[False] > queries[True], (
+            'Проверьте, что по умолчанию бенчмарк измеряет запросы '
+            'мимо кеша ответов'
+        )
+        remove_admin()
+        assert not django_user_model.objects.filter(
+            username='benchmark_admin'
+        ).exists(), (
+            'Проверьте, что бенчмарк удаляет созданного администратора'
+        )
+
+    def test_serializers_suite(self, tmp_path):
+        path = tmp_path / 'serializers.json'
+        call_command(
+            'benchmark', 'serializers',
+            users=5, titles=3, reviews=6, comments=4,
+            iterations=2, warmup=1, objects=3, save=str(path),
+            stdout=StringIO()
+        )
+        results = json.loads(path.read_text())['results']
+        assert {
+            'titles TitleReadSerializer', 'titles TitleRowSerializer',
+            'reviews ReviewSerializer', 'reviews ReviewRowSerializer',
+            'comments CommentSerializer', 'comments CommentRowSerializer',
+        } == set(results), (
+            'Проверьте, что набор serializers сравнивает оба пути '
+            'для произведений, отзывов и комментариев'
+        )
+        assert results['titles TitleRowSerializer']['items_per_s'] == (
+            pytest.approx(results['titles TitleRowSerializer']['rps'] * 3, abs=1)
+        )
+
+    def test_renderers_suite(self, tmp_path):
+        path = tmp_path / 'renderers.json'
+        call_command(
+            'benchmark', 'renderers',
+            users=5, titles=3, reviews=6,
+            iterations=2, warmup=1, objects=3, save=str(path),
+            stdout=StringIO()
+        )
+        results = json.loads(path.read_text())['results']
+        assert {
+            f'{page} {operation}'
+            for page in ('titles', 'reviews')
+            for operation in (
+                'render JSONRenderer', 'parse JSONParser',
+                'render ORJSONRenderer', 'parse ORJSONParser',
+                'render MessagePackRenderer', 'parse MessagePackParser',
+            )
+        } == set(results), (
+            'Проверьте, что набор renderers сравнивает все форматы '
+            'для произведений и отзывов'
+        )
@@ -0,0 +1,210 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_lookups(context, table, field):
+    return sum(
+        f'FROM "{table}" WHERE "{table}"."{field}"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db
+class TestBulkTitles:
+
+    def payload(self, count):
+        return [
+            {
+                'name': f'Произведение {i}',
+                'year': 2000 + i,
+                'genre': ['drama', 'comedy'] if i % 2 else ['drama'],
+                'category': 'movie',
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create(self, admin_client, category, genres):
+        from reviews.models import GenreTitle, Title
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                '/api/v1/titles/', self.payload(10), format='json'
+            )
+        assert response.status_code == 201, (
+            'Проверьте, что POST-запрос со списком произведений '
+            'возвращает статус 201'
+        )
+        data = response.json()
+        assert [item['name'] for item in data] == [
+            f'Произведение {i}' for i in range(10)
+        ]
+        assert data[1]['genre'] == ['drama', 'comedy']
+        assert Title.objects.count() == 10
+        assert GenreTitle.objects.count() == 15
+        assert count_lookups(context, 'reviews_genre', 'slug') == 1, (
+            'Проверьте, что жанры всех произведений загружаются '
+            'одним запросом'
+        )
+        assert count_lookups(context, 'reviews_category', 'slug') == 1, (
+            'Проверьте, что категории всех произведений загружаются '
+            'одним запросом'
+        )
+
+    def test_errors_are_reported_per_item(self, admin_client, category,
+                                          genres):
+        from reviews.models import Title
+
+        payload = self.payload(3)
+        payload[1]['genre'] = ['unknown']
+        del payload[2]['name']
+        response = admin_client.post(
+            '/api/v1/titles/', payload, format='json'
+        )
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert set(errors[1]) == {'genre'}
+        assert set(errors[2]) == {'name'}, (
+            'Проверьте, что ошибки возвращаются для каждого элемента списка'
+        )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке не создаётся ни одно произведение'
+        )
+
+    def test_bulk_update(self, admin_client, client, title, category,
+                         genres):
+        from reviews.models import Title
+
+        other = Title.objects.create(name='Другое', year=2001)
+        client.get('/api/v1/titles/')
+        response = admin_client.patch('/api/v1/titles/', [
+            {'id': title.id, 'name': 'Новое имя', 'genre': ['comedy']},
+            {'id': other.id, 'year': 2005, 'category': 'movie'},
+        ], format='json')
+        assert response.status_code == 200, (
+            'Проверьте, что PATCH-запрос со списком произведений '
+            'возвращает статус 200'
+        )
+        title.refresh_from_db()
+        other.refresh_from_db()
+        assert title.name == 'Новое имя'
+        assert title.year == 1994
+        assert list(title.genre.values_list('slug', flat=True)) == ['comedy']
+        assert other.year == 2005 and other.category == category
+        names = [
+            item['name'] for item in client.get('/api/v1/titles/').json()[
+                'results'
+            ]
+        ]
+        assert 'Новое имя' in names, (
+            'Проверьте, что массовое изменение сбрасывает кеш ответов'
+        )
+
+    def test_bulk_update_unknown_id(self, admin_client, title):
+        response = admin_client.patch('/api/v1/titles/', [
+            {'id': title.id, 'name': 'Новое имя'},
+            {'id': title.id + 100, 'name': 'Нет такого'},
+        ], format='json')
+        assert response.status_code == 400
+        assert response.json()[1] == {
+            'id': ['Object with this key does not exist.']
+        }
+        title.refresh_from_db()
+        assert title.name == 'Побег из Шоушенка'
+
+    def test_bulk_update_invalid_id(self, admin_client, title):
+        response = admin_client.patch('/api/v1/titles/', [
+            {'id': 'abc', 'name': 'x'},
+            {'id': [title.id], 'name': 'x'},
+            {'id': str(title.id), 'name': 'Новое имя'},
+        ], format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что неверный id в массовом изменении '
+            'возвращает ошибку 400'
+        )
+        assert response.json()[:2] == [
+            {'id': ['Object with this key does not exist.']}
+        ] * 2
+        assert response.json()[2] == {}
+
+    def test_bulk_is_available_for_admin_only(self, user_client, category,
+                                              genres):
+        response = user_client.post(
+            '/api/v1/titles/', self.payload(2), format='json'
+        )
+        assert response.status_code == 403
+        response = user_client.patch('/api/v1/titles/', [], format='json')
+        assert response.status_code == 403
+
+    def test_too_many_items(self, admin_client, settings):
+        settings.BULK_MAX_ITEMS = 2
+        response = admin_client.post(
+            '/api/v1/titles/', self.payload(3), format='json'
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestBulkGenresAndCategories:
+
+    def test_bulk_create_genres(self, admin_client, genres):
+        from reviews.models import Genre
+
+        response = admin_client.post('/api/v1/genres/', [
+            {'name': 'Ужасы', 'slug': 'horror'},
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Ужасы 2', 'slug': 'horror'},
+        ], format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'slug' in errors[1] and 'slug' in errors[2], (
+            'Проверьте, что слаги проверяются на уникальность '
+            'среди существующих жанров и внутри списка'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/genres/', [
+                {'name': 'Ужасы', 'slug': 'horror'},
+                {'name': 'Мюзикл', 'slug': 'musical'},
+            ], format='json')
+        assert response.status_code == 201
+        assert count_lookups(context, 'reviews_genre', 'slug') == 1
+        assert count_lookups(context, 'reviews_genre', 'name') == 1, (
+            'Проверьте, что уникальность полей проверяется одним запросом'
+        )
+        assert Genre.objects.count() == 4
+
+    def test_bulk_update_categories(self, admin_client, category):
+        from reviews.models import Category
+
+        other = Category.objects.create(name='Книга', slug='book')
+        response = admin_client.patch('/api/v1/categories/', [
+            {'slug': 'movie', 'name': 'Кино'},
+            {'slug': 'book', 'name': 'Книги'},
+        ], format='json')
+        assert response.status_code == 200
+        assert response.json() == [
+            {'name': 'Кино', 'slug': 'movie'},
+            {'name': 'Книги', 'slug': 'book'},
+        ]
+        other.refresh_from_db()
+        assert other.name == 'Книги'
+        response = admin_client.patch('/api/v1/categories/', [
+            {'slug': 'movie', 'name': 'Книги'},
+        ], format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что массовое изменение проверяет уникальность имени'
+        )
+
+    def test_single_create_still_works(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', {'name': 'Музыка', 'slug': 'music'},
+            format='json'
+        )
+        assert response.status_code == 201
+        response = admin_client.post(
+            '/api/v1/categories/', {'name': 'Музыка', 'slug': 'music'},
+            format='json'
+        )
+        assert response.status_code == 400
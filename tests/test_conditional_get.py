@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    @pytest.fixture
+    def review(self, title, user):
+        from reviews.models import Review
+
+        return Review.objects.create(
+            title=title, author=user, text='Отлично', score=10
+        )
+
+    @pytest.mark.parametrize('url', [
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+        '/api/v1/titles/',
+        '/api/v1/titles/{title.id}/',
+        '/api/v1/titles/{title.id}/reviews/',
+        '/api/v1/titles/{title.id}/reviews/{review.id}/',
+        '/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+    ])
+    def test_if_none_match(self, user_client, title, review, url):
+        url = url.format(title=title, review=review)
+        response = user_client.get(url)
+        assert response.status_code == 200
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к {url} содержит ETag'
+        )
+        with CaptureQueriesContext(connection) as context:
+            not_modified = user_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert not_modified.status_code == 304, (
+            f'Проверьте, что {url} отвечает 304 на совпавший If-None-Match'
+        )
+        assert not not_modified.content
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что для ответа 304 делается только запрос версии'
+        )
+
+    def test_write_changes_etag(self, client, title, review, another_user):
+        from reviews.models import Review
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(url)['ETag']
+        Review.objects.create(
+            title=title, author=another_user, text='Неплохо', score=6
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов'
+        )
+
+    def test_if_modified_since(self, client, title, review):
+        url = f'/api/v1/titles/{title.id}/'
+        response = client.get(url)
+        last_modified = response['Last-Modified']
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == 304, (
+            'Проверьте, что If-Modified-Since с датой Last-Modified '
+            'возвращает 304'
+        )
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        ).status_code == 200
+
+    def test_conditions_of_missing_object(self, client, title):
+        url = f'/api/v1/titles/{title.id + 100}/'
+        assert client.get(url, HTTP_IF_NONE_MATCH='*').status_code == 404, (
+            'Проверьте, что If-None-Match: * не отвечает 304 '
+            'на несуществующий объект'
+        )
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2101 00:00:00 GMT'
+        ).status_code == 404
+        response = client.get(
+            f'/api/v1/titles/{title.id}/?fields=unknown',
+            HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == 400
+        assert client.get(
+            f'/api/v1/titles/{title.id}/', HTTP_IF_NONE_MATCH='*'
+        ).status_code == 304
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+def read(response):
+    assert response.status_code == 200, (
+        'Проверьте, что экспорт доступен администратору'
+    )
+    assert response.streaming, (
+        'Проверьте, что экспорт отдаётся потоком StreamingHttpResponse'
+    )
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    @pytest.fixture
+    def review(self, title, user, another_user):
+        from reviews.models import Comment, Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв, с запятой', score=8
+        )
+        Comment.objects.create(review=review, author=another_user, text='Да')
+        return review
+
+    def test_titles_ndjson(self, admin_client, title, review):
+        from reviews.models import Title
+
+        Title.objects.create(name='Без категории', year=1900)
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in read(response).splitlines()]
+        assert rows[0] == {
+            'id': title.id,
+            'name': title.name,
+            'year': title.year,
+            'rating': 8,
+            'category': title.category.slug,
+            'genre': sorted(
+                title.genre.values_list('slug', flat=True),
+                key=lambda slug: title.genre.get(slug=slug).id
+            ),
+            'description': title.description,
+        }
+        assert rows[1]['category'] is None and rows[1]['genre'] == []
+
+    def test_reviews_csv(self, admin_client, client, review):
+        response = admin_client.get(
+            '/api/v1/export/reviews/', HTTP_ACCEPT='text/csv'
+        )
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert response['Content-Disposition'] == (
+            'attachment; filename="reviews.csv"'
+        )
+        rows = list(csv.DictReader(io.StringIO(read(response))))
+        assert rows == [{
+            'id': str(review.id),
+            'title': str(review.title_id),
+            'author': review.author.username,
+            'score': '8',
+            'text': 'Отзыв, с запятой',
+            'pub_date': client.get(
+                f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+            ).json()['pub_date'],
+        }], (
+            'Проверьте, что экспорт отзывов в CSV выдаёт те же значения, '
+            'что и API'
+        )
+
+    def test_comments_filter(self, admin_client, review):
+        url = '/api/v1/export/comments/?format=csv'
+        rows = list(csv.DictReader(io.StringIO(read(
+            admin_client.get(f'{url}&review={review.id}')
+        ))))
+        assert [row['text'] for row in rows] == ['Да']
+        rows = list(csv.DictReader(io.StringIO(read(
+            admin_client.get(f'{url}&review={review.id + 1}')
+        ))))
+        assert rows == []
+        response = admin_client.get(f'{url}&review=abc')
+        assert response.status_code == 400
+
+    def test_chunks(self, admin_client, category, settings):
+        from reviews.models import Title
+
+        settings.EXPORT_CHUNK_SIZE = 2
+        Title.objects.bulk_create(
+            Title(name=f'Title {number}', year=2000) for number in range(5)
+        )
+        chunks = list(
+            admin_client.get('/api/v1/export/titles/').streaming_content
+        )
+        assert [chunk.count(b'\n') for chunk in chunks] == [2, 2, 1], (
+            'Проверьте, что экспорт читает таблицу частями '
+            'по EXPORT_CHUNK_SIZE строк'
+        )
+
+    def test_admin_only(self, client, user_client):
+        assert client.get('/api/v1/export/titles/').status_code == 401
+        assert user_client.get('/api/v1/export/titles/').status_code == 403
+
+    def test_not_in_batch(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/batch/',
+            data={'requests': [{'path': '/api/v1/export/titles/'}]},
+            format='json'
+        )
+        assert response.json()['responses'][0]['status'] == 400, (
+            'Проверьте, что экспорт нельзя запросить внутри batch'
+        )
@@ -0,0 +1,111 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+def generate(**options):
+    out = StringIO()
+    call_command(
+        'generate_dataset',
+        end_date=datetime.date(2026, 1, 1),
+        batch_size=50,
+        stdout=out,
+        **options
+    )
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestGenerateDataset:
+
+    OPTIONS = {
+        'users': 30, 'titles': 40, 'reviews': 300, 'comments': 100,
+        'categories': 3, 'genres': 5, 'seed': 7,
+    }
+
+    def dump(self):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        return (
+            list(Title.objects.values_list(
+                'name', 'year', 'category__slug', 'rating'
+            ).order_by('id')),
+            list(GenreTitle.objects.values_list(
+                'title__name', 'genre__slug'
+            ).order_by('id')),
+            list(Review.objects.values_list(
+                'title__name', 'author__username', 'score', 'pub_date'
+            ).order_by('id')),
+            list(Comment.objects.values_list(
+                'review_id', 'author__username', 'pub_date'
+            ).order_by('id')),
+        )
+
+    def test_counts_and_constraints(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models import Count, F
+        from reviews.models import Comment, Review, Title
+
+        out = generate(**self.OPTIONS)
+        assert 'The dataset is generated' in out
+        assert get_user_model().objects.count() == 30
+        assert Title.objects.count() == 40
+        assert Review.objects.count() == 300
+        assert Comment.objects.count() == 100
+        assert Review.objects.values(
+            'title', 'author'
+        ).distinct().count() == 300, (
+            'Проверьте, что у каждого отзыва на произведение свой автор'
+        )
+        assert not Comment.objects.filter(
+            pub_date__lt=F('review__pub_date')
+        ).exists(), (
+            'Проверьте, что комментарий не старше отзыва'
+        )
+        counts = sorted(
+            Title.objects.annotate(total=Count('reviews'))
+            .values_list('total', flat=True),
+            reverse=True
+        )
+        assert counts[0] == 30 and counts[0] > 4 * counts[len(counts) // 2], (
+            'Проверьте, что число отзывов распределено по закону Ципфа '
+            'и ограничено числом пользователей'
+        )
+        title = Title.objects.filter(review_count__gt=0).first()
+        assert title.rating == title.score_sum // title.review_count, (
+            'Проверьте, что после генерации пересчитываются рейтинги'
+        )
+
+    def test_score_histogram(self):
+        from reviews.models import Review
+
+        generate(**{
+            **self.OPTIONS, 'score_weights': [0, 0, 0, 0, 0, 0, 0, 0, 1, 3]
+        })
+        scores = set(Review.objects.values_list('score', flat=True))
+        assert scores == {9, 10}, (
+            'Проверьте, что оценки следуют заданной гистограмме'
+        )
+
+    def test_same_seed_gives_same_data(self):
+        from django.contrib.auth import get_user_model
+        from reviews.models import Category, Genre, Title
+
+        generate(**self.OPTIONS)
+        first = self.dump()
+        for model in (Title, Category, Genre, get_user_model()):
+            model.objects.all().delete()
+        generate(**self.OPTIONS)
+        assert self.dump() == first, (
+            'Проверьте, что данные определяются зерном генератора'
+        )
+        for model in (Title, Category, Genre, get_user_model()):
+            model.objects.all().delete()
+        generate(**{**self.OPTIONS, 'seed': 8})
+        assert self.dump() != first
+
+    def test_too_many_reviews(self):
+        with pytest.raises(CommandError):
+            generate(users=2, titles=2, reviews=5, comments=0)
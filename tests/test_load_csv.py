@@ -0,0 +1,60 @@
+import os
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestLoadCsv:
+
+    def test_load_csv_in_batches(self):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        out = StringIO()
+        call_command(
+            'load_csv',
+            path=os.path.join(settings.BASE_DIR, 'reviews', 'static', 'data'),
+            batch_size=10,
+            stdout=out
+        )
+        assert 'All data is loaded' in out.getvalue(), (
+            'Проверьте, что команда load_csv загружает все файлы'
+        )
+        assert 'review.csv: 70 rows' in out.getvalue(), (
+            'Проверьте, что команда load_csv сообщает о ходе загрузки'
+        )
+        assert Review.objects.count() == 72
+        assert GenreTitle.objects.count() == 42
+        assert Comment.objects.count() == 3
+        assert Review.objects.filter(pub_date__year=2019).exists(), (
+            'Проверьте, что load_csv сохраняет даты из файлов'
+        )
+        title = Title.objects.filter(review_count__gt=0).first()
+        assert title.rating == title.score_sum // title.review_count, (
+            'Проверьте, что после загрузки пересчитываются рейтинги'
+        )
+
+    def test_failed_file_keeps_loaded_ones(self, tmp_path):
+        from reviews.models import Category, Genre
+
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n', encoding='utf-8'
+        )
+        (tmp_path / 'genre.csv').write_text(
+            'id,name,slug\n1,Драма,drama\n2,Драма,drama\n', encoding='utf-8'
+        )
+        out = StringIO()
+        call_command(
+            'load_csv', path=str(tmp_path),
+            only=['category.csv', 'genre.csv'], stdout=out
+        )
+        assert 'error in loading data genre.csv' in out.getvalue()
+        assert Category.objects.count() == 1, (
+            'Проверьте, что ошибка в одном файле не отменяет '
+            'загрузку предыдущих'
+        )
+        assert not Genre.objects.exists(), (
+            'Проверьте, что каждый файл загружается в одной транзакции'
+        )
@@ -0,0 +1,94 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    @pytest.fixture(autouse=True)
+    def worker_dispatch(self, settings):
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        settings.EMAIL_OUTBOX = {
+            **settings.EMAIL_OUTBOX, 'DISPATCH': 'worker', 'MAX_ATTEMPTS': 2
+        }
+
+    def signup(self, client, username):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+        assert response.status_code == 200, (
+            'Проверьте, что POST-запрос к /api/v1/auth/signup/ '
+            'возвращает статус 200'
+        )
+
+    def test_signup_sends_email_through_outbox(self, client):
+        from api.models import OutboxEmail
+
+        self.signup(client, 'first')
+        self.signup(client, 'second')
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в запросе'
+        )
+        assert OutboxEmail.objects.filter(
+            status=OutboxEmail.PENDING
+        ).count() == 2
+
+        call_command('send_emails')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            'first@yamdb.fake', 'second@yamdb.fake'
+        ], 'Проверьте, что команда send_emails отправляет письма'
+        assert 'verification code' in mail.outbox[0].body
+        assert not OutboxEmail.objects.exclude(
+            status=OutboxEmail.SENT
+        ).exists()
+
+    def test_failed_email_is_retried_with_backoff(self, client, monkeypatch):
+        from api.models import OutboxEmail
+        from django.core.mail.backends.locmem import EmailBackend
+
+        def fail(self, messages):
+            raise ConnectionError('SMTP is down')
+
+        self.signup(client, 'third')
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        call_command('send_emails')
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.PENDING and email.attempts == 1
+        assert email.last_error == 'SMTP is down'
+        assert email.next_attempt_at > email.created_at, (
+            'Проверьте, что повторная отправка откладывается'
+        )
+
+        OutboxEmail.objects.update(next_attempt_at=email.created_at)
+        call_command('send_emails')
+        assert OutboxEmail.objects.get().status == OutboxEmail.FAILED, (
+            'Проверьте, что после MAX_ATTEMPTS попыток письмо '
+            'помечается как неотправленное'
+        )
+
+    def test_unavailable_backend_is_retried(self, client, monkeypatch):
+        from api.models import OutboxEmail
+        from django.core.mail.backends.locmem import EmailBackend
+
+        def fail(self):
+            raise ConnectionRefusedError('SMTP is down')
+
+        self.signup(client, 'fourth')
+        self.signup(client, 'fifth')
+        monkeypatch.setattr(EmailBackend, 'open', fail)
+        call_command('send_emails')
+        emails = OutboxEmail.objects.all()
+        assert [email.status for email in emails] == [OutboxEmail.PENDING] * 2
+        for email in emails:
+            assert email.attempts == 1, (
+                'Проверьте, что недоступный сервер почты '
+                'засчитывается как попытка отправки'
+            )
+            assert email.last_error == 'SMTP is down'
+            assert email.next_attempt_at > email.created_at
+
+        monkeypatch.undo()
+        OutboxEmail.objects.update(next_attempt_at=email.created_at)
+        call_command('send_emails')
+        assert len(mail.outbox) == 2
@@ -0,0 +1,76 @@
+import pytest
+
+
+def walk(client, url, link='next'):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к {url} возвращает статус 200'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсора не выполняется подсчёт записей'
+        )
+        pages.append([item['id'] for item in data['results']])
+        url = data[link]
+    return pages
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    @pytest.fixture
+    def reviews(self, title, django_user_model):
+        from reviews.models import Review
+
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author{i}', email=f'author{i}@yamdb.fake'
+            )
+            for i in range(7)
+        ]
+        reviews = Review.objects.bulk_create(
+            Review(title=title, author=author, text='Текст', score=5)
+            for author in authors
+        )
+        # Equal dates check that the id breaks ties between rows.
+        Review.objects.update(pub_date='2022-01-01 12:00:00')
+        return reviews
+
+    def test_reviews_cursor_walks_all_rows(self, client, title, reviews):
+        from reviews.models import Review
+
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        pages = walk(client, f'{url}?pagination=cursor&limit=3')
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсорная пагинация отзывов проходит все '
+            'записи по порядку (pub_date, id) без пропусков и повторов'
+        )
+
+        response = client.get(f'{url}?pagination=cursor&limit=3')
+        second = client.get(response.json()['next']).json()
+        first = client.get(second['previous']).json()
+        assert [item['id'] for item in first['results']] == expected[:3], (
+            'Проверьте, что ссылка previous возвращает предыдущую страницу'
+        )
+
+    def test_limit_offset_still_works(self, client, title, reviews):
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?limit=3&offset=3'
+        )
+        data = response.json()
+        assert data['count'] == len(reviews) and len(data['results']) == 3, (
+            'Проверьте, что пагинация limit/offset продолжает работать'
+        )
+
+    def test_invalid_cursor(self, client, title):
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == 404, (
+            'Проверьте, что неверный курсор возвращает статус 404'
+        )
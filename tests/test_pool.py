@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+
+class Connection:
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.usable = True
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool:
+
+    @pytest.fixture
+    def opened(self):
+        return []
+
+    def create_pool(self, opened, **options):
+        from api.pool import ConnectionPool
+
+        def connect():
+            opened.append(Connection(len(opened)))
+            return opened[-1]
+
+        options = {'max_size': 2, 'timeout': 0.05, **options}
+        return ConnectionPool(
+            connect, lambda connection: connection.usable, **options
+        )
+
+    def test_reuse(self, opened):
+        pool = self.create_pool(opened)
+        connection = pool.acquire()
+        pool.release(connection)
+        assert pool.acquire() is connection, (
+            'Проверьте, что возвращённое в пул соединение используется снова'
+        )
+        assert len(opened) == 1
+        assert pool.stats()['reused'] == 1
+
+    def test_max_size(self, opened):
+        from api.pool import PoolTimeoutError
+
+        pool = self.create_pool(opened)
+        first = pool.acquire()
+        pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        assert pool.stats()['timeouts'] == 1
+        threading.Timer(0.01, pool.release, [first]).start()
+        assert pool.acquire() is first, (
+            'Проверьте, что запрос к полному пулу ждёт '
+            'освобождения соединения'
+        )
+        assert len(opened) == 2
+
+    def test_health_check(self, opened):
+        pool = self.create_pool(opened, check_after=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.usable = False
+        assert pool.acquire() is not connection, (
+            'Проверьте, что неработающее соединение не выдаётся из пула'
+        )
+        assert connection.closed
+        stats = pool.stats()
+        assert (stats['failed_checks'], stats['size']) == (1, 1)
+
+    def test_idle_timeout(self, opened):
+        pool = self.create_pool(opened, idle_timeout=0.01)
+        connection = pool.acquire()
+        pool.release(connection)
+        time.sleep(0.02)
+        assert pool.acquire() is not connection
+        assert connection.closed, (
+            'Проверьте, что простаивающие дольше IDLE_TIMEOUT '
+            'соединения закрываются'
+        )
+
+    def test_not_reusable(self, opened):
+        pool = self.create_pool(opened)
+        connection = pool.acquire()
+        pool.release(connection, reusable=False)
+        assert connection.closed
+        assert pool.stats()['size'] == 0
+
+    def test_failed_connect(self, opened):
+        from api.pool import ConnectionPool
+
+        def connect():
+            raise OSError('refused')
+
+        pool = ConnectionPool(connect, None, max_size=1)
+        for _ in range(2):
+            with pytest.raises(OSError):
+                pool.acquire()
+        assert pool.stats()['size'] == 0, (
+            'Проверьте, что неудачное подключение не занимает место в пуле'
+        )
+
+    def test_forked_process(self, opened):
+        pool = self.create_pool(opened)
+        connection = pool.acquire()
+        pool.release(connection)
+        pool.pid = -1
+        assert pool.acquire() is not connection, (
+            'Проверьте, что дочерний процесс не использует '
+            'соединения родителя'
+        )
+        assert not connection.closed
+        assert pool.stats()['size'] == 1
+
+
+@pytest.mark.django_db
+class TestPooledBackend:
+
+    def test_unreachable_database(self):
+        from django.db import OperationalError, connections
+
+        from api import pool
+        from api.pooled_postgresql.base import DatabaseWrapper
+
+        wrapper = DatabaseWrapper({
+            **connections.databases['default'],
+            'ENGINE': 'api.pooled_postgresql',
+            'NAME': 'yamdb',
+            'HOST': '127.0.0.1',
+            'PORT': '1',
+            'OPTIONS': {'connect_timeout': 1},
+        }, alias='pooled')
+        with pytest.raises(OperationalError):
+            wrapper.ensure_connection()
+        assert [
+            stats['size'] for stats in pool.stats()['pools']
+            if stats['alias'] == 'pooled'
+        ] == [0]
+
+    def test_metrics(self, admin_client):
+        from django.db import connections
+
+        wrapper = connections['default'].__class__(
+            {**connections.databases['default']}, alias='counted'
+        )
+        wrapper.ensure_connection()
+        wrapper.close()
+        data = admin_client.get('/api/v1/metrics/').json()['database']
+        assert data['connects']['counted'] == 1, (
+            'Проверьте, что /api/v1/metrics/ считает подключения к базе'
+        )
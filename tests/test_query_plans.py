@@ -0,0 +1,126 @@
+import pytest
+from django.db import connection
+
+
+PAGE_SIZE = 10
+
+
+def get_plan(queryset):
+    """Getting the plan of the query. On PostgreSQL sequential scans
+    and sorts are disabled, so the plan shows whether an index can
+    serve the query and its order, however small the test tables are.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            cursor.execute('SET enable_sort = off')
+        try:
+            return queryset.explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+                cursor.execute('RESET enable_sort')
+    return queryset.explain()
+
+
+def assert_uses_index(queryset, index_name=None, sorted_by_index=False):
+    plan = get_plan(queryset)
+    if connection.vendor == 'postgresql':
+        assert 'Seq Scan' not in plan, (
+            f'Проверьте, что запрос использует индекс:\n{plan}'
+        )
+        if sorted_by_index:
+            assert 'Sort' not in plan, (
+                f'Проверьте, что сортировку обеспечивает индекс:\n{plan}'
+            )
+    elif connection.vendor == 'sqlite':
+        assert 'USING' in plan and 'SCAN' not in plan, (
+            f'Проверьте, что запрос использует индекс:\n{plan}'
+        )
+        if sorted_by_index:
+            assert 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что сортировку обеспечивает индекс:\n{plan}'
+            )
+    else:
+        pytest.skip(f'No plan checks for {connection.vendor}')
+    if index_name is not None:
+        assert index_name in plan, (
+            f'Проверьте, что запрос использует индекс {index_name}:\n{plan}'
+        )
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+
+    @pytest.fixture
+    def data(self, category, genres, django_user_model):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author{i}', email=f'author{i}@yamdb.fake'
+            )
+            for i in range(20)
+        ]
+        # Enough genre links for a scan of genre_title_unique, which
+        # does not start with the genre, to cost more than the index
+        # starting with it, however bloated the tables of the test
+        # database are.
+        Title.objects.bulk_create(
+            Title(name=f'Title {i}', year=2000, category=category)
+            for i in range(500)
+        )
+        titles = list(Title.objects.all())
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genres[i % 2])
+            for i, title in enumerate(titles)
+        )
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Текст', score=5)
+            for title in titles[:50] for author in authors
+        )
+        review = Review.objects.first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Текст')
+            for author in authors
+        )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        return titles[0], review, authors[0], genres[0]
+
+    def test_reviews_of_title(self, data):
+        from reviews.models import Review
+
+        title, *_ = data
+        assert_uses_index(
+            Review.objects.filter(title=title)
+            .order_by('-pub_date', '-id')[:PAGE_SIZE],
+            'review_title_pub_date_idx',
+            sorted_by_index=True
+        )
+
+    def test_comments_of_review(self, data):
+        from reviews.models import Comment
+
+        _, review, *_ = data
+        assert_uses_index(
+            Comment.objects.filter(review=review)
+            .order_by('-pub_date', '-id')[:PAGE_SIZE],
+            'comment_review_pub_date_idx',
+            sorted_by_index=True
+        )
+
+    def test_genre_title_both_directions(self, data):
+        from reviews.models import GenreTitle
+
+        title, _, _, genre = data
+        assert_uses_index(GenreTitle.objects.filter(title=title))
+        assert_uses_index(
+            GenreTitle.objects.filter(genre=genre).values('title_id'),
+            'genre_title_genre_idx'
+        )
+
+    def test_review_uniqueness_check(self, data):
+        title, _, author, _ = data
+        assert_uses_index(author.reviews.filter(title_id=title.id))
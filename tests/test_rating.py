@@ -0,0 +1,91 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_review_writes(self, title, user, another_user):
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отлично', score=10
+        )
+        Review.objects.create(
+            title=title, author=another_user, text='Неплохо', score=5
+        )
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            15, 2, 7
+        ), 'Проверьте, что рейтинг пересчитывается при создании отзыва'
+
+        review.score = 1
+        review.save()
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            6, 2, 3
+        ), 'Проверьте, что рейтинг пересчитывается при изменении оценки'
+
+        review.delete()
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            5, 1, 5
+        ), 'Проверьте, что рейтинг пересчитывается при удалении отзыва'
+
+        Review.objects.all().delete()
+        title.refresh_from_db()
+        assert title.rating is None, (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+
+    def test_edits_of_stale_copies(self, title, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отлично', score=5
+        )
+        first, second = Review.objects.get(), Review.objects.get()
+        first.score = 8
+        first.save()
+        second.score = 6
+        with CaptureQueriesContext(connection) as context:
+            second.save()
+        title.refresh_from_db()
+        assert (title.score_sum, title.rating) == (6, 6), (
+            'Проверьте, что изменение устаревшей копии отзыва '
+            'не искажает сумму оценок'
+        )
+        if connection.features.has_select_for_update:
+            assert any(
+                'FOR UPDATE' in query['sql']
+                for query in context.captured_queries
+            ), 'Проверьте, что прежняя оценка читается с блокировкой'
+        review.refresh_from_db()
+        assert review.score == 6
+
+    def test_rebuild_ratings(self, title, user, another_user):
+        from reviews.models import Review, Title
+
+        Review.objects.bulk_create([
+            Review(title=title, author=user, text='Отлично', score=9),
+            Review(title=title, author=another_user, text='Плохо', score=2),
+        ])
+        Title.objects.update(score_sum=0, review_count=0, rating=None)
+        call_command('rebuild_ratings', batch_size=1)
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            11, 2, 5
+        ), 'Проверьте, что команда rebuild_ratings пересчитывает рейтинги'
+
+    def test_titles_endpoint_reads_stored_rating(
+            self, client, title, user, django_assert_max_num_queries):
+        from reviews.models import Review
+
+        Review.objects.create(title=title, author=user, text='Ок', score=8)
+        with django_assert_max_num_queries(4):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что /api/v1/titles/{id}/ отдаёт сохранённый рейтинг'
+        )
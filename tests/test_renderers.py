@@ -0,0 +1,105 @@
+import datetime
+import decimal
+import io
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+DATA = {
+    'results': [
+        {
+            'id': 1,
+            'name': 'Побег из Шоушенка  ',
+            'rating': None,
+            'score': 9.5,
+            'genre': [{'name': 'Драма', 'slug': 'drama'}],
+            'pub_date': datetime.datetime(2020, 1, 2, 3, 4, 5),
+            'price': decimal.Decimal('1.50'),
+            'detail': gettext_lazy('Not found.'),
+        },
+    ],
+    'next': None,
+}
+
+
+class TestRenderers:
+
+    def test_orjson_renders_as_drf(self):
+        from api.renderers import ORJSONRenderer
+
+        assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA), (
+            'Проверьте, что ORJSONRenderer выдаёт тот же JSON, '
+            'что и JSONRenderer'
+        )
+
+    @pytest.mark.parametrize('renderer_name,parser_name', [
+        ('ORJSONRenderer', 'ORJSONParser'),
+        ('MessagePackRenderer', 'MessagePackParser'),
+    ])
+    def test_round_trip(self, renderer_name, parser_name):
+        from api import parsers, renderers
+
+        content = getattr(renderers, renderer_name)().render(DATA)
+        data = getattr(parsers, parser_name)().parse(io.BytesIO(content))
+        expected = JSONParser().parse(
+            io.BytesIO(JSONRenderer().render(DATA))
+        )
+        assert data == expected, (
+            f'Проверьте, что {parser_name} возвращает данные, '
+            f'отрисованные {renderer_name}, без изменений'
+        )
+
+    @pytest.mark.parametrize('parser_name,content', [
+        ('ORJSONParser', b'{"a": NaN}'),
+        ('ORJSONParser', b'{"a":'),
+        ('MessagePackParser', b'\xc1'),
+        ('MessagePackParser', b'\x92\x01'),
+    ])
+    def test_parse_error(self, parser_name, content):
+        from api import parsers
+        from rest_framework.exceptions import ParseError
+
+        with pytest.raises(ParseError):
+            getattr(parsers, parser_name)().parse(io.BytesIO(content))
+
+
+@pytest.mark.django_db
+class TestContentNegotiation:
+
+    def test_json_by_default(self, client, title):
+        response = client.get('/api/v1/titles/')
+        assert response['Content-Type'] == 'application/json'
+
+    def test_msgpack(self, client, title):
+        import msgpack
+
+        json_data = client.get('/api/v1/titles/').json()
+        for response in (
+            client.get(
+                '/api/v1/titles/', HTTP_ACCEPT='application/msgpack'
+            ),
+            client.get('/api/v1/titles/?format=msgpack'),
+        ):
+            assert response['Content-Type'] == 'application/msgpack', (
+                'Проверьте, что ответ отдаётся в MessagePack '
+                'по заголовку Accept или ?format=msgpack'
+            )
+            assert msgpack.unpackb(response.content, raw=False) == json_data
+
+    def test_msgpack_request(self, admin_client):
+        import msgpack
+
+        response = admin_client.post(
+            '/api/v1/genres/',
+            data=msgpack.packb({'name': 'Драма', 'slug': 'drama'}),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack'
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что API принимает тело запроса в MessagePack'
+        )
+        assert msgpack.unpackb(response.content, raw=False) == {
+            'name': 'Драма', 'slug': 'drama'
+        }
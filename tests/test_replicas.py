@@ -0,0 +1,102 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        from api.replicas import sticky_users
+
+        settings.DATABASE_REPLICAS = ['replica1']
+        sticky_users.clear()
+
+    def request(self, method, user=None, status=200, token=None):
+        """Getting the database of the reads of a request."""
+        from api.authentication import create_access_token
+        from api.replicas import ReplicaMiddleware, ReplicaRouter
+        from reviews.models import Title
+
+        databases = []
+
+        def view(request):
+            databases.append(ReplicaRouter().db_for_read(Title))
+            return HttpResponse(status=status)
+
+        headers = {}
+        if user is not None:
+            token = create_access_token(user)
+        if token is not None:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        request = RequestFactory().generic(method, '/api/v1/titles/',
+                                           **headers)
+        ReplicaMiddleware(view)(request)
+        return databases[0]
+
+    def test_reads_and_writes(self, user):
+        assert self.request('GET') == 'replica1', (
+            'Проверьте, что чтение направляется на реплику'
+        )
+        assert self.request('HEAD', user) == 'replica1'
+        assert self.request('POST', user) == 'default', (
+            'Проверьте, что запросы на запись читают с основной базы'
+        )
+
+    def test_sticky_after_write(self, user, another_user):
+        self.request('PATCH', user)
+        assert self.request('GET', user) == 'default', (
+            'Проверьте, что после записи чтение пользователя '
+            'остаётся на основной базе'
+        )
+        assert self.request('GET', another_user) == 'replica1'
+        assert self.request('GET') == 'replica1'
+
+    @pytest.mark.parametrize('user_id', [[1], {'id': 1}, 1.5, True, None])
+    def test_forged_user_id(self, user_id):
+        import jwt
+
+        token = jwt.encode({'user_id': user_id}, 'forged', algorithm='HS256')
+        if isinstance(token, bytes):
+            token = token.decode()
+        assert self.request('GET', token=token) == 'replica1', (
+            'Проверьте, что токен с неверным user_id считается анонимным'
+        )
+
+    def test_failed_write_is_not_sticky(self, user):
+        self.request('POST', user, status=400)
+        assert self.request('GET', user) == 'replica1', (
+            'Проверьте, что неудачная запись не привязывает чтение '
+            'к основной базе'
+        )
+
+    def test_sticky_window(self, user, monkeypatch):
+        from api.replicas import sticky_users
+
+        monkeypatch.setattr(sticky_users, 'timeout', -1)
+        self.request('DELETE', user)
+        assert self.request('GET', user) == 'replica1', (
+            'Проверьте, что привязка к основной базе истекает '
+            'через STICKY_SECONDS'
+        )
+
+    def test_without_replicas(self, settings, user):
+        settings.DATABASE_REPLICAS = []
+        assert self.request('GET', user) == 'default'
+
+    def test_outside_requests(self):
+        from api.replicas import ReplicaRouter
+        from reviews.models import Title
+
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) == 'default', (
+            'Проверьте, что вне запросов чтение идёт с основной базы'
+        )
+        assert router.db_for_write(Title) == 'default'
+
+    def test_metrics(self, admin_client):
+        self.request('GET')
+        data = admin_client.get('/api/v1/metrics/').json()['replicas']
+        assert data['replicas'] == 1
+        assert data['requests']['replica'] >= 1
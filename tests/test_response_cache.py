@@ -0,0 +1,125 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к {url} возвращает статус 200'
+        )
+        return response, len(context.captured_queries)
+
+    def test_repeated_anonymous_get_is_cached(self, client, title):
+        url = '/api/v1/titles/'
+        response, _ = self.get(client, url)
+        assert response['X-Cache'] == 'MISS'
+        cached, queries = self.get(client, url)
+        assert cached['X-Cache'] == 'HIT' and queries == 1, (
+            'Проверьте, что повторный запрос берётся из кэша и делает '
+            'только один запрос версии ресурса'
+        )
+        assert cached.json() == response.json()
+        other, _ = self.get(client, f'{url}?limit=1')
+        assert other['X-Cache'] == 'MISS', (
+            'Проверьте, что строка запроса входит в ключ кэша'
+        )
+
+    @pytest.mark.parametrize('url', [
+        '/api/v1/titles/',
+        '/api/v1/titles/{title.id}/',
+        '/api/v1/titles/{title.id}/reviews/',
+    ])
+    def test_review_write_invalidates(self, client, title, user, url):
+        from reviews.models import Review
+
+        url = url.format(title=title)
+        self.get(client, url)
+        Review.objects.create(title=title, author=user, text='Ок', score=7)
+        response, _ = self.get(client, url)
+        assert response['X-Cache'] == 'MISS', (
+            f'Проверьте, что новый отзыв сбрасывает кэш {url}'
+        )
+
+    def test_category_write_invalidates(self, client, title, category):
+        url = f'/api/v1/titles/{title.id}/'
+        self.get(client, url)
+        category.name = 'Кино'
+        category.save()
+        response, _ = self.get(client, url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['category']['name'] == 'Кино', (
+            'Проверьте, что изменение категории сбрасывает кэш произведения'
+        )
+
+    def test_username_change_invalidates(self, client, title, user,
+                                         admin_client):
+        from reviews.models import Comment, Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Ок', score=7
+        )
+        Comment.objects.create(review=review, author=user, text='Да')
+        urls = [
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        ]
+        for url in urls:
+            self.get(client, url)
+        user.email = 'other@yamdb.fake'
+        user.save()
+        for url in urls:
+            assert self.get(client, url)[0]['X-Cache'] == 'HIT', (
+                'Проверьте, что изменения пользователя, которых нет '
+                'в ответе, не сбрасывают кэш'
+            )
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', {'username': 'Renamed'},
+            format='json'
+        )
+        assert response.status_code == 200
+        for url in urls:
+            response, _ = self.get(client, url)
+            assert response['X-Cache'] == 'MISS'
+            assert response.json()['results'][0]['author'] == 'Renamed', (
+                'Проверьте, что смена имени автора сбрасывает кэш '
+                'отзывов и комментариев'
+            )
+
+    def test_authenticated_get_is_not_cached(self, user_client, title):
+        response = user_client.get('/api/v1/titles/')
+        assert 'X-Cache' not in response
+
+    def test_metrics(self, client, admin_client, title):
+        self.get(client, '/api/v1/genres/')
+        self.get(client, '/api/v1/genres/')
+        assert client.get('/api/v1/metrics/').status_code == 401
+        stats = admin_client.get('/api/v1/metrics/').json()['response_cache']
+        assert (stats['hits'], stats['misses']) == (1, 1), (
+            'Проверьте, что /api/v1/metrics/ отдаёт счётчики кэша'
+        )
+
+
+class TestLRUCacheBackend:
+
+    def test_eviction_and_ttl(self, monkeypatch):
+        from api.cache import LRUCacheBackend
+
+        backend = LRUCacheBackend(max_entries=2, timeout=10)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+        assert backend.get('b') is None and backend.get('a') == 1, (
+            'Проверьте, что вытесняется давно не использованная запись'
+        )
+        assert backend.stats() == {'size': 2, 'evictions': 1}
+
+        monkeypatch.setattr('api.cache.time.monotonic', lambda: 10 ** 9)
+        assert backend.get('c') is None, (
+            'Проверьте, что записи истекают по TTL'
+        )
@@ -0,0 +1,120 @@
+import datetime
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestRowSerializers:
+
+    @pytest.fixture
+    def titles(self, title, genres, category):
+        from reviews.models import Genre, Title
+
+        musical = Genre.objects.create(name='Мюзикл', slug='musical')
+        bare = Title.objects.create(name='Без категории', year=1900)
+        many = Title.objects.create(
+            name='Много жанров', year=2020, description='', category=category
+        )
+        many.genre.set([musical, genres[1], genres[0]])
+        return [title, bare, many]
+
+    @pytest.fixture
+    def reviews(self, titles, user, another_user):
+        from reviews.models import Comment, Review
+
+        reviews = [
+            Review.objects.create(
+                title=titles[0], author=user, text='Отзыв', score=10
+            ),
+            Review.objects.create(
+                title=titles[0], author=another_user, text='Ещё', score=1
+            ),
+        ]
+        Review.objects.filter(pk=reviews[1].pk).update(
+            pub_date=datetime.datetime(2020, 1, 2, 3, 4, 5)
+        )
+        Comment.objects.create(review=reviews[0], author=user, text='Да')
+        Comment.objects.create(
+            review=reviews[0], author=another_user, text='Нет'
+        )
+        return reviews
+
+    def assert_same(self, queryset, serializer_class, row_serializer_class):
+        expected = render(serializer_class(queryset, many=True).data)
+        row_serializer = row_serializer_class()
+        actual = render(
+            row_serializer.serialize(row_serializer.get_rows(queryset))
+        )
+        assert actual == expected, (
+            f'Проверьте, что {row_serializer_class.__name__} выдаёт тот же '
+            f'JSON, что и {serializer_class.__name__}'
+        )
+
+    def test_titles(self, titles, reviews):
+        from api.row_serializers import TitleRowSerializer
+        from api.serializers import TitleReadSerializer
+        from reviews.models import Title
+
+        self.assert_same(
+            Title.objects.select_related('category')
+            .prefetch_related('genre'),
+            TitleReadSerializer,
+            TitleRowSerializer
+        )
+
+    def test_reviews(self, reviews):
+        from api.row_serializers import ReviewRowSerializer
+        from api.serializers import ReviewSerializer
+        from reviews.models import Review
+
+        self.assert_same(
+            Review.objects.select_related('author', 'title'),
+            ReviewSerializer,
+            ReviewRowSerializer
+        )
+
+    def test_comments(self, reviews):
+        from api.row_serializers import CommentRowSerializer
+        from api.serializers import CommentSerializer
+        from reviews.models import Comment
+
+        self.assert_same(
+            Comment.objects.select_related('author'),
+            CommentSerializer,
+            CommentRowSerializer
+        )
+
+    def test_list_endpoints(self, client, titles, reviews):
+        from api.serializers import (CommentSerializer, ReviewSerializer,
+                                     TitleReadSerializer)
+        from reviews.models import Title
+
+        title = titles[0]
+        cases = (
+            ('/api/v1/titles/', TitleReadSerializer, Title.objects.all()),
+            (
+                f'/api/v1/titles/{title.id}/reviews/',
+                ReviewSerializer,
+                title.reviews.order_by('-pub_date', '-id'),
+            ),
+            (
+                f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/'
+                'comments/?pagination=cursor',
+                CommentSerializer,
+                reviews[0].comments.order_by('-pub_date', '-id'),
+            ),
+        )
+        for url, serializer_class, objects in cases:
+            response = client.get(url)
+            assert response.status_code == 200
+            assert render(response.json()['results']) == render(
+                serializer_class(objects, many=True).data
+            ), (
+                f'Проверьте, что {url} выдаёт тот же JSON, '
+                f'что и {serializer_class.__name__}'
+            )
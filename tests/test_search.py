@@ -0,0 +1,68 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    @pytest.fixture
+    def titles(self, category):
+        from reviews.models import Title
+
+        return [
+            Title.objects.create(
+                name='Побег из Шоушенка', year=1994, category=category,
+                description='Драма о тюрьме и надежде'
+            ),
+            Title.objects.create(
+                name='Зелёная миля', year=1999, category=category,
+                description='Тюрьма, надзиратели и чудо'
+            ),
+            Title.objects.create(
+                name='Тюрьма', year=2005, category=category,
+                description='Тюремная драма о тюрьме'
+            ),
+        ]
+
+    def get_names(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к {url} возвращает статус 200'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_search_is_ranked(self, client, titles):
+        names = self.get_names(client, '/api/v1/titles/?search=тюрьм')
+        assert set(names) == {titles[0].name, titles[1].name, titles[2].name}
+        assert names[0] == 'Тюрьма', (
+            'Проверьте, что поиск ставит лучшее совпадение первым'
+        )
+        assert self.get_names(
+            client, '/api/v1/titles/?search=надежде драма'
+        ) == [titles[0].name], (
+            'Проверьте, что поиск требует совпадения всех слов запроса'
+        )
+
+    def test_search_follows_updates(self, client, titles):
+        titles[1].name = 'Чудо в тюрьме'
+        titles[1].description = ''
+        titles[1].save()
+        assert self.get_names(client, '/api/v1/titles/?search=миля') == []
+        titles[0].delete()
+        assert self.get_names(
+            client, '/api/v1/titles/?search=чудо'
+        ) == ['Чудо в тюрьме'], (
+            'Проверьте, что поисковый индекс обновляется вместе '
+            'с произведениями'
+        )
+
+    def test_slug_filters_are_exact(self, client, titles, genres):
+        titles[0].genre.set(genres)
+        assert self.get_names(client, '/api/v1/titles/?genre=drama') == [
+            titles[0].name
+        ]
+        assert self.get_names(client, '/api/v1/titles/?genre=dram') == [], (
+            'Проверьте, что фильтр по жанру ищет точное совпадение slug'
+        )
+        assert len(self.get_names(
+            client, '/api/v1/titles/?category=movie'
+        )) == 3
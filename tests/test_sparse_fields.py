@@ -0,0 +1,127 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def get(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что GET-запрос к {url} возвращает статус 200'
+    )
+    return response.json(), [query['sql'] for query in context]
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    @pytest.fixture
+    def review(self, title, user, another_user):
+        from reviews.models import Comment, Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=8
+        )
+        Comment.objects.create(review=review, author=another_user, text='Да')
+        return review
+
+    def test_title_list_fields(self, client, title):
+        data, queries = get(client, '/api/v1/titles/?fields=id,name')
+        assert list(data['results'][0]) == ['id', 'name'], (
+            'Проверьте, что ?fields= оставляет в ответе только '
+            'указанные поля в порядке сериализатора'
+        )
+        assert not any('genre' in sql for sql in queries), (
+            'Проверьте, что без поля genre жанры не запрашиваются'
+        )
+        assert not any('"reviews_category"' in sql for sql in queries), (
+            'Проверьте, что без поля category категория не присоединяется'
+        )
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что без поля description описание не выбирается'
+        )
+
+    def test_title_retrieve_exclude(self, client, title):
+        data, queries = get(
+            client,
+            f'/api/v1/titles/{title.id}/?exclude=genre,category,description'
+        )
+        assert list(data) == ['id', 'name', 'year', 'rating'], (
+            'Проверьте, что ?exclude= убирает указанные поля из ответа'
+        )
+        title_queries = [
+            sql for sql in queries if 'resourceversion' not in sql
+        ]
+        assert not any(
+            'genre' in sql or '"description"' in sql
+            or '"reviews_category"' in sql
+            for sql in title_queries
+        ), (
+            'Проверьте, что для исключённых полей произведения '
+            'не выполняются запросы и не выбираются столбцы'
+        )
+
+    def test_fields_and_exclude(self, client, title):
+        data, _ = get(
+            client, '/api/v1/titles/?fields=id,name,year&exclude=year'
+        )
+        assert list(data['results'][0]) == ['id', 'name']
+
+    def test_full_output_by_default(self, client, title):
+        data, _ = get(client, '/api/v1/titles/')
+        assert list(data['results'][0]) == [
+            'id', 'name', 'year', 'genre', 'rating', 'category', 'description'
+        ]
+
+    def test_reviews_and_comments(self, client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        data, queries = get(client, f'{url}?fields=id,score')
+        assert data['results'] == [{'id': review.id, 'score': 8}]
+        assert not any('"users_user"' in sql for sql in queries), (
+            'Проверьте, что без поля author автор не присоединяется'
+        )
+        data, _ = get(client, f'{url}{review.id}/?fields=text')
+        assert data == {'text': 'Отзыв'}
+        data, _ = get(client, f'{url}{review.id}/comments/?exclude=author')
+        assert list(data['results'][0]) == ['id', 'text', 'pub_date']
+
+    def test_pagination_with_fields(self, client, category):
+        from reviews.models import Title
+
+        for number in range(3):
+            Title.objects.create(
+                name=f'Title {number}', year=2000, category=category
+            )
+        data, _ = get(client, '/api/v1/titles/?fields=name&limit=2')
+        assert [item['name'] for item in data['results']] == [
+            'Title 0', 'Title 1'
+        ]
+        data, _ = get(client, data['next'])
+        assert data['results'] == [{'name': 'Title 2'}], (
+            'Проверьте, что постраничный вывод работает, '
+            'даже если ключ страницы не запрошен в ?fields='
+        )
+
+    def test_categories_and_genres(self, client, category, genres):
+        data, _ = get(client, '/api/v1/categories/?fields=slug')
+        assert data['results'] == [{'slug': category.slug}]
+        data, _ = get(client, '/api/v1/genres/?exclude=name')
+        assert {'slug': genres[0].slug} in data['results']
+
+    def test_users(self, admin_client, admin):
+        data, _ = get(admin_client, '/api/v1/users/?fields=username,role')
+        assert data['results'] == [{'username': admin.username, 'role': 'admin'}]
+
+    def test_unknown_field(self, client, title):
+        response = client.get('/api/v1/titles/?fields=id,secret')
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестное поле в ?fields= даёт статус 400'
+        )
+        assert 'fields' in response.json()
+
+    def test_write_is_not_trimmed(self, admin_client, category):
+        response = admin_client.post(
+            '/api/v1/categories/?fields=slug',
+            data={'name': 'Кино', 'slug': 'movies'}
+        )
+        assert response.json() == {'name': 'Кино', 'slug': 'movies'}
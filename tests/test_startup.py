@@ -0,0 +1,110 @@
+import gc
+import importlib
+import json
+import multiprocessing
+from io import StringIO
+
+from django.core.management import call_command
+
+
+class TestGunicornConfig:
+
+    def load(self, monkeypatch, **env):
+        from api_yamdb import gunicorn
+
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(gunicorn)
+
+    def test_defaults(self, monkeypatch):
+        for name in ('GUNICORN_WORKERS', 'GUNICORN_THREADS',
+                     'GUNICORN_PRELOAD', 'DB_MAX_CONNECTIONS'):
+            monkeypatch.delenv(name, raising=False)
+        config = self.load(monkeypatch)
+        cpu_count = multiprocessing.cpu_count()
+        assert config.workers == 2 * cpu_count + 1, (
+            'Проверьте, что число воркеров зависит от числа процессоров'
+        )
+        assert config.threads == max(
+            1, min(2 * cpu_count, 80 // config.workers)
+        )
+        assert config.worker_class == 'gthread'
+        assert config.preload_app is True
+        assert config.max_requests > 0 and config.max_requests_jitter > 0
+
+    def test_env(self, monkeypatch):
+        config = self.load(
+            monkeypatch, GUNICORN_WORKERS='3', GUNICORN_THREADS='1',
+            GUNICORN_PRELOAD='False'
+        )
+        assert (config.workers, config.threads) == (3, 1)
+        assert config.preload_app is False
+
+    def test_connection_budget(self, monkeypatch):
+        monkeypatch.delenv('GUNICORN_THREADS', raising=False)
+        config = self.load(
+            monkeypatch, GUNICORN_WORKERS='17', DB_MAX_CONNECTIONS='100'
+        )
+        assert config.workers * config.threads <= 100, (
+            'Проверьте, что воркеры и потоки держат не больше '
+            'DB_MAX_CONNECTIONS подключений к базе'
+        )
+        config = self.load(monkeypatch, DB_MAX_CONNECTIONS='5')
+        assert config.threads == 1
+
+    def test_warm_up_hooks(self, monkeypatch):
+        from api import warmup
+
+        config = self.load(monkeypatch)
+        calls = []
+        monkeypatch.setattr(warmup, 'warm_up', lambda: calls.append(1) or 0)
+
+        class Log:
+            def info(self, *args):
+                pass
+
+        class Server:
+            log = Log()
+
+            class cfg:
+                preload_app = True
+
+        config.when_ready(Server())
+        config.post_worker_init(Server())
+        assert calls == [1], (
+            'Проверьте, что при preload прогрев выполняется один раз '
+            'в мастер-процессе'
+        )
+        Server.cfg.preload_app = False
+        config.when_ready(Server())
+        config.post_worker_init(Server())
+        assert calls == [1, 1]
+
+
+class TestWarmUp:
+
+    def test_warm_up(self):
+        from api.warmup import warm_up
+
+        try:
+            assert warm_up() > 0
+            assert gc.get_freeze_count() > 0, (
+                'Проверьте, что после прогрева объекты заморожены gc.freeze()'
+            )
+        finally:
+            gc.unfreeze()
+
+    def test_startup_report(self):
+        out = StringIO()
+        call_command('startup_report', path='/redoc/', top=5, json=True,
+                     stdout=out)
+        report = json.loads(out.getvalue())
+        assert set(report['runs']) == {'cold', 'warm'}
+        for run in report['runs'].values():
+            assert run['status'] == '200 OK'
+            assert run['to_first_response_ms'] > 0
+        assert report['runs']['warm']['warm_up_ms'] > 0
+        assert 'django' in report['packages'], (
+            'Проверьте, что отчёт показывает время импорта пакетов'
+        )
+        assert len(report['modules']) == 5
@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestStatelessJWT:
+
+    @pytest.fixture(autouse=True)
+    def clear_token_caches(self):
+        from api.authentication import user_versions, verified_tokens
+
+        verified_tokens.clear()
+        user_versions.clear()
+
+    def get_token(self, client, user):
+        user.refresh_from_db()
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': user.confirmation_code,
+        })
+        assert response.status_code == 201, (
+            'Проверьте, что POST-запрос к /api/v1/auth/token/ '
+            'возвращает токен'
+        )
+        return response.json()['token']
+
+    def test_requests_skip_user_lookup(self, client, admin):
+        token = self.get_token(client, admin)
+        url = '/api/v1/categories/'
+        data = {'name': 'Книга', 'slug': 'book'}
+        response = client.post(url, data, HTTP_AUTHORIZATION=f'Bearer {token}')
+        assert response.status_code == 201, (
+            'Проверьте, что администратор с новым токеном '
+            'может создать категорию'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        assert response.status_code == 200
+        assert not any(
+            'users_user' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что аутентификация не загружает пользователя из базы'
+
+    def test_me_returns_full_profile(self, client, user):
+        token = self.get_token(client, user)
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert response.json()['email'] == user.email
+        assert response.json()['bio'] == user.bio
+
+    def test_role_change_makes_token_stale(self, client, admin):
+        token = self.get_token(client, admin)
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        assert client.get('/api/v1/users/', **auth).status_code == 200
+        admin.role = 'user'
+        admin.save()
+        assert client.get('/api/v1/users/', **auth).status_code == 401, (
+            'Проверьте, что после смены роли старый токен не принимается'
+        )
+        token = self.get_token(client, admin)
+        assert client.get(
+            '/api/v1/users/', HTTP_AUTHORIZATION=f'Bearer {token}'
+        ).status_code == 403
@@ -0,0 +1,242 @@
+import pytest
+from django.core.management import call_command
+
+
+def snapshot():
+    from reviews.models import CategoryStats, GenreStats
+
+    return {
+        (model.__name__, stats.pk): (
+            stats.title_count, stats.review_count, stats.score_sum,
+            stats.get_leaderboard()
+        )
+        for model in (GenreStats, CategoryStats)
+        for stats in model.objects.all()
+    }
+
+
+def assert_consistent(step):
+    from reviews.stats import rebuild_stats
+
+    incremental = snapshot()
+    rebuild_stats()
+    assert incremental == snapshot(), (
+        f'Проверьте, что после шага «{step}» статистика жанров и категорий '
+        'совпадает с полным пересчётом'
+    )
+
+
+@pytest.mark.django_db
+class TestStats:
+
+    @pytest.fixture(autouse=True)
+    def top_size(self, settings):
+        settings.STATS_TOP_SIZE = 2
+
+    @pytest.fixture
+    def users(self, django_user_model):
+        return [
+            django_user_model.objects.create_user(
+                username=f'user{number}', email=f'user{number}@yamdb.fake'
+            )
+            for number in range(4)
+        ]
+
+    @pytest.fixture
+    def titles(self, category, genres):
+        from reviews.models import Title
+
+        titles = [
+            Title.objects.create(
+                name=f'Title {number}', year=2000, category=category
+            )
+            for number in range(4)
+        ]
+        for title in titles:
+            title.genre.set(genres)
+        return titles
+
+    def test_incremental_updates(self, titles, users, genres):
+        from reviews.models import Category, Review
+
+        assert_consistent('создание произведений')
+        reviews = []
+        for title, scores in zip(titles, ((10, 9), (8, 8), (6, 5), (3,))):
+            for user, score in zip(users, scores):
+                reviews.append(Review.objects.create(
+                    title=title, author=user, text='Отзыв', score=score
+                ))
+        assert_consistent('создание отзывов')
+        reviews[0].score = 1
+        reviews[0].save()
+        assert_consistent('изменение оценки лидера')
+        reviews[-1].score = 10
+        reviews[-1].save()
+        assert_consistent('рост оценки вне лидеров')
+        reviews[2].delete()
+        assert_consistent('удаление отзыва')
+        titles[1].genre.remove(genres[0])
+        assert_consistent('удаление жанра произведения')
+        titles[1].genre.add(genres[0])
+        assert_consistent('добавление жанра произведения')
+        titles[3].refresh_from_db()
+        titles[3].category = Category.objects.create(
+            name='Кино', slug='movies'
+        )
+        titles[3].save()
+        assert_consistent('смена категории')
+        titles[0].delete()
+        assert_consistent('удаление произведения')
+        genres[1].delete()
+        assert_consistent('удаление жанра')
+
+    def add_reviews(self, titles, users):
+        from reviews.models import Review
+
+        for title_number, title in enumerate(titles):
+            for user_number, user in enumerate(users):
+                Review.objects.create(
+                    title=title, author=user, text='Отзыв',
+                    score=1 + (title_number + user_number * 3) % 10
+                )
+
+    def count_title_updates(self, delete):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            delete()
+        return sum(
+            query['sql'].startswith('UPDATE "reviews_title"')
+            for query in context.captured_queries
+        )
+
+    def test_user_delete(self, titles, users):
+        from reviews.activity import rebuild_activity
+        from reviews.models import Review, Title, TitleActivity
+
+        self.add_reviews(titles, users)
+        updates = self.count_title_updates(users[0].delete)
+        assert updates <= 2, (
+            'Проверьте, что счётчики произведений удалённого пользователя '
+            'пересчитываются один раз, а не для каждого отзыва'
+        )
+        assert_consistent('удаление пользователя')
+        for title in Title.objects.all():
+            scores = list(
+                Review.objects.filter(title=title)
+                .values_list('score', flat=True)
+            )
+            assert (title.score_sum, title.review_count, title.rating) == (
+                sum(scores), len(scores), sum(scores) // len(scores)
+            ), 'Проверьте рейтинг произведений после удаления пользователя'
+        buckets = sorted(TitleActivity.objects.values_list(
+            'title_id', 'period', 'start', 'review_count', 'score_sum'
+        ))
+        rebuild_activity()
+        assert buckets == sorted(TitleActivity.objects.values_list(
+            'title_id', 'period', 'start', 'review_count', 'score_sum'
+        )), 'Проверьте активность произведений после удаления пользователя'
+
+    def test_title_delete(self, titles, users):
+        self.add_reviews(titles, users)
+        assert self.count_title_updates(titles[0].delete) <= 1, (
+            'Проверьте, что отзывы удаляемого произведения '
+            'не меняют его счётчики'
+        )
+        assert_consistent('удаление произведения с отзывами')
+
+    def test_leaderboard(self, titles, users, genres):
+        from reviews.models import GenreStats, Review
+
+        for title, score in zip(titles, (7, 9, 9, 2)):
+            Review.objects.create(
+                title=title, author=users[0], text='Отзыв', score=score
+            )
+        Review.objects.create(
+            title=titles[2], author=users[1], text='Отзыв', score=9
+        )
+        stats = GenreStats.objects.get(genre=genres[0])
+        assert stats.get_leaderboard() == [
+            [titles[2].id, 9, 2], [titles[1].id, 9, 1]
+        ], (
+            'Проверьте, что лидеры упорядочены по рейтингу, затем по числу '
+            'отзывов и ограничены STATS_TOP_SIZE'
+        )
+        assert (stats.title_count, stats.review_count) == (4, 5)
+        assert stats.mean_score == 7.2
+
+    def test_endpoints(self, client, titles, users, genres, category):
+        from reviews.models import Review
+
+        Review.objects.create(
+            title=titles[1], author=users[0], text='Отзыв', score=8
+        )
+        response = client.get(f'/api/v1/stats/genres/{genres[0].slug}/')
+        assert response.status_code == 200
+        assert response.json() == {
+            'name': genres[0].name,
+            'slug': genres[0].slug,
+            'title_count': 4,
+            'review_count': 1,
+            'mean_score': 8.0,
+            'top_titles': [{
+                'id': titles[1].id,
+                'name': titles[1].name,
+                'rating': 8,
+                'review_count': 1,
+            }],
+        }
+        data = client.get('/api/v1/stats/categories/').json()
+        assert [item['slug'] for item in data['results']] == [category.slug]
+        assert data['results'][0]['top_titles'][0]['name'] == titles[1].name
+        Review.objects.create(
+            title=titles[2], author=users[0], text='Отзыв', score=10
+        )
+        data = client.get('/api/v1/stats/categories/').json()
+        assert data['results'][0]['top_titles'][0]['id'] == titles[2].id, (
+            'Проверьте, что кэш статистики сбрасывается после нового отзыва'
+        )
+
+    def test_bulk_writes(self, admin_client, genres, category):
+        response = admin_client.post(
+            '/api/v1/genres/',
+            data=[{'name': 'Мюзикл', 'slug': 'musical'}],
+            format='json'
+        )
+        assert response.status_code == 201
+        admin_client.post(
+            '/api/v1/categories/',
+            data=[{'name': 'Кино', 'slug': 'movies'}],
+            format='json'
+        )
+        response = admin_client.post('/api/v1/titles/', data=[
+            {'name': 'Один', 'year': 2000, 'genre': ['musical'],
+             'category': category.slug},
+            {'name': 'Два', 'year': 2000, 'genre': ['musical', 'drama'],
+             'category': category.slug},
+        ], format='json')
+        assert response.status_code == 201
+        assert_consistent('массовое создание')
+        response = admin_client.patch('/api/v1/titles/', data=[
+            {'id': response.json()[0]['id'], 'genre': ['drama'],
+             'category': 'movies'},
+        ], format='json')
+        assert response.status_code == 200
+        assert_consistent('массовое изменение')
+        response = admin_client.get('/api/v1/stats/genres/musical/')
+        assert response.json()['title_count'] == 1, (
+            'Проверьте, что статистика нового жанра доступна '
+            'после массового создания'
+        )
+
+    def test_rebuild_command(self, titles):
+        from reviews.models import GenreStats
+
+        GenreStats.objects.update(title_count=0, leaderboard='[]')
+        call_command('rebuild_stats', stdout=None)
+        assert set(
+            GenreStats.objects.values_list('title_count', flat=True)
+        ) == {len(titles)}, (
+            'Проверьте, что rebuild_stats пересчитывает статистику'
+        )
@@ -0,0 +1,197 @@
+import pytest
+
+
+class TestBucketStore:
+
+    def test_parse_rate(self):
+        from api.throttling import parse_rate
+
+        assert parse_rate('10/min') == (10, 10 / 60)
+        assert parse_rate('5/hour') == (5, 5 / 3600)
+
+    def test_refill(self):
+        from api.throttling import LocalBucketStore
+
+        store = LocalBucketStore()
+        bucket = [('key', 2, 1.0)]
+        assert store.consume(bucket, now=100) == 0
+        assert store.consume(bucket, now=100) == 0
+        assert store.consume(bucket, now=100) == pytest.approx(1.0), (
+            'Проверьте, что пустое ведро возвращает время ожидания'
+        )
+        assert store.consume(bucket, now=100.5) == pytest.approx(0.5)
+        assert store.consume(bucket, now=101) == 0, (
+            'Проверьте, что ведро пополняется со временем'
+        )
+        assert store.consume(bucket, now=1000) == 0
+        assert store.consume(bucket, now=1000) == 0
+        assert store.consume(bucket, now=1000) > 0, (
+            'Проверьте, что ведро не наполняется больше ёмкости'
+        )
+
+    def test_all_or_nothing(self):
+        from api.throttling import LocalBucketStore
+
+        store = LocalBucketStore()
+        assert store.consume([('user', 1, 1.0)], now=0) == 0
+        assert store.consume([('ip', 2, 1.0), ('user', 1, 1.0)], now=0) > 0
+        assert store.consume([('ip', 2, 1.0)], now=0) == 0
+        assert store.consume([('ip', 2, 1.0)], now=0) == 0, (
+            'Проверьте, что отказ не забирает токены из других вёдер'
+        )
+
+    def test_max_entries(self):
+        from api.throttling import LocalBucketStore
+
+        store = LocalBucketStore(max_entries=2)
+        for key in ('first', 'second', 'first', 'third'):
+            store.consume([(key, 5, 1.0)], now=0)
+        assert list(store.buckets) == ['first', 'third'], (
+            'Проверьте, что хранится не больше max_entries вёдер и '
+            'первым удаляется давно не использованное'
+        )
+
+    def test_redis_unavailable(self):
+        pytest.importorskip('redis')
+        from api.throttling import RedisBucketStore
+
+        store = RedisBucketStore('redis://localhost:1/0')
+        bucket = [('throttle:test:ip:1', 1, 1.0)]
+        assert store.consume(bucket, now=100) == 0, (
+            'Проверьте, что без Redis запросы не падают с ошибкой'
+        )
+        assert store.consume(bucket, now=100) > 0, (
+            'Проверьте, что без Redis ограничения действуют в процессе'
+        )
+
+    def test_redis_store(self):
+        redis = pytest.importorskip('redis')
+        from api.throttling import RedisBucketStore
+
+        store = RedisBucketStore('redis://localhost:6379/15')
+        try:
+            store.client.ping()
+        except redis.ConnectionError:
+            pytest.skip('Redis is not running')
+        store.clear()
+        bucket = [('throttle:test:ip:1', 1, 1.0)]
+        assert store.consume(bucket, now=100) == 0
+        assert store.consume(bucket, now=100) == pytest.approx(1.0)
+        assert store.consume(bucket, now=101) == 0
+        store.clear()
+
+
+@pytest.mark.django_db
+class TestThrottling:
+
+    @pytest.fixture(autouse=True)
+    def rates(self, settings):
+        settings.THROTTLING = {**settings.THROTTLING, 'RATES': {
+            'auth_signup': {'ip': '2/hour'},
+            'reviews.create': {'user': '2/min', 'ip': '3/min'},
+        }}
+
+    @pytest.fixture
+    def titles(self, category):
+        from reviews.models import Title
+
+        return [
+            Title.objects.create(name=f'Title {number}', year=2000,
+                                 category=category)
+            for number in range(4)
+        ]
+
+    def post_review(self, client, title):
+        return client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 5},
+            format='json'
+        )
+
+    def test_signup(self, client):
+        for number in range(2):
+            response = client.post('/api/v1/auth/signup/', data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            })
+            assert response.status_code == 200
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'user2', 'email': 'user2@yamdb.fake',
+        })
+        assert response.status_code == 429, (
+            'Проверьте, что частые регистрации с одного IP '
+            'получают статус 429'
+        )
+        assert 1700 < int(response['Retry-After']) <= 1800, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After'
+        )
+        response = client.post(
+            '/api/v1/auth/signup/',
+            data={'username': 'user2', 'email': 'user2@yamdb.fake'},
+            REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что вёдра разных IP независимы'
+        )
+
+    def signup(self, client, number, **extra):
+        return client.post('/api/v1/auth/signup/', data={
+            'username': f'user{number}',
+            'email': f'user{number}@yamdb.fake',
+        }, **extra)
+
+    def test_forwarded_for_is_not_trusted(self, client):
+        statuses = [
+            self.signup(
+                client, number, HTTP_X_FORWARDED_FOR=f'10.0.1.{number}'
+            ).status_code
+            for number in range(3)
+        ]
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что заголовок X-Forwarded-For клиента '
+            'не меняет IP, по которому ограничиваются запросы'
+        )
+
+    def test_forwarded_for_of_proxy(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'NUM_PROXIES': 1
+        }
+        statuses = [
+            self.signup(
+                client, number,
+                HTTP_X_FORWARDED_FOR=f'10.0.1.{number}, 10.0.2.1'
+            ).status_code
+            for number in range(3)
+        ]
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что за прокси IP клиента берётся из адреса, '
+            'добавленного прокси'
+        )
+        response = self.signup(
+            client, 3, HTTP_X_FORWARDED_FOR='10.0.1.1, 10.0.2.2'
+        )
+        assert response.status_code == 200
+
+    def test_reviews_per_user_and_ip(self, user, another_user, titles):
+        from rest_framework.test import APIClient
+
+        clients = []
+        for author in (user, another_user):
+            clients.append(APIClient())
+            clients[-1].force_authenticate(user=author)
+        for title in titles[:2]:
+            assert self.post_review(clients[0], title).status_code == 201
+        response = self.post_review(clients[0], titles[2])
+        assert response.status_code == 429, (
+            'Проверьте, что отзывы ограничены для пользователя'
+        )
+        assert 'Retry-After' in response
+        assert self.post_review(clients[1], titles[2]).status_code == 201
+        assert self.post_review(clients[1], titles[3]).status_code == 429, (
+            'Проверьте, что отзывы ограничены и для IP'
+        )
+
+    def test_reads_are_not_throttled(self, client, titles):
+        for _ in range(5):
+            response = client.get(f'/api/v1/titles/{titles[0].id}/reviews/')
+            assert response.status_code == 200
@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что GET-запрос к {url} возвращает статус 200'
+    )
+    return len(context.captured_queries), response.json()
+
+
+@pytest.mark.django_db
+class TestTitlesQueries:
+
+    @pytest.fixture
+    def many_titles(self, category, genres):
+        from reviews.models import GenreTitle, Title
+
+        titles = [
+            Title.objects.create(name=f'Title {i}', year=2000, category=category)
+            for i in range(30)
+        ]
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre)
+            for title in titles for genre in genres
+        )
+        return titles
+
+    def test_list_queries_do_not_depend_on_page_size(self, client, many_titles):
+        small, data = count_queries(client, '/api/v1/titles/?limit=2')
+        assert len(data['results']) == 2
+        large, data = count_queries(client, '/api/v1/titles/?limit=30')
+        assert len(data['results']) == 30
+        assert small == large, (
+            'Проверьте, что число запросов к базе для /api/v1/titles/ '
+            'не зависит от размера страницы'
+        )
+
+    def test_genre_filter_has_no_duplicates(self, client, many_titles):
+        small, data = count_queries(
+            client, '/api/v1/titles/?genre=drama&limit=2'
+        )
+        large, data = count_queries(
+            client, '/api/v1/titles/?genre=drama&limit=30'
+        )
+        ids = [title['id'] for title in data['results']]
+        assert data['count'] == len(many_titles) == len(set(ids)), (
+            'Проверьте, что фильтр по жанру не дублирует произведения'
+        )
+        assert small == large, (
+            'Проверьте, что число запросов при фильтрации по жанру '
+            'не зависит от размера страницы'
+        )
+        assert len(data['results'][0]['genre']) == 2, (
+            'Проверьте, что у отфильтрованного произведения выводятся '
+            'все жанры'
+        )
@@ -0,0 +1,167 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+
+def get_buckets():
+    from reviews.models import TitleActivity
+
+    return sorted(TitleActivity.objects.values_list(
+        'title_id', 'period', 'start', 'review_count', 'score_sum'
+    ))
+
+
+@pytest.mark.django_db
+class TestTrending:
+
+    @pytest.fixture
+    def users(self, django_user_model):
+        return [
+            django_user_model.objects.create_user(
+                username=f'user{number}', email=f'user{number}@yamdb.fake'
+            )
+            for number in range(3)
+        ]
+
+    @pytest.fixture
+    def titles(self, category, genres):
+        from reviews.models import Title
+
+        titles = [
+            Title.objects.create(
+                name=f'Title {number}', year=2000, category=category
+            )
+            for number in range(3)
+        ]
+        titles[0].genre.set([genres[0]])
+        return titles
+
+    def add_reviews(self, titles, users, ages):
+        """Adding reviews of score 5 published ages[i] days ago."""
+        from reviews.activity import rebuild_activity
+        from reviews.models import Review
+
+        now = timezone.now()
+        for title, title_ages in zip(titles, ages):
+            for user, age in zip(users, title_ages):
+                review = Review.objects.create(
+                    title=title, author=user, text='Отзыв', score=5
+                )
+                Review.objects.filter(pk=review.pk).update(
+                    pub_date=now - datetime.timedelta(days=age, minutes=1)
+                )
+        rebuild_activity()
+
+    def test_buckets_follow_reviews(self, title, user, another_user):
+        from reviews.activity import truncate_hour
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=4
+        )
+        Review.objects.create(
+            title=title, author=another_user, text='Отзыв', score=6
+        )
+        start = truncate_hour(review.pub_date)
+        assert get_buckets() == [(title.id, 'hour', start, 2, 10)], (
+            'Проверьте, что отзыв учитывается в часовой корзине '
+            'своего произведения'
+        )
+        review.score = 9
+        review.save()
+        review.delete()
+        assert get_buckets() == [(title.id, 'hour', start, 1, 6)], (
+            'Проверьте, что изменение оценки и удаление отзыва '
+            'меняют корзину отзыва'
+        )
+
+    def test_compaction(self, titles, users, settings):
+        from reviews.activity import compact_activity, rebuild_activity
+        from reviews.models import Review
+
+        settings.TRENDING = dict(
+            settings.TRENDING, HOURLY_BUCKET_HOURS=48, MAX_WINDOW_DAYS=10
+        )
+        now = datetime.datetime(2026, 10, 18, 12, 30)
+        reviews = []
+        for user, age in zip(users, (
+            datetime.timedelta(hours=1),
+            datetime.timedelta(days=3, hours=1),
+            datetime.timedelta(days=3, hours=2),
+        )):
+            reviews.append(Review.objects.create(
+                title=titles[0], author=user, text='Отзыв', score=5
+            ))
+            Review.objects.filter(pk=reviews[-1].pk).update(
+                pub_date=now - age
+            )
+        Review.objects.create(
+            title=titles[1], author=users[0], text='Отзыв', score=7
+        )
+        Review.objects.filter(title=titles[1]).update(
+            pub_date=now - datetime.timedelta(days=12)
+        )
+        rebuild_activity(now - datetime.timedelta(days=5))
+        assert compact_activity(now) == (2, 1)
+        expected = [
+            (titles[0].id, 'day', datetime.datetime(2026, 10, 15), 2, 10),
+            (titles[0].id, 'hour', datetime.datetime(2026, 10, 18, 11), 1, 5),
+        ]
+        assert get_buckets() == expected, (
+            'Проверьте, что compact_activity сливает старые часовые корзины '
+            'в дневные и удаляет корзины старше MAX_WINDOW_DAYS'
+        )
+        rebuild_activity(now)
+        assert get_buckets() == expected, (
+            'Проверьте, что пересчёт корзин совпадает со сжатием'
+        )
+        reviews[1].refresh_from_db()
+        reviews[1].delete()
+        assert get_buckets()[0][3:] == (1, 5), (
+            'Проверьте, что удаление отзыва меняет дневную корзину '
+            'после сжатия'
+        )
+
+    def test_ranking(self, titles, users):
+        from reviews.activity import get_trending
+
+        self.add_reviews(titles, users, ((5, 6), (0,), (20, 20, 20)))
+        assert [title_id for title_id, _ in get_trending(7, 1.0)] == [
+            titles[0].id, titles[1].id
+        ], 'Проверьте, что в окно попадают только свежие отзывы'
+        assert [title_id for title_id, _ in get_trending(7, 0.5)] == [
+            titles[1].id, titles[0].id
+        ], 'Проверьте, что старые дни весят меньше при затухании'
+        assert get_trending(30, 1.0)[0] == (titles[2].id, 15.0)
+
+    def test_endpoint(self, client, titles, users, genres):
+        self.add_reviews(titles, users, ((1, 1), (0,), ()))
+        response = client.get('/api/v1/titles/trending/?window=3&decay=1')
+        assert response.status_code == 200
+        data = response.json()
+        assert [item['id'] for item in data] == [titles[0].id, titles[1].id]
+        assert data[0]['trend'] == 10.0
+        assert data[0]['genre'] == [
+            {'name': genres[0].name, 'slug': genres[0].slug}
+        ]
+        data = client.get(
+            '/api/v1/titles/trending/?fields=id&genre=comedy'
+        ).json()
+        assert data == [], (
+            'Проверьте, что фильтры списка применяются к популярным'
+        )
+        data = client.get(
+            f'/api/v1/titles/trending/?fields=id&genre={genres[0].slug}'
+        ).json()
+        assert data == [{'id': titles[0].id, 'trend': 8.0}]
+        response = client.get('/api/v1/titles/trending/?search=Title 1')
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()] == [titles[1].id], (
+            'Проверьте, что поиск применяется к популярным'
+        )
+
+    @pytest.mark.parametrize('query', ['window=0', 'window=31', 'decay=2'])
+    def test_invalid_params(self, client, query):
+        response = client.get(f'/api/v1/titles/trending/?{query}')
+        assert response.status_code == 400